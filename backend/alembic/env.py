@@ -0,0 +1,61 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.database import engine, Base
+from app import models  # noqa: F401  (모델을 metadata에 등록)
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    모델에 없는 검색 인덱스(마이그레이션 0004)는 autogenerate 비교에서 제외
+    - SQLite: FTS5 테이블 assets_fts와 섀도 테이블 assets_fts_*
+    - Postgres: pg_trgm GIN 인덱스 ix_assets_*_trgm
+    """
+    if type_ == "table" and name and name.startswith("assets_fts"):
+        return False
+    if type_ == "index" and name and name.startswith("ix_assets_") and name.endswith("_trgm"):
+        return False
+    return True
+
+
+def run_migrations_offline() -> None:
+    """SQL 스크립트만 출력 (DB 연결 없음)"""
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """DB에 직접 마이그레이션 적용"""
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite는 ALTER TABLE 지원이 제한적이므로 batch 모드 사용
+            render_as_batch=connection.dialect.name == "sqlite",
+            include_object=include_object,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
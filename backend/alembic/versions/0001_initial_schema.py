@@ -0,0 +1,82 @@
+"""initial schema (users, assets, portfolios, portfolio_items)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 배포는 create_all로 테이블이 이미 만들어져 있으므로 없는 테이블만 생성
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("hashed_password", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if "assets" not in existing:
+        op.create_table(
+            "assets",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("symbol", sa.String(), nullable=False),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("exchange", sa.String(), nullable=True),
+            sa.Column("currency", sa.String(), nullable=True),
+            sa.Column("asset_type", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_assets_id", "assets", ["id"])
+        op.create_index("ix_assets_symbol", "assets", ["symbol"], unique=True)
+
+    if "portfolios" not in existing:
+        op.create_table(
+            "portfolios",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("initial_invest_amount", sa.Float(), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_portfolios_id", "portfolios", ["id"])
+
+    if "portfolio_items" not in existing:
+        op.create_table(
+            "portfolio_items",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("portfolio_id", sa.Integer(), sa.ForeignKey("portfolios.id"), nullable=False),
+            sa.Column("asset_id", sa.Integer(), sa.ForeignKey("assets.id"), nullable=False),
+            sa.Column("target_weight", sa.Float(), nullable=False),
+            sa.Column("tolerance", sa.Float(), nullable=True),
+            sa.Column("entry_price", sa.Float(), nullable=False),
+            sa.Column("initial_quantity", sa.Float(), nullable=False),
+            sa.Column("current_quantity", sa.Float(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_portfolio_items_id", "portfolio_items", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("portfolio_items")
+    op.drop_table("portfolios")
+    op.drop_table("assets")
+    op.drop_table("users")
@@ -0,0 +1,44 @@
+"""portfolio base currency, KRX asset currency fix
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("portfolios") as batch_op:
+        batch_op.add_column(
+            sa.Column("base_currency", sa.String(), nullable=False, server_default="KRW")
+        )
+
+    # 프론트엔드가 한국 종목도 USD로 등록하던 데이터 보정
+    op.execute("UPDATE assets SET currency = 'KRW' WHERE exchange = 'KRX'")
+
+    # 미국 종목만 담긴 기존 포트폴리오는 USD 기준으로 평가
+    op.execute(
+        "UPDATE portfolios SET base_currency = 'USD' "
+        "WHERE id IN (SELECT portfolio_id FROM portfolio_items) "
+        "AND id NOT IN ("
+        " SELECT pi.portfolio_id FROM portfolio_items pi"
+        " JOIN assets a ON a.id = pi.asset_id"
+        " WHERE a.currency <> 'USD' OR a.currency IS NULL"
+        ")"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("portfolios") as batch_op:
+        batch_op.drop_column("base_currency")
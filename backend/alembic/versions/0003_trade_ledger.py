@@ -0,0 +1,73 @@
+"""trade ledger, position snapshots, incremental position columns
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "trades",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("item_id", sa.Integer(), sa.ForeignKey("portfolio_items.id"), nullable=False),
+        sa.Column("quantity", sa.Float(), nullable=False),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.Column("executed_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_trades_id", "trades", ["id"])
+    op.create_index("ix_trades_item_id_id", "trades", ["item_id", "id"])
+
+    op.create_table(
+        "position_snapshots",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("item_id", sa.Integer(), sa.ForeignKey("portfolio_items.id"), nullable=False),
+        sa.Column("trade_id", sa.Integer(), sa.ForeignKey("trades.id"), nullable=False),
+        sa.Column("as_of", sa.DateTime(), nullable=False),
+        sa.Column("quantity", sa.Float(), nullable=False),
+        sa.Column("cost_basis", sa.Float(), nullable=False),
+        sa.Column("realized_pnl", sa.Float(), nullable=False),
+    )
+    op.create_index("ix_position_snapshots_id", "position_snapshots", ["id"])
+    op.create_index("ix_position_snapshots_item_id_as_of", "position_snapshots", ["item_id", "as_of"])
+
+    with op.batch_alter_table("portfolio_items") as batch_op:
+        batch_op.add_column(sa.Column("cost_basis", sa.Float(), nullable=False, server_default="0"))
+        batch_op.add_column(sa.Column("realized_pnl", sa.Float(), nullable=False, server_default="0"))
+        batch_op.add_column(sa.Column("trade_count", sa.Integer(), nullable=False, server_default="0"))
+        batch_op.add_column(sa.Column("last_trade_at", sa.DateTime(), nullable=True))
+
+    # 기존 종목은 현재 수량을 진입가로 매수한 것으로 원장 시작
+    op.execute(
+        "INSERT INTO trades (item_id, quantity, price, executed_at) "
+        "SELECT id, current_quantity, entry_price, COALESCE(created_at, CURRENT_TIMESTAMP) "
+        "FROM portfolio_items WHERE current_quantity > 0"
+    )
+    op.execute(
+        "UPDATE portfolio_items SET "
+        "cost_basis = current_quantity * entry_price, "
+        "trade_count = CASE WHEN current_quantity > 0 THEN 1 ELSE 0 END, "
+        "last_trade_at = CASE WHEN current_quantity > 0 THEN COALESCE(created_at, CURRENT_TIMESTAMP) END"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("portfolio_items") as batch_op:
+        batch_op.drop_column("last_trade_at")
+        batch_op.drop_column("trade_count")
+        batch_op.drop_column("realized_pnl")
+        batch_op.drop_column("cost_basis")
+    op.drop_table("position_snapshots")
+    op.drop_table("trades")
@@ -0,0 +1,136 @@
+"""asset catalog columns and search index (SQLite FTS5 / Postgres pg_trgm)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQLite trigram 토크나이저는 3.34부터 지원
+SQLITE_TRIGRAM_VERSION = (3, 34, 0)
+
+
+def _sqlite_supports_trigram(bind) -> bool:
+    version = bind.exec_driver_sql("SELECT sqlite_version()").scalar()
+    return tuple(int(part) for part in version.split(".")) >= SQLITE_TRIGRAM_VERSION
+
+
+# 검색 키 계산은 이 리비전 시점의 app.services.search_index를 그대로 옮겨 둠
+# (앱 코드가 바뀌어도 마이그레이션 결과는 달라지지 않도록)
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_LAST = 0xD7A3
+_CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSUNG = [
+    "", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+    "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"
+]
+
+
+def _chosung(text: str) -> str:
+    chars = []
+    for char in text.lower():
+        if _SYLLABLE_BASE <= ord(char) <= _SYLLABLE_LAST:
+            chars.append(_CHOSUNG[(ord(char) - _SYLLABLE_BASE) // 588])
+        elif not char.isspace():
+            chars.append(char)
+    return "".join(chars)
+
+
+def _decompose(text: str) -> str:
+    chars = []
+    for char in text.lower():
+        if _SYLLABLE_BASE <= ord(char) <= _SYLLABLE_LAST:
+            index = ord(char) - _SYLLABLE_BASE
+            chars.append(_CHOSUNG[index // 588])
+            chars.append(_JUNGSUNG[(index % 588) // 28])
+            chars.append(_JONGSUNG[index % 28])
+        elif not char.isspace():
+            chars.append(char)
+    return "".join(chars)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("assets") as batch_op:
+        batch_op.add_column(sa.Column("market", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("name_chosung", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("name_jamo", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("is_listed", sa.Boolean(), nullable=False, server_default=sa.true()))
+        batch_op.add_column(sa.Column("catalog_synced_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_assets_catalog_synced_at", "assets", ["catalog_synced_at"])
+
+    # 기존 종목의 검색 키 채우기
+    bind = op.get_bind()
+    assets = sa.table("assets", sa.column("id"), sa.column("name"), sa.column("name_chosung"), sa.column("name_jamo"))
+    rows = bind.execute(sa.select(assets.c.id, assets.c.name)).all()
+    if rows:
+        bind.execute(
+            assets.update().where(assets.c.id == sa.bindparam("_id")),
+            [{"_id": row.id, "name_chosung": _chosung(row.name), "name_jamo": _decompose(row.name)} for row in rows]
+        )
+
+    if bind.dialect.name == "postgresql":
+        # 부분 일치(ILIKE '%q%')와 유사도(%) 검색용 trigram GIN 인덱스
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for column in ("symbol", "name", "name_chosung", "name_jamo"):
+            op.execute(
+                f"CREATE INDEX ix_assets_{column}_trgm ON assets USING gin ({column} gin_trgm_ops)"
+            )
+    elif bind.dialect.name == "sqlite" and _sqlite_supports_trigram(bind):
+        # assets를 원본으로 하는 FTS5 trigram 인덱스 (트리거로 동기화)
+        op.execute(
+            "CREATE VIRTUAL TABLE assets_fts USING fts5("
+            "symbol, name, name_chosung, name_jamo, "
+            "content='assets', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            "CREATE TRIGGER assets_fts_insert AFTER INSERT ON assets BEGIN "
+            "INSERT INTO assets_fts (rowid, symbol, name, name_chosung, name_jamo) "
+            "VALUES (new.id, new.symbol, new.name, new.name_chosung, new.name_jamo); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER assets_fts_delete AFTER DELETE ON assets BEGIN "
+            "INSERT INTO assets_fts (assets_fts, rowid, symbol, name, name_chosung, name_jamo) "
+            "VALUES ('delete', old.id, old.symbol, old.name, old.name_chosung, old.name_jamo); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER assets_fts_update AFTER UPDATE OF symbol, name, name_chosung, name_jamo ON assets BEGIN "
+            "INSERT INTO assets_fts (assets_fts, rowid, symbol, name, name_chosung, name_jamo) "
+            "VALUES ('delete', old.id, old.symbol, old.name, old.name_chosung, old.name_jamo); "
+            "INSERT INTO assets_fts (rowid, symbol, name, name_chosung, name_jamo) "
+            "VALUES (new.id, new.symbol, new.name, new.name_chosung, new.name_jamo); "
+            "END"
+        )
+        op.execute("INSERT INTO assets_fts (assets_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        for column in ("symbol", "name", "name_chosung", "name_jamo"):
+            op.execute(f"DROP INDEX IF EXISTS ix_assets_{column}_trgm")
+    elif bind.dialect.name == "sqlite":
+        for trigger in ("assets_fts_insert", "assets_fts_delete", "assets_fts_update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS assets_fts")
+
+    op.drop_index("ix_assets_catalog_synced_at", table_name="assets")
+    with op.batch_alter_table("assets") as batch_op:
+        batch_op.drop_column("catalog_synced_at")
+        batch_op.drop_column("is_listed")
+        batch_op.drop_column("name_jamo")
+        batch_op.drop_column("name_chosung")
+        batch_op.drop_column("market")
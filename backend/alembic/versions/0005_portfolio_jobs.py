@@ -0,0 +1,43 @@
+"""async portfolio creation jobs
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "portfolio_jobs",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("portfolio_id", sa.Integer(), sa.ForeignKey("portfolios.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("symbols_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("symbols_priced", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_portfolio_jobs_user_id", "portfolio_jobs", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_portfolio_jobs_user_id", table_name="portfolio_jobs")
+    op.drop_table("portfolio_jobs")
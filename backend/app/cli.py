@@ -0,0 +1,94 @@
+"""
+관리용 CLI
+
+사용법 (backend 디렉터리에서):
+  python -m app.cli import portfolios.csv --user user@example.com [--format csv|jsonl|json]
+  python -m app.cli export --user user@example.com [--format csv|jsonl] [-o portfolios.csv]
+  python -m app.cli sync-catalog [--market KRX] [--market US]
+"""
+import argparse
+import json
+import sys
+
+from .database import SessionLocal
+from .models.user import User
+from .services.bulk import detect_format, import_portfolios, export_portfolios
+from .services.catalog import MARKETS, sync_catalog
+
+
+def _get_user(db, email: str) -> User:
+    user = db.query(User).filter(User.email == email).first()
+    if user is None:
+        sys.exit(f"User not found: {email}")
+    return user
+
+
+def cmd_import(args) -> int:
+    db = SessionLocal()
+    try:
+        user = _get_user(db, args.user)
+        fmt = detect_format(args.file, args.format)
+        with open(args.file, "rb") as stream:
+            result = import_portfolios(db, user.id, stream, fmt, chunk_size=args.chunk_size)
+    finally:
+        db.close()
+
+    print(json.dumps(result.model_dump(), ensure_ascii=False, indent=2))
+    return 1 if result.errors else 0
+
+
+def cmd_export(args) -> int:
+    db = SessionLocal()
+    try:
+        user = _get_user(db, args.user)
+        out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+        try:
+            for chunk in export_portfolios(user.id, args.format, db=db):
+                out.write(chunk)
+        finally:
+            if args.output:
+                out.close()
+    finally:
+        db.close()
+    return 0
+
+
+def cmd_sync_catalog(args) -> int:
+    db = SessionLocal()
+    try:
+        result = sync_catalog(db, args.market or list(MARKETS), batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    print(json.dumps(result.model_dump(), ensure_ascii=False, indent=2))
+    return 1 if result.errors else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Portfolio Manager CLI")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="포트폴리오 대량 가져오기")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--user", required=True, help="소유자 이메일")
+    import_parser.add_argument("--format", choices=["csv", "jsonl", "json"])
+    import_parser.add_argument("--chunk-size", type=int, default=None, help="트랜잭션당 포트폴리오 수")
+    import_parser.set_defaults(func=cmd_import)
+
+    export_parser = subparsers.add_parser("export", help="포트폴리오 대량 내보내기")
+    export_parser.add_argument("--user", required=True, help="소유자 이메일")
+    export_parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    export_parser.add_argument("-o", "--output", help="출력 파일 (기본: stdout)")
+    export_parser.set_defaults(func=cmd_export)
+
+    catalog_parser = subparsers.add_parser("sync-catalog", help="종목 리스트를 assets 카탈로그에 동기화")
+    catalog_parser.add_argument("--market", action="append", choices=list(MARKETS), help="동기화할 시장 (기본: 전체)")
+    catalog_parser.add_argument("--batch-size", type=int, default=None, help="upsert 한 번에 보내는 행 수")
+    catalog_parser.set_defaults(func=cmd_sync_catalog)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,6 +14,78 @@ class Settings(BaseSettings):
     # CORS
     CORS_ORIGINS: list = ["http://localhost:5173", "http://localhost:3000"]
     
+    # Admin (빈 값이면 관리자 엔드포인트 비활성화)
+    ADMIN_TOKEN: str = ""
+    
+    # Profiling
+    PROFILE_SAMPLE_RATE: float = 0.0  # 0.0 ~ 1.0, 무작위 샘플링 비율
+    PROFILE_INTERVAL_MS: float = 5.0  # 스택 샘플링 간격
+    PROFILE_BUFFER_SIZE: int = 20  # 보관할 프로파일 개수 (링 버퍼)
+    
+    # Market data (FinanceDataReader 호출 보호)
+    MARKET_TIMEOUT_SECONDS: float = 10.0  # 시세 조회 타임아웃
+    MARKET_LISTING_TIMEOUT_SECONDS: float = 30.0  # 종목 리스트 조회 타임아웃
+    MARKET_RETRIES: int = 2  # 실패 시 재시도 횟수
+    MARKET_RETRY_BACKOFF: float = 0.5  # 재시도 백오프 기준 (초, 지터 적용)
+    MARKET_MAX_WORKERS: int = 16  # 시세 호출 스레드풀 크기
+    UPSTREAM_MAX_CONCURRENCY: int = 16  # 동시에 진행 중인 시세 호출 최대 수 (프로세스당)
+    UPSTREAM_QUEUE_TIMEOUT_SECONDS: float = 2.0  # 슬롯 대기 시간 (초과 시 429)
+    CIRCUIT_FAILURE_THRESHOLD: int = 5  # 연속 실패 시 서킷 오픈
+    CIRCUIT_RESET_SECONDS: float = 30.0  # 서킷 오픈 유지 시간
+    
+    # Shared cache (워커 간 공유: "" = ~/.cache/portfolio(0700) SQLite, sqlite:///..., redis://..., memory://)
+    SHARED_CACHE_URL: str = ""
+    QUOTE_CACHE_TTL: int = 60  # 시세 캐시 유지 시간 (초)
+    FX_CACHE_TTL: int = 3600  # 환율 캐시 유지 시간 (초, 통화쌍별)
+    HISTORY_CACHE_TTL: int = 21600  # 일별 종가 시계열 캐시 유지 시간 (초)
+    
+    # Batch quotes (POST /assets/prices)
+    QUOTE_BATCH_MAX_SYMBOLS: int = 300  # 요청당 종목 id + 심볼 최대 수
+    QUOTE_BATCH_WORKERS: int = 8  # 캐시에 없는 시세를 동시에 조회하는 스레드 수 (프로세스당)
+    QUOTE_BATCH_DEADLINE_SECONDS: float = 5.0  # 이 시간 안에 조회하지 못한 심볼은 마지막 시세 또는 timeout
+    
+    # Bulk import / export
+    IMPORT_CHUNK_SIZE: int = 100  # 트랜잭션당 포트폴리오 수
+    EXPORT_BATCH_SIZE: int = 500  # DB에서 한 번에 읽는 행 수
+    
+    # Rate limiting (사용자별 토큰 버킷, 분당 요청 수 / 연속 허용 수, 0이면 제한 없음)
+    RATE_LIMIT_URL: str = ""  # "" = 프로세스 내부, sqlite:///..., redis://...
+    RATE_LIMIT_SEARCH_PER_MINUTE: int = 60
+    RATE_LIMIT_SEARCH_BURST: int = 20
+    RATE_LIMIT_PRICING_PER_MINUTE: int = 60
+    RATE_LIMIT_PRICING_BURST: int = 20
+    RATE_LIMIT_QUOTES_PER_MINUTE: int = 600  # 일괄 시세: 캐시에 없는 심볼 1개당 토큰 1개
+    RATE_LIMIT_QUOTES_BURST: int = 300  # 최대 배치(QUOTE_BATCH_MAX_SYMBOLS) 1회분
+    RATE_LIMIT_WRITE_PER_MINUTE: int = 30
+    RATE_LIMIT_WRITE_BURST: int = 10
+    
+    # Risk analytics
+    RISK_DEFAULT_WINDOW: int = 252  # 기본 계산 구간 (거래일)
+    RISK_CACHE_SIZE: int = 128  # (종목 집합, 구간, 기준일)별 수익률/공분산 메모 개수
+    
+    # Async portfolio creation (POST /portfolios?async=true)
+    PORTFOLIO_JOB_WORKERS: int = 4  # 생성 작업 스레드 수 (프로세스당)
+    PORTFOLIO_JOB_QUEUE_SIZE: int = 100  # 대기 + 실행 중 작업 최대 수 (초과 시 503)
+    PORTFOLIO_JOB_RETRIES: int = 3  # 시세/환율을 못 가져온 심볼 재시도 횟수
+    PORTFOLIO_JOB_RETRY_BACKOFF: float = 2.0  # 재시도 백오프 기준 (초, 지터 적용)
+    PORTFOLIO_JOB_STALE_SECONDS: int = 600  # 이 시간 동안 진행이 없으면 중단된 작업으로 처리
+    PORTFOLIO_JOB_POLL_SECONDS: float = 1.0  # 이벤트 스트림의 상태 확인 주기
+    PORTFOLIO_JOB_EVENTS_TIMEOUT: int = 300  # 이벤트 스트림 최대 유지 시간 (초, 이후 재연결)
+    
+    # Asset catalog (python -m app.cli sync-catalog 로 종목 리스트를 assets에 동기화)
+    CATALOG_SYNC_BATCH_SIZE: int = 1000  # upsert 한 번에 보내는 행 수
+    CATALOG_SEARCH_CANDIDATES: int = 50  # 검색 시 DB 인덱스에서 가져와 다시 점수를 매기는 후보 수
+    
+    # Monte Carlo simulation (POST /portfolios/{id}/simulate)
+    SIMULATION_WORKERS: int = 0  # 프로세스 풀 크기 (0 = CPU 수, 1이면 요청 스레드에서 계산)
+    SIMULATION_PATHS_PER_TASK: int = 5000  # 프로세스 작업 하나가 계산하는 경로 수
+    SIMULATION_TIME_BUDGET_SECONDS: float = 5.0  # 이 시간 안에 끝난 경로만 사용
+    SIMULATION_CHUNK_ELEMENTS: int = 1_000_000  # 한 번에 생성하는 난수 수 (경로 × 일 × 종목, 메모리 상한)
+    SIMULATION_BAND_POINTS: int = 60  # 응답에 포함하는 밴드 시점 수
+    
+    # Trade ledger
+    LEDGER_SNAPSHOT_INTERVAL: int = 50  # 종목별 N건 매매마다 포지션 스냅샷 (과거 시점 조회 시 최대 N건 재생)
+    
     class Config:
         env_file = ".env"
 
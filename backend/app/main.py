@@ -1,17 +1,41 @@
-from fastapi import FastAPI
+import math
+import time
+from contextlib import asynccontextmanager
+
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy import inspect, text
 from .config import settings
-from .database import engine, Base
-from .routes import auth_router, assets_router, portfolios_router
+from .responses import ORJSONResponse
+from .database import engine
+from .routes import auth_router, assets_router, portfolios_router, admin_router
+from .services.auth import is_admin_token
+from .services.profiler import should_profile, start_profile, finish_profile
+from .services.resilience import breaker_states, upstream_load, UpstreamBusy
+
+# 스키마는 Alembic 마이그레이션(`alembic upgrade head`)으로 별도 단계에서 관리
+# import 시점에 DB에 접속하지 않으므로 DB가 잠시 불가해도 포트 바인딩은 먼저 완료됨
+_startup_seconds = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _startup_seconds
+    _startup_seconds = time.perf_counter() - _import_started
+    print(f"Application startup complete in {_startup_seconds:.3f}s")
+    yield
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 # Create FastAPI app
 app = FastAPI(
     title="Portfolio Manager API",
     description="포트폴리오 관리 시스템",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -23,10 +47,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+# 요청 프로파일링 (관리자 헤더 또는 샘플링 비율로 옵트인)
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    if not should_profile(
+        request.headers.get("x-profile"),
+        is_admin_token(request.headers.get("x-admin-token"))
+    ):
+        return await call_next(request)
+    
+    sampler = start_profile(request.method, request.url.path)
+    if sampler is None:
+        return await call_next(request)
+    
+    status_code = None
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        record = finish_profile(sampler, status_code)
+    response.headers["X-Profile-Id"] = record.id
+    return response
+
+
+# 시세 호출 과부하 → 프록시 타임아웃 대신 즉시 429
+@app.exception_handler(UpstreamBusy)
+async def upstream_busy_handler(request: Request, exc: UpstreamBusy):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(max(math.ceil(settings.UPSTREAM_QUEUE_TIMEOUT_SECONDS), 1))}
+    )
+
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(assets_router)
 app.include_router(portfolios_router)
+app.include_router(admin_router)
 
 
 @app.get("/")
@@ -40,5 +99,40 @@ def root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    """프로세스 생존 확인 (DB 미접속) 및 시세 소스 서킷 상태"""
+    upstreams = breaker_states()
+    degraded = any(state["state"] != "closed" for state in upstreams.values())
+    return {
+        "status": "degraded" if degraded else "healthy",
+        "upstreams": upstreams,
+        "upstream_load": upstream_load()
+    }
+
+
+@app.get("/ready")
+def readiness_check():
+    """트래픽 수신 가능 여부 (DB 연결 및 마이그레이션 적용 확인)"""
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            schema_ready = inspect(connection).has_table("alembic_version")
+    except Exception as e:
+        print(f"Readiness check error: {e}")
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "database": "unreachable"}
+        )
+    
+    if not schema_ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "database": "ok", "schema": "not migrated"}
+        )
+    
+    return {
+        "status": "ready",
+        "database": "ok",
+        "schema": "ok",
+        "startup_seconds": round(_startup_seconds, 3) if _startup_seconds is not None else None
+    }
 
@@ -1,5 +1,7 @@
 from .user import User
 from .portfolio import Portfolio, PortfolioItem, Asset
+from .trade import Trade, PositionSnapshot
+from .job import PortfolioJob
 
-__all__ = ["User", "Portfolio", "PortfolioItem", "Asset"]
+__all__ = ["User", "Portfolio", "PortfolioItem", "Asset", "Trade", "PositionSnapshot", "PortfolioJob"]
 
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from datetime import datetime
+from ..database import Base
+
+
+class PortfolioJob(Base):
+    """비동기 포트폴리오 생성 작업 (워커 간 상태 공유를 위해 DB에 저장)"""
+    __tablename__ = "portfolio_jobs"
+    
+    id = Column(String, primary_key=True)  # uuid4 hex
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    payload = Column(Text, nullable=False)  # 생성 요청 (PortfolioCreate JSON)
+    portfolio_id = Column(Integer, ForeignKey("portfolios.id", ondelete="SET NULL"), nullable=True)  # 성공 시 생성된 포트폴리오
+    symbols_total = Column(Integer, nullable=False, default=0)  # 시세를 조회할 심볼 수
+    symbols_priced = Column(Integer, nullable=False, default=0)  # 시세 조회에 성공한 심볼 수
+    attempts = Column(Integer, nullable=False, default=0)  # 시세 조회 시도 횟수
+    error = Column(Text, nullable=True)  # 실패 사유
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
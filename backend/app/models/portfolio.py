@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, true
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
@@ -14,6 +14,11 @@ class Asset(Base):
     exchange = Column(String, nullable=True)  # 거래소 (선택)
     currency = Column(String, default="USD")  # 통화
     asset_type = Column(String, default="stock")  # stock, etf, crypto 등
+    market = Column(String, nullable=True)  # 세부 시장 (KOSPI, KOSDAQ, NASDAQ, NYSE 등, 카탈로그 동기화 시 설정)
+    name_chosung = Column(String, nullable=True)  # 초성 검색 키 (삼성전자 → ㅅㅅㅈㅈ)
+    name_jamo = Column(String, nullable=True)  # 자모 분해 이름 (오타 허용 검색용)
+    is_listed = Column(Boolean, nullable=False, default=True, server_default=true())  # 최근 동기화한 종목 리스트에 있는지
+    catalog_synced_at = Column(DateTime, nullable=True, index=True)  # 마지막 카탈로그 동기화 시각 (직접 추가한 종목은 NULL)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -27,7 +32,8 @@ class Portfolio(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     name = Column(String, nullable=False)  # 포트폴리오 이름
-    initial_invest_amount = Column(Float, nullable=False)  # 초기 투자금액
+    initial_invest_amount = Column(Float, nullable=False)  # 초기 투자금액 (기준 통화)
+    base_currency = Column(String, nullable=False, default="KRW", server_default="KRW")  # 기준 통화 (평가/비중 계산)
     description = Column(Text, nullable=True)  # 설명 (선택)
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -52,12 +58,18 @@ class PortfolioItem(Base):
     entry_price = Column(Float, nullable=False)  # 생성 시점 가격 (고정)
     initial_quantity = Column(Float, nullable=False)  # 초기 수량
     
-    # 현재 수량 (사용자가 수정 가능)
+    # 현재 포지션 (매매 원장에서 증분 유지)
     current_quantity = Column(Float, nullable=False)  # 현재 수량
+    cost_basis = Column(Float, nullable=False, default=0.0, server_default="0")  # 보유분 취득원가 (종목 통화, 이동평균)
+    realized_pnl = Column(Float, nullable=False, default=0.0, server_default="0")  # 실현손익 (종목 통화)
+    trade_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_trade_at = Column(DateTime, nullable=True)
     
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
     portfolio = relationship("Portfolio", back_populates="items")
     asset = relationship("Asset", back_populates="portfolio_items")
+    trades = relationship("Trade", back_populates="item", cascade="all, delete-orphan", order_by="Trade.id")
+    snapshots = relationship("PositionSnapshot", back_populates="item", cascade="all, delete-orphan")
 
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from ..database import Base
+
+
+class Trade(Base):
+    """매매 기록 (추가만 가능, 수정/삭제 없음)"""
+    __tablename__ = "trades"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    item_id = Column(Integer, ForeignKey("portfolio_items.id"), nullable=False)
+    quantity = Column(Float, nullable=False)  # 수량 변화 (매수 +, 매도 -)
+    price = Column(Float, nullable=False)  # 체결 가격 (종목 통화)
+    executed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    item = relationship("PortfolioItem", back_populates="trades")
+    
+    __table_args__ = (
+        Index("ix_trades_item_id_id", "item_id", "id"),
+    )
+
+
+class PositionSnapshot(Base):
+    """주기적 포지션 스냅샷 (과거 시점 포지션 조회 시 전체 원장 재생 방지)"""
+    __tablename__ = "position_snapshots"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    item_id = Column(Integer, ForeignKey("portfolio_items.id"), nullable=False)
+    trade_id = Column(Integer, ForeignKey("trades.id"), nullable=False)  # 스냅샷에 포함된 마지막 매매
+    as_of = Column(DateTime, nullable=False)  # 마지막 매매 체결 시각
+    quantity = Column(Float, nullable=False)
+    cost_basis = Column(Float, nullable=False)
+    realized_pnl = Column(Float, nullable=False)
+    
+    # Relationships
+    item = relationship("PortfolioItem", back_populates="snapshots")
+    trade = relationship("Trade")
+    
+    __table_args__ = (
+        Index("ix_position_snapshots_item_id_as_of", "item_id", "as_of"),
+    )
@@ -0,0 +1,22 @@
+"""
+빠른 JSON 응답
+
+- ORJSONResponse: 앱 기본 응답 클래스 (표준 json 모듈 대신 orjson으로 인코딩)
+- ModelResponse: 이미 스키마로 만들어진 pydantic 모델을 그대로 직렬화
+  라우트가 Response를 반환하면 FastAPI는 response_model 검증을 건너뛰므로
+  "모델 생성 → dict 변환 → 재검증 → 인코딩" 대신 pydantic-core 직렬화 1회로 끝남
+"""
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+class ModelResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        return super().render(content)
+
+
+__all__ = ["ORJSONResponse", "ModelResponse"]
@@ -1,6 +1,7 @@
 from .auth import router as auth_router
 from .assets import router as assets_router
 from .portfolios import router as portfolios_router
+from .admin import router as admin_router
 
-__all__ = ["auth_router", "assets_router", "portfolios_router"]
+__all__ = ["auth_router", "assets_router", "portfolios_router", "admin_router"]
 
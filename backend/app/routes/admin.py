@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import PlainTextResponse
+
+from ..services.auth import require_admin
+from ..services.market import listing_memory
+from ..services.profiler import list_profiles, get_profile, clear_profiles, process_memory
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiles")
+def list_profiles_route():
+    """저장된 요청 프로파일 목록 (최신순)"""
+    return list_profiles()
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile_route(
+    profile_id: str,
+    top: int = Query(20, ge=1, le=200)
+):
+    """프로파일 요약 (self-time 상위 함수)"""
+    record = get_profile(profile_id)
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return {**record.summary(), "top_functions": record.top_functions(top)}
+
+
+@router.get("/profiles/{profile_id}/download", response_class=PlainTextResponse)
+def download_profile(profile_id: str):
+    """프로파일 다운로드 (folded stack, flamegraph.pl / speedscope 호환)"""
+    record = get_profile(profile_id)
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return PlainTextResponse(
+        record.folded(),
+        headers={"Content-Disposition": f'attachment; filename="profile-{record.id}.folded"'}
+    )
+
+
+@router.delete("/profiles", status_code=status.HTTP_204_NO_CONTENT)
+def clear_profiles_route():
+    """저장된 프로파일 전체 삭제"""
+    clear_profiles()
+    return None
+
+
+@router.get("/memory")
+def memory_route():
+    """워커 메모리 (프로세스 RSS, 시장별 종목 리스트 저장소 + 검색 인덱스 크기와 원본 DataFrame 대비 비율)"""
+    return {
+        "process": process_memory(),
+        "listings": listing_memory()
+    }
@@ -1,3 +1,5 @@
+import math
+
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List
@@ -5,31 +7,50 @@ from typing import List
 from ..database import get_db
 from ..models.portfolio import Asset as AssetModel
 from ..models.user import User
-from ..schemas.portfolio import Asset, AssetCreate, AssetSearch
+from ..schemas.portfolio import Asset, AssetCreate, AssetSearch, QuoteBatch, QuoteRequest
 from ..services.auth import get_current_user
 from ..services.market import search_assets, get_current_price
+from ..services.catalog import catalog_ready, search_catalog
+from ..services.quotes import get_quote_batch, QuoteRateLimited
+from ..services.resilience import source_for_symbol
+from ..services.rate_limit import rate_limit, search_cost
 
 router = APIRouter(prefix="/assets", tags=["assets"])
 
 
-@router.get("/search", response_model=List[AssetSearch])
+@router.get(
+    "/search",
+    response_model=List[AssetSearch],
+    dependencies=[Depends(rate_limit("search", cost=search_cost))]
+)
 def search_assets_route(
     q: str = Query(..., min_length=1),
     limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """종목 검색"""
-    results = search_assets(q, limit)
+    """종목 검색 (카탈로그 DB 인덱스, 동기화 전이면 메모리 종목 리스트)"""
+    results = search_catalog(db, q, limit)
+    if results is None:
+        results = search_assets(q, limit)
     return results
 
 
-@router.post("", response_model=Asset, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=Asset,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("write"))]
+)
 def create_asset(
     asset_data: AssetCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """종목 추가 (DB에 저장)"""
+    """
+    종목 추가 (DB에 저장)
+    - 카탈로그가 동기화되어 있으면 조회만 수행 (카탈로그에 없는 심볼은 404)
+    """
     # 이미 존재하는지 확인
     existing_asset = db.query(AssetModel).filter(
         AssetModel.symbol == asset_data.symbol
@@ -38,8 +59,16 @@ def create_asset(
     if existing_asset:
         return existing_asset
     
-    # 새 종목 생성
+    if catalog_ready(db):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Asset not found in catalog"
+        )
+    
+    # 새 종목 생성 (한국 종목은 클라이언트가 보낸 값과 무관하게 KRW)
     new_asset = AssetModel(**asset_data.model_dump())
+    if asset_data.exchange == "KRX" or source_for_symbol(asset_data.symbol) == "KRX":
+        new_asset.currency = "KRW"
     db.add(new_asset)
     db.commit()
     db.refresh(new_asset)
@@ -47,6 +76,33 @@ def create_asset(
     return new_asset
 
 
+@router.post("/prices", response_model=QuoteBatch)
+def get_asset_prices(
+    quote_request: QuoteRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    여러 종목 현재가 일괄 조회 (종목 id / 심볼)
+    - 심볼마다 시세 시각, 경과 시간, 상태(ok, stale, not_found, unavailable, timeout) 포함
+    - 일부 심볼을 조회하지 못해도 200 (상태로 구분)
+    - quotes 버킷에서 캐시에 없는 심볼 1개당 토큰 1개(최소 1개)를 한 번에 차감 (모자라면 429)
+    """
+    try:
+        return get_quote_batch(db, quote_request, rate_key=f"user:{current_user.id}")
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except QuoteRateLimited as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(max(math.ceil(e.retry_after), 1))}
+        )
+
+
 @router.get("/{asset_id}", response_model=Asset)
 def get_asset(
     asset_id: int,
@@ -63,7 +119,10 @@ def get_asset(
     return asset
 
 
-@router.get("/{asset_id}/price")
+@router.get(
+    "/{asset_id}/price",
+    dependencies=[Depends(rate_limit("pricing"))]
+)
 def get_asset_price(
     asset_id: int,
     db: Session = Depends(get_db),
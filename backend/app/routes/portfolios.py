@@ -1,27 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Optional, Union
+from datetime import datetime, timezone
 
+from ..config import settings
 from ..database import get_db
+from ..responses import ModelResponse
 from ..models.portfolio import Portfolio as PortfolioModel, PortfolioItem as PortfolioItemModel, Asset as AssetModel
+from ..models.trade import Trade as TradeModel
 from ..models.user import User
 from ..schemas.portfolio import (
-    Portfolio, PortfolioCreate, PortfolioDetail,
-    PortfolioItemUpdate, PortfolioAnalysis, ItemAnalysis
+    Portfolio, PortfolioCreate, PortfolioDetail, PortfolioDetailCompact,
+    PortfolioItemUpdate, PortfolioItemBatchUpdate, PortfolioAnalysis, PortfolioAnalysisCompact, PortfolioRisk, ImportResult,
+    TradeCreate, Trade, Position, PortfolioJob, SimulationRequest, PortfolioSimulation
 )
 from ..services.auth import get_current_user
-from ..services.market import get_current_price, get_multiple_prices
+from ..services.market import get_multiple_prices, get_current_price
+from ..services.analysis import build_portfolio_analysis
+from ..services.risk import build_portfolio_risk, InsufficientHistory
+from ..services.simulation import build_portfolio_simulation, SimulationFailed, SimulationTimeout
+from ..services.fx import asset_currency, get_fx_rates, FXRateUnavailable
+from ..services.portfolio_builder import add_portfolio, ItemSpec, PortfolioBuildError
+from ..services.bulk import detect_format, import_portfolios, export_portfolios
+from ..services.serialization import portfolio_detail
+from ..services.rate_limit import rate_limit
+from ..services.ledger import (
+    record_trade, set_quantity, set_quantities, position_as_of, lock_items, retry_on_conflict,
+    LedgerError, PositionConflict
+)
+from ..services.portfolio_jobs import submit_portfolio_job, get_job, job_events, JobQueueFull
 
 router = APIRouter(prefix="/portfolios", tags=["portfolios"])
 
 
-@router.post("", response_model=PortfolioDetail, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=PortfolioDetail,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": PortfolioJob, "description": "async=true: 생성 작업 접수"}},
+    dependencies=[Depends(rate_limit("write"))]
+)
 def create_portfolio(
     portfolio_data: PortfolioCreate,
+    async_mode: bool = Query(False, alias="async"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """포트폴리오 생성"""
+    """
+    포트폴리오 생성
+    - async=true면 검증 후 바로 202 + 작업 반환, 시세 조회와 생성은 백그라운드 작업으로 진행
+      (GET /portfolios/jobs/{job_id} 또는 /events로 확인)
+    """
     # 목표 비중 합계 검증
     total_weight = sum(item.target_weight for item in portfolio_data.items)
     if abs(total_weight - 100.0) > 0.01:  # 부동소수점 오차 허용
@@ -30,56 +60,137 @@ def create_portfolio(
             detail=f"Total target weight must be 100%, got {total_weight}%"
         )
     
-    # 포트폴리오 생성
-    new_portfolio = PortfolioModel(
-        user_id=current_user.id,
-        name=portfolio_data.name,
-        initial_invest_amount=portfolio_data.initial_invest_amount,
-        description=portfolio_data.description
-    )
-    db.add(new_portfolio)
-    db.flush()  # ID를 얻기 위해
-    
-    # 각 종목에 대해 현재가 조회 및 수량 계산
-    for item_data in portfolio_data.items:
-        # 종목 정보 가져오기
-        asset = db.query(AssetModel).filter(AssetModel.id == item_data.asset_id).first()
-        if not asset:
+    # 종목 정보 가져오기
+    asset_ids = [item.asset_id for item in portfolio_data.items]
+    assets = {
+        asset.id: asset
+        for asset in db.query(AssetModel).filter(AssetModel.id.in_(asset_ids)).all()
+    }
+    for asset_id in asset_ids:
+        if asset_id not in assets:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Asset with id {item_data.asset_id} not found"
+                detail=f"Asset with id {asset_id} not found"
             )
-        
-        # 현재가 조회 (entry_price)
-        entry_price = get_current_price(asset.symbol)
-        if entry_price is None:
+    
+    if async_mode:
+        try:
+            job = submit_portfolio_job(db, current_user.id, portfolio_data)
+        except JobQueueFull as e:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Could not fetch price for {asset.symbol}"
+                detail=str(e),
+                headers={"Retry-After": "5"}
             )
-        
-        # 초기 수량 계산
-        # 종목별 투자액 = 총 투자금 × (목표 비중 / 100)
-        item_invest_amount = portfolio_data.initial_invest_amount * (item_data.target_weight / 100.0)
-        # 초기 수량 = 종목별 투자액 / entry_price
-        initial_quantity = item_invest_amount / entry_price
-        
-        # PortfolioItem 생성
-        new_item = PortfolioItemModel(
-            portfolio_id=new_portfolio.id,
-            asset_id=item_data.asset_id,
-            target_weight=item_data.target_weight,
-            tolerance=item_data.tolerance,
-            entry_price=entry_price,
-            initial_quantity=initial_quantity,
-            current_quantity=initial_quantity  # 처음에는 초기 수량과 동일
+        return ModelResponse(
+            PortfolioJob.model_validate(job),
+            status_code=status.HTTP_202_ACCEPTED,
+            headers={"Location": f"/portfolios/jobs/{job.id}"}
         )
-        db.add(new_item)
+    
+    # 현재가 (entry_price, 심볼당 1회) / 종목 통화 → 기준 통화 환율 (통화쌍당 1회)
+    prices = get_multiple_prices(list({asset.symbol for asset in assets.values()}))
+    fx_rates = get_fx_rates(
+        (asset_currency(asset) for asset in assets.values()),
+        portfolio_data.base_currency
+    )
+    
+    # 포트폴리오 생성 (종목별 초기 수량 계산)
+    try:
+        new_portfolio = add_portfolio(
+            db,
+            user_id=current_user.id,
+            name=portfolio_data.name,
+            initial_invest_amount=portfolio_data.initial_invest_amount,
+            base_currency=portfolio_data.base_currency,
+            description=portfolio_data.description,
+            items=[
+                ItemSpec(
+                    asset=assets[item.asset_id],
+                    target_weight=item.target_weight,
+                    tolerance=item.tolerance
+                )
+                for item in portfolio_data.items
+            ],
+            prices=prices,
+            fx_rates=fx_rates
+        )
+    except PortfolioBuildError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     
     db.commit()
     db.refresh(new_portfolio)
     
-    return new_portfolio
+    return ModelResponse(portfolio_detail(new_portfolio), status_code=status.HTTP_201_CREATED)
+
+
+@router.get("/jobs/{job_id}", response_model=PortfolioJob)
+def get_portfolio_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """비동기 생성 작업 상태 (succeeded면 portfolio_id, failed면 error)"""
+    job = get_job(db, job_id, current_user.id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+
+@router.get("/jobs/{job_id}/events")
+def portfolio_job_events(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """비동기 생성 작업 상태 스트림 (Server-Sent Events, 완료/실패 시 종료)"""
+    if not get_job(db, job_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return StreamingResponse(
+        job_events(job_id, current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post(
+    "/import",
+    response_model=ImportResult,
+    dependencies=[Depends(rate_limit("write"))]
+)
+def import_portfolios_route(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|jsonl|json)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    포트폴리오 대량 가져오기 (CSV / JSONL / JSON)
+    - 한 행 = 포트폴리오 종목 1개, 같은 portfolio_ref(없으면 portfolio 이름)의 연속된 행이 한 포트폴리오
+    - 포트폴리오 단위로 저장하며 실패한 행/포트폴리오는 errors로 보고
+    """
+    fmt = detect_format(file.filename, format)
+    return import_portfolios(db, current_user.id, file.file, fmt)
+
+
+@router.get("/export")
+def export_portfolios_route(
+    format: str = Query("csv", pattern="^(csv|jsonl)$"),
+    current_user: User = Depends(get_current_user)
+):
+    """포트폴리오 대량 내보내기 (가져오기와 같은 형식, 스트리밍)"""
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_portfolios(current_user.id, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="portfolios.{format}"'}
+    )
 
 
 @router.get("", response_model=List[Portfolio])
@@ -94,9 +205,10 @@ def list_portfolios(
     return portfolios
 
 
-@router.get("/{portfolio_id}", response_model=PortfolioDetail)
+@router.get("/{portfolio_id}", response_model=Union[PortfolioDetail, PortfolioDetailCompact])
 def get_portfolio(
     portfolio_id: int,
+    compact: bool = Query(False, description="종목 정보를 assets 목록으로 한 번씩만 포함"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -112,12 +224,17 @@ def get_portfolio(
             detail="Portfolio not found"
         )
     
-    return portfolio
+    return ModelResponse(portfolio_detail(portfolio, compact=compact))
 
 
-@router.get("/{portfolio_id}/analysis", response_model=PortfolioAnalysis)
+@router.get(
+    "/{portfolio_id}/analysis",
+    response_model=Union[PortfolioAnalysis, PortfolioAnalysisCompact],
+    dependencies=[Depends(rate_limit("pricing"))]
+)
 def analyze_portfolio(
     portfolio_id: int,
+    compact: bool = Query(False, description="종목 정보를 assets 목록으로 한 번씩만 포함"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -133,68 +250,183 @@ def analyze_portfolio(
             detail="Portfolio not found"
         )
     
-    # 모든 종목의 현재가 조회
-    symbols = [item.asset.symbol for item in portfolio.items]
-    current_prices = get_multiple_prices(symbols)
+    try:
+        return ModelResponse(build_portfolio_analysis(portfolio, compact=compact))
+    except FXRateUnavailable as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+
+
+@router.get(
+    "/{portfolio_id}/risk",
+    response_model=PortfolioRisk,
+    dependencies=[Depends(rate_limit("pricing"))]
+)
+def get_portfolio_risk(
+    portfolio_id: int,
+    window: Optional[int] = Query(None, ge=20, le=1260, description="계산 구간 (거래일, 기본 RISK_DEFAULT_WINDOW)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """포트폴리오 리스크 (연율화 변동성, 최대 낙폭, 상관관계, 종목별 변동성 기여도)"""
+    portfolio = db.query(PortfolioModel).filter(
+        PortfolioModel.id == portfolio_id,
+        PortfolioModel.user_id == current_user.id
+    ).first()
+    
+    if not portfolio:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found"
+        )
+    
+    try:
+        return ModelResponse(build_portfolio_risk(portfolio, window or settings.RISK_DEFAULT_WINDOW))
+    except (FXRateUnavailable, InsufficientHistory) as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+
+
+@router.post(
+    "/{portfolio_id}/simulate",
+    response_model=PortfolioSimulation,
+    dependencies=[Depends(rate_limit("pricing"))]
+)
+def simulate_portfolio(
+    portfolio_id: int,
+    request: SimulationRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """몬테카를로 시뮬레이션 (기간별 평가금액 분위수 밴드, 목표 금액 도달 확률)"""
+    portfolio = db.query(PortfolioModel).filter(
+        PortfolioModel.id == portfolio_id,
+        PortfolioModel.user_id == current_user.id
+    ).first()
     
-    # 각 종목 분석
-    items_analysis = []
-    total_value = 0.0
+    if not portfolio:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found"
+        )
     
-    for item in portfolio.items:
-        current_price = current_prices.get(item.asset.symbol)
-        if current_price is None:
-            # 가격을 가져올 수 없는 경우 entry_price 사용
-            current_price = item.entry_price
-        
-        # 평가금액 계산
-        current_value = item.current_quantity * current_price
-        total_value += current_value
-    
-    # 두 번째 패스: 현재 비중 계산 및 분석
-    for item in portfolio.items:
-        current_price = current_prices.get(item.asset.symbol) or item.entry_price
-        current_value = item.current_quantity * current_price
-        
-        # 현재 비중
-        current_weight = (current_value / total_value * 100) if total_value > 0 else 0
-        
-        # 차이
-        weight_diff = current_weight - item.target_weight
-        
-        # 허용 범위 벗어남 여부
-        is_out_of_range = abs(weight_diff) > item.tolerance
-        
-        items_analysis.append(ItemAnalysis(
-            item_id=item.id,
-            asset=item.asset,
-            target_weight=item.target_weight,
-            current_weight=current_weight,
-            weight_diff=weight_diff,
-            tolerance=item.tolerance,
-            is_out_of_range=is_out_of_range,
-            current_quantity=item.current_quantity,
-            current_price=current_price,
-            current_value=current_value,
-            entry_price=item.entry_price,
-            initial_quantity=item.initial_quantity
-        ))
+    try:
+        return ModelResponse(
+            build_portfolio_simulation(portfolio, request, request.window or settings.RISK_DEFAULT_WINDOW)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except (FXRateUnavailable, InsufficientHistory, SimulationTimeout, SimulationFailed) as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+
+
+@router.patch(
+    "/{portfolio_id}/items",
+    response_model=PortfolioDetail,
+    dependencies=[Depends(rate_limit("write"))]
+)
+def update_portfolio_item_quantities(
+    portfolio_id: int,
+    updates: List[PortfolioItemBatchUpdate],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """여러 종목의 수량 일괄 업데이트 (한 트랜잭션, 리밸런싱 후 사용)"""
+    item_ids = [update.item_id for update in updates]
+    if len(set(item_ids)) != len(item_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate item_id in request"
+        )
     
-    # 전체 수익률 계산
-    total_return = total_value - portfolio.initial_invest_amount
-    total_return_pct = (total_return / portfolio.initial_invest_amount * 100) if portfolio.initial_invest_amount > 0 else 0
-    
-    return PortfolioAnalysis(
-        portfolio=portfolio,
-        total_value=total_value,
-        initial_invest_amount=portfolio.initial_invest_amount,
-        total_return=total_return,
-        total_return_pct=total_return_pct,
-        items=items_analysis
-    )
+    # 소유권 + 종목 확인 (쿼리 1회)
+    items = {
+        item.id: item
+        for item in db.query(PortfolioItemModel)
+        .join(PortfolioModel)
+        .options(joinedload(PortfolioItemModel.asset))
+        .filter(
+            PortfolioItemModel.portfolio_id == portfolio_id,
+            PortfolioItemModel.id.in_(item_ids),
+            PortfolioModel.user_id == current_user.id
+        )
+    }
+    missing = [item_id for item_id in item_ids if item_id not in items]
+    if missing:
+        portfolio_exists = db.query(PortfolioModel.id).filter(
+            PortfolioModel.id == portfolio_id,
+            PortfolioModel.user_id == current_user.id
+        ).first()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found" if not portfolio_exists else f"Portfolio items not found: {missing}"
+        )
+    
+    # 가격 미지정 종목은 현재가 (심볼당 1회, 조회 실패 시 entry_price)
+    unpriced = {
+        items[update.item_id].asset.symbol
+        for update in updates
+        if update.price is None and update.current_quantity != items[update.item_id].current_quantity
+    }
+    prices = get_multiple_prices(list(unpriced)) if unpriced else {}
+    
+    symbols = {item_id: item.asset.symbol for item_id, item in items.items()}
+    
+    def apply():
+        # 시세 조회 후 기본키 순서로 잠그고 다시 읽은 수량 기준으로 반영
+        locked = lock_items(db, item_ids)
+        targets = []
+        for update in updates:
+            item = locked[update.item_id]
+            price = update.price or prices.get(symbols[item.id]) or item.entry_price
+            targets.append((item, update.current_quantity, price))
+        set_quantities(db, targets)
+        db.commit()
+    
+    try:
+        retry_on_conflict(db, apply)
+    except LedgerError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except PositionConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    
+    portfolio = db.query(PortfolioModel).options(
+        selectinload(PortfolioModel.items).joinedload(PortfolioItemModel.asset)
+    ).filter(
+        PortfolioModel.id == portfolio_id,
+        PortfolioModel.user_id == current_user.id
+    ).first()
+    
+    if not portfolio:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found"
+        )
+    
+    return ModelResponse(portfolio_detail(portfolio))
 
 
-@router.patch("/{portfolio_id}/items/{item_id}", response_model=PortfolioDetail)
+@router.patch(
+    "/{portfolio_id}/items/{item_id}",
+    response_model=PortfolioDetail,
+    dependencies=[Depends(rate_limit("write"))]
+)
 def update_portfolio_item_quantity(
     portfolio_id: int,
     item_id: int,
@@ -227,15 +459,152 @@ def update_portfolio_item_quantity(
             detail="Portfolio item not found"
         )
     
-    # 수량 업데이트
-    item.current_quantity = update_data.current_quantity
-    db.commit()
+    # 수량 변화만큼 매매 기록 (가격 미지정 시 현재가, 조회 실패 시 entry_price)
+    price = update_data.price or get_current_price(item.asset.symbol) or item.entry_price
+    
+    def apply():
+        # 시세 조회 후 잠그고 다시 읽은 수량 기준으로 반영
+        locked = lock_items(db, [item_id])[item_id]
+        set_quantity(db, locked, update_data.current_quantity, price)
+        db.commit()
+    
+    try:
+        retry_on_conflict(db, apply)
+    except PositionConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     db.refresh(portfolio)
     
-    return portfolio
+    return ModelResponse(portfolio_detail(portfolio))
+
+
+@router.get("/{portfolio_id}/items/{item_id}/trades", response_model=List[Trade])
+def list_item_trades(
+    portfolio_id: int,
+    item_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    before_id: Optional[int] = Query(None, description="이 id보다 이전 매매 (페이지네이션)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """종목 매매 내역 조회 (최신순)"""
+    item = db.query(PortfolioItemModel).join(PortfolioModel).filter(
+        PortfolioItemModel.id == item_id,
+        PortfolioItemModel.portfolio_id == portfolio_id,
+        PortfolioModel.user_id == current_user.id
+    ).first()
+    
+    if not item:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio item not found"
+        )
+    
+    query = db.query(TradeModel).filter(TradeModel.item_id == item.id)
+    if before_id is not None:
+        query = query.filter(TradeModel.id < before_id)
+    return query.order_by(TradeModel.id.desc()).limit(limit).all()
+
+
+@router.post(
+    "/{portfolio_id}/items/{item_id}/trades",
+    response_model=Trade,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("write"))]
+)
+def create_item_trade(
+    portfolio_id: int,
+    item_id: int,
+    trade_data: TradeCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """매매 기록 (매수 +, 매도 -) 후 포지션 갱신"""
+    if trade_data.quantity == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Trade quantity must not be zero"
+        )
+    
+    item = db.query(PortfolioItemModel).join(PortfolioModel).filter(
+        PortfolioItemModel.id == item_id,
+        PortfolioItemModel.portfolio_id == portfolio_id,
+        PortfolioModel.user_id == current_user.id
+    ).first()
+    
+    if not item:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio item not found"
+        )
+    
+    def apply():
+        locked = lock_items(db, [item_id])[item_id]
+        trade = record_trade(db, locked, trade_data.quantity, trade_data.price)
+        db.commit()
+        return trade
+    
+    try:
+        trade = retry_on_conflict(db, apply)
+    except LedgerError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except PositionConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    db.refresh(trade)
+    
+    return trade
+
+
+@router.get("/{portfolio_id}/positions", response_model=List[Position])
+def get_positions(
+    portfolio_id: int,
+    as_of: Optional[datetime] = Query(None, description="이 시점의 포지션 (없으면 현재)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """종목별 포지션 (수량, 취득원가, 실현손익)"""
+    portfolio = db.query(PortfolioModel).filter(
+        PortfolioModel.id == portfolio_id,
+        PortfolioModel.user_id == current_user.id
+    ).first()
+    
+    if not portfolio:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found"
+        )
+    
+    # 원장은 UTC naive로 저장
+    if as_of is not None and as_of.tzinfo is not None:
+        as_of = as_of.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    positions = []
+    for item in portfolio.items:
+        state = position_as_of(db, item, as_of)
+        positions.append(Position(
+            item_id=item.id,
+            asset=item.asset,
+            quantity=state.quantity,
+            cost_basis=state.cost_basis,
+            average_cost=state.average_cost,
+            realized_pnl=state.realized_pnl
+        ))
+    return positions
 
 
-@router.delete("/{portfolio_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{portfolio_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(rate_limit("write"))]
+)
 def delete_portfolio(
     portfolio_id: int,
     db: Session = Depends(get_db),
@@ -1,16 +1,26 @@
 from .user import UserCreate, UserLogin, User, Token
 from .portfolio import (
-    AssetCreate, Asset, AssetSearch,
-    PortfolioCreate, Portfolio, PortfolioDetail,
-    PortfolioItemCreate, PortfolioItem, PortfolioItemUpdate,
-    PortfolioAnalysis, ItemAnalysis
+    AssetCreate, Asset, AssetSearch, QuoteRequest, Quote, QuoteBatch,
+    PortfolioCreate, Portfolio, PortfolioDetail, PortfolioDetailCompact,
+    PortfolioItemCreate, PortfolioItemSummary, PortfolioItem, PortfolioItemUpdate, PortfolioItemBatchUpdate,
+    TradeCreate, Trade, Position,
+    PortfolioAnalysis, PortfolioAnalysisCompact, ItemAnalysisSummary, ItemAnalysis,
+    PortfolioRisk, ItemRisk,
+    SimulationRequest, SimulationBand, PortfolioSimulation,
+    PortfolioImportRow, ImportRowError, ImportResult,
+    CatalogSyncResult, PortfolioJob
 )
 
 __all__ = [
     "UserCreate", "UserLogin", "User", "Token",
-    "AssetCreate", "Asset", "AssetSearch",
-    "PortfolioCreate", "Portfolio", "PortfolioDetail",
-    "PortfolioItemCreate", "PortfolioItem", "PortfolioItemUpdate",
-    "PortfolioAnalysis", "ItemAnalysis"
+    "AssetCreate", "Asset", "AssetSearch", "QuoteRequest", "Quote", "QuoteBatch",
+    "PortfolioCreate", "Portfolio", "PortfolioDetail", "PortfolioDetailCompact",
+    "PortfolioItemCreate", "PortfolioItemSummary", "PortfolioItem", "PortfolioItemUpdate", "PortfolioItemBatchUpdate",
+    "TradeCreate", "Trade", "Position",
+    "PortfolioAnalysis", "PortfolioAnalysisCompact", "ItemAnalysisSummary", "ItemAnalysis",
+    "PortfolioRisk", "ItemRisk",
+    "SimulationRequest", "SimulationBand", "PortfolioSimulation",
+    "PortfolioImportRow", "ImportRowError", "ImportResult",
+    "CatalogSyncResult", "PortfolioJob"
 ]
 
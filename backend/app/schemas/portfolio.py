@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Dict, List, Optional
 
 
 # Asset schemas
@@ -19,6 +19,7 @@ class Asset(BaseModel):
     exchange: Optional[str]
     currency: str
     asset_type: str
+    market: Optional[str] = None
     created_at: datetime
     
     class Config:
@@ -29,9 +30,36 @@ class AssetSearch(BaseModel):
     symbol: str
     name: str
     exchange: Optional[str] = None
+    currency: Optional[str] = None
     current_price: Optional[float] = None
 
 
+class QuoteRequest(BaseModel):
+    """일괄 시세 조회 (종목 id 또는 심볼, 합계 QUOTE_BATCH_MAX_SYMBOLS개까지)"""
+    asset_ids: List[int] = []
+    symbols: List[str] = []
+
+
+class Quote(BaseModel):
+    asset_id: Optional[int] = None  # 요청한 종목 id (DB에 있는 심볼이면 채움)
+    symbol: Optional[str] = None
+    name: Optional[str] = None
+    currency: Optional[str] = None
+    price: Optional[float] = None
+    as_of: Optional[datetime] = None  # 시세 조회 시각 (UTC)
+    age_seconds: Optional[float] = None
+    status: str  # ok, stale(소스 장애 / 마감으로 마지막 시세 사용), not_found, unavailable, timeout
+    error: Optional[str] = None
+
+
+class QuoteBatch(BaseModel):
+    quotes: List[Quote]  # 요청 순서 (중복 포함)
+    symbols_requested: int  # 중복 제거 후 심볼 수
+    cache_hits: int  # 공유 캐시에서 바로 가져온 심볼 수
+    deadline_exceeded: bool  # 마감 시간 안에 조회를 끝내지 못한 심볼이 있는지
+    elapsed_ms: float
+
+
 # Portfolio Item schemas
 class PortfolioItemCreate(BaseModel):
     asset_id: int
@@ -41,9 +69,15 @@ class PortfolioItemCreate(BaseModel):
 
 class PortfolioItemUpdate(BaseModel):
     current_quantity: float = Field(..., ge=0)
+    price: Optional[float] = Field(default=None, gt=0)  # 체결 가격 (없으면 현재가)
+
+
+class PortfolioItemBatchUpdate(PortfolioItemUpdate):
+    item_id: int
 
 
-class PortfolioItem(BaseModel):
+class PortfolioItemSummary(BaseModel):
+    """종목 정보 없이 asset_id만 포함 (compact 응답에서 assets 목록과 함께 사용)"""
     id: int
     portfolio_id: int
     asset_id: int
@@ -52,17 +86,49 @@ class PortfolioItem(BaseModel):
     entry_price: float
     initial_quantity: float
     current_quantity: float
+    cost_basis: float
+    realized_pnl: float
     created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class PortfolioItem(PortfolioItemSummary):
     asset: Asset
+
+
+# Trade ledger schemas
+class TradeCreate(BaseModel):
+    quantity: float  # 매수 +, 매도 -
+    price: float = Field(..., gt=0)
+
+
+class Trade(BaseModel):
+    id: int
+    item_id: int
+    quantity: float
+    price: float
+    executed_at: datetime
     
     class Config:
         from_attributes = True
 
 
+class Position(BaseModel):
+    item_id: int
+    asset: Asset
+    quantity: float
+    cost_basis: float
+    average_cost: Optional[float]
+    realized_pnl: float
+
+
 # Portfolio schemas
 class PortfolioCreate(BaseModel):
     name: str
     initial_invest_amount: float = Field(..., gt=0)
+    base_currency: str = Field(default="KRW", pattern=r"^[A-Z]{3}$")
     description: Optional[str] = None
     items: List[PortfolioItemCreate]
 
@@ -72,6 +138,7 @@ class Portfolio(BaseModel):
     user_id: int
     name: str
     initial_invest_amount: float
+    base_currency: str
     description: Optional[str]
     created_at: datetime
     
@@ -83,27 +150,160 @@ class PortfolioDetail(Portfolio):
     items: List[PortfolioItem]
 
 
+class PortfolioDetailCompact(Portfolio):
+    """종목 정보를 assets에 한 번씩만 담는 응답 (?compact=true)"""
+    items: List[PortfolioItemSummary]
+    assets: List[Asset]
+
+
 # Analysis schemas (for current weight calculation)
-class ItemAnalysis(BaseModel):
+class ItemAnalysisSummary(BaseModel):
     item_id: int
-    asset: Asset
+    asset_id: int
     target_weight: float
     current_weight: float
     weight_diff: float
     tolerance: float
     is_out_of_range: bool
     current_quantity: float
-    current_price: float
-    current_value: float
+    current_price: float  # 종목 통화 기준
+    currency: str  # 종목 통화
+    fx_rate: float  # 종목 통화 → 기준 통화 환율
+    current_value: float  # 기준 통화 기준
     entry_price: float
     initial_quantity: float
 
 
+class ItemAnalysis(ItemAnalysisSummary):
+    asset: Asset
+
+
 class PortfolioAnalysis(BaseModel):
     portfolio: Portfolio
+    base_currency: str
     total_value: float
     initial_invest_amount: float
     total_return: float
     total_return_pct: float
     items: List[ItemAnalysis]
 
+
+class PortfolioAnalysisCompact(PortfolioAnalysis):
+    """종목 정보를 assets에 한 번씩만 담는 응답 (?compact=true)"""
+    items: List[ItemAnalysisSummary]
+    assets: List[Asset]
+
+
+
+# Risk schemas
+class ItemRisk(BaseModel):
+    item_id: int
+    asset_id: int
+    symbol: str
+    weight: float  # 현재 평가금액 비중 (%)
+    volatility: float  # 연율화 변동성 (%)
+    max_drawdown: float  # 구간 내 최대 낙폭 (%, 음수)
+    risk_contribution: float  # 포트폴리오 변동성 기여분 (%p, 합계 = 포트폴리오 변동성)
+    risk_contribution_pct: float  # 변동성 기여 비중 (%)
+
+
+class PortfolioRisk(BaseModel):
+    portfolio_id: int
+    base_currency: str
+    window: int  # 요청 구간 (거래일)
+    observations: int  # 실제 사용한 일별 수익률 개수
+    as_of: date  # 마지막 종가 날짜
+    volatility: float  # 연율화 변동성 (%)
+    max_drawdown: float  # 비중 고정 시 포트폴리오 최대 낙폭 (%, 음수)
+    symbols: List[str]  # correlation 행/열 순서
+    correlation: List[List[float]]
+    items: List[ItemRisk]
+    missing_symbols: List[str]  # 시세 이력이 없어 제외한 종목
+
+
+# Simulation schemas
+class SimulationRequest(BaseModel):
+    horizon_days: int = Field(default=252, ge=1, le=2520)  # 예측 기간 (거래일)
+    paths: int = Field(default=10000, ge=100, le=200000)  # 시뮬레이션 경로 수
+    window: Optional[int] = Field(default=None, ge=20, le=1260)  # 수익률 통계 구간 (거래일, 기본 RISK_DEFAULT_WINDOW)
+    target_value: Optional[float] = Field(default=None, gt=0)  # 목표 평가금액 (기준 통화)
+    percentiles: List[float] = Field(default=[5, 25, 50, 75, 95], min_length=1, max_length=9)
+    seed: Optional[int] = Field(default=None, ge=0)  # 재현용 난수 시드
+
+
+class SimulationBand(BaseModel):
+    percentile: float
+    values: List[float]  # days 순서의 평가금액 (기준 통화)
+
+
+class PortfolioSimulation(BaseModel):
+    portfolio_id: int
+    base_currency: str
+    horizon_days: int
+    window: int
+    observations: int  # 통계에 사용한 일별 수익률 개수
+    paths_requested: int
+    paths: int  # 시간 예산 안에 완료한 경로 수
+    truncated: bool  # 시간 예산 초과로 일부 경로만 계산했는지
+    elapsed_ms: float
+    start_value: float  # 현재 평가금액 (기준 통화)
+    expected_value: float  # 기간 말 평균 평가금액
+    days: List[int]  # 밴드 시점 (0 = 현재)
+    bands: List[SimulationBand]
+    target_value: Optional[float] = None
+    target_probability: Optional[float] = None  # 기간 말 목표 이상일 확률 (%)
+    target_touch_probability: Optional[float] = None  # 기간 중 한 번이라도 목표에 도달할 확률 (%)
+    missing_symbols: List[str]  # 시세 이력이 없어 현재 금액 그대로 둔 종목
+
+
+# Bulk import schemas
+class PortfolioImportRow(BaseModel):
+    """가져오기 한 행 = 포트폴리오 종목 1개 (같은 portfolio_ref의 연속된 행이 한 포트폴리오)"""
+    portfolio_ref: Optional[str] = None  # 없으면 portfolio(이름)로 묶음
+    portfolio: str
+    initial_invest_amount: Optional[float] = Field(default=None, gt=0)  # 포트폴리오 첫 행에 필수
+    base_currency: Optional[str] = Field(default=None, pattern=r"^[A-Z]{3}$")
+    description: Optional[str] = None
+    symbol: str
+    name: Optional[str] = None
+    exchange: Optional[str] = None
+    target_weight: float = Field(..., gt=0, le=100)
+    tolerance: float = Field(default=5.0, ge=0, le=50)
+    entry_price: Optional[float] = Field(default=None, gt=0)  # 없으면 현재가
+    current_quantity: Optional[float] = Field(default=None, ge=0)  # 없으면 초기 수량
+
+
+class ImportRowError(BaseModel):
+    row: int
+    portfolio: Optional[str] = None
+    symbol: Optional[str] = None
+    error: str
+
+
+class ImportResult(BaseModel):
+    rows_processed: int
+    portfolios_created: int
+    items_created: int
+    errors: List[ImportRowError]
+
+
+class PortfolioJob(BaseModel):
+    id: str
+    status: str  # queued, running, succeeded, failed
+    portfolio_id: Optional[int] = None
+    symbols_total: int
+    symbols_priced: int
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class CatalogSyncResult(BaseModel):
+    synced: Dict[str, int] = {}  # 시장별 upsert한 종목 수
+    delisted: int = 0  # 리스트에서 빠져 is_listed = False로 바뀐 종목 수
+    errors: List[str] = []
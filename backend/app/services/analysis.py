@@ -0,0 +1,90 @@
+from typing import Dict, Optional
+
+from ..schemas.portfolio import PortfolioAnalysis, PortfolioAnalysisCompact
+from .fx import asset_currency, fx_factors
+from .market import get_multiple_prices
+from .serialization import portfolio_fields, unique_assets
+
+
+def build_portfolio_analysis(
+    portfolio,
+    prices: Optional[Dict[str, Optional[float]]] = None,
+    fx_rates: Optional[Dict[str, Optional[float]]] = None,
+    compact: bool = False
+) -> PortfolioAnalysis:
+    """
+    포트폴리오 분석 (현재 비중, 차이, 경고 등)
+    - 종목 통화의 평가금액을 기준 통화로 환산한 뒤 비중 계산
+    - prices / fx_rates를 넘기면 재사용 (여러 포트폴리오 일괄 분석 시 조회 1회)
+    - 환율을 가져올 수 없으면 FXRateUnavailable
+    - 전체 결과를 dict로 모은 뒤 스키마 검증 1회 (compact=True면 종목 정보는 assets에 한 번씩)
+    """
+    import numpy as np
+
+    items = list(portfolio.items)
+    base_currency = portfolio.base_currency
+
+    # 모든 종목의 현재가 조회 (중복 심볼은 1회)
+    if prices is None:
+        prices = get_multiple_prices(list(dict.fromkeys(item.asset.symbol for item in items)))
+
+    # 가격을 가져올 수 없는 경우 entry_price 사용
+    current_prices = np.array(
+        [prices.get(item.asset.symbol) or item.entry_price for item in items], dtype=float
+    )
+    quantities = np.array([item.current_quantity for item in items], dtype=float)
+    target_weights = np.array([item.target_weight for item in items], dtype=float)
+    tolerances = np.array([item.tolerance for item in items], dtype=float)
+    currencies = [asset_currency(item.asset) for item in items]
+
+    # 평가금액 (기준 통화)
+    rates, _ = fx_factors(currencies, base_currency, fx_rates)
+    current_values = quantities * current_prices * rates
+    total_value = float(current_values.sum())
+
+    # 현재 비중 / 차이 / 허용 범위 벗어남 여부
+    if total_value > 0:
+        current_weights = current_values / total_value * 100
+    else:
+        current_weights = np.zeros(len(items))
+    weight_diffs = current_weights - target_weights
+    out_of_range = np.abs(weight_diffs) > tolerances
+
+    items_analysis = [
+        {
+            "item_id": item.id,
+            "asset_id": item.asset_id,
+            "target_weight": item.target_weight,
+            "current_weight": float(current_weights[i]),
+            "weight_diff": float(weight_diffs[i]),
+            "tolerance": item.tolerance,
+            "is_out_of_range": bool(out_of_range[i]),
+            "current_quantity": item.current_quantity,
+            "current_price": float(current_prices[i]),
+            "currency": currencies[i],
+            "fx_rate": float(rates[i]),
+            "current_value": float(current_values[i]),
+            "entry_price": item.entry_price,
+            "initial_quantity": item.initial_quantity,
+            **({} if compact else {"asset": item.asset})
+        }
+        for i, item in enumerate(items)
+    ]
+
+    # 전체 수익률 계산
+    total_return = total_value - portfolio.initial_invest_amount
+    total_return_pct = (total_return / portfolio.initial_invest_amount * 100) if portfolio.initial_invest_amount > 0 else 0
+
+    result = {
+        "portfolio": portfolio_fields(portfolio),
+        "base_currency": base_currency,
+        "total_value": total_value,
+        "initial_invest_amount": portfolio.initial_invest_amount,
+        "total_return": total_return,
+        "total_return_pct": total_return_pct,
+        "items": items_analysis
+    }
+    if compact:
+        result["assets"] = unique_assets(item.asset for item in items)
+        return PortfolioAnalysisCompact.model_validate(result, from_attributes=True)
+    return PortfolioAnalysis.model_validate(result, from_attributes=True)
@@ -2,7 +2,8 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+import secrets
+from fastapi import Depends, HTTPException, Header, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
@@ -62,3 +63,20 @@ async def get_current_user(
         raise credentials_exception
     return user
 
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """관리자 토큰 확인 (ADMIN_TOKEN 미설정 시 항상 False)"""
+    if not settings.ADMIN_TOKEN or not token:
+        return False
+    # 문자열 비교는 비ASCII 문자(latin-1 헤더 등)에서 TypeError → 바이트로 비교
+    return secrets.compare_digest(token.encode("utf-8"), settings.ADMIN_TOKEN.encode("utf-8"))
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """관리자 전용 엔드포인트 의존성 (X-Admin-Token 헤더)"""
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
@@ -0,0 +1,366 @@
+"""
+포트폴리오 대량 가져오기 / 내보내기
+
+- 가져오기: CSV / JSONL을 한 행씩 스트리밍으로 읽고 IMPORT_CHUNK_SIZE개 포트폴리오 단위로
+  종목 일괄 조회 → 중복 없는 심볼만 시세 조회 → 청크별 트랜잭션으로 저장 (행 단위 오류 보고)
+- 내보내기: DB에서 EXPORT_BATCH_SIZE 행씩 읽어 CSV / JSONL로 스트리밍
+"""
+import codecs
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.portfolio import Portfolio as PortfolioModel, PortfolioItem as PortfolioItemModel, Asset as AssetModel
+from ..schemas.portfolio import PortfolioImportRow, ImportRowError, ImportResult
+from .fx import asset_currency, get_fx_rate
+from .market import get_multiple_prices
+from .portfolio_builder import add_portfolio, ItemSpec, PortfolioBuildError
+from .resilience import UpstreamBusy
+
+FORMATS = ("csv", "jsonl", "json")
+
+# 가져오기/내보내기 공통 컬럼 (내보낸 파일을 그대로 다시 가져올 수 있음)
+FIELDS = [
+    "portfolio_ref", "portfolio", "initial_invest_amount", "base_currency", "description",
+    "symbol", "name", "exchange", "target_weight", "tolerance", "entry_price", "current_quantity",
+]
+
+
+def detect_format(filename: Optional[str], explicit: Optional[str] = None) -> str:
+    """파일 형식 결정 (명시값 → 확장자 → csv)"""
+    if explicit:
+        return explicit
+    if filename:
+        ext = filename.rsplit(".", 1)[-1].lower()
+        if ext in FORMATS:
+            return ext
+        if ext == "ndjson":
+            return "jsonl"
+    return "csv"
+
+
+def _iter_records(stream: BinaryIO, fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """(행 번호, 레코드, 파싱 오류) 스트리밍"""
+    if fmt == "json":
+        # JSON 배열은 스트리밍 파싱이 불가하므로 한 번에 읽음 (대용량은 JSONL 권장)
+        data = json.load(codecs.getreader("utf-8-sig")(stream))
+        if not isinstance(data, list):
+            yield 1, None, "JSON input must be an array of rows"
+            return
+        for row_no, record in enumerate(data, start=1):
+            yield row_no, record, None
+        return
+
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        # 헤더가 1행이므로 데이터는 2행부터
+        for row_no, record in enumerate(csv.DictReader(text), start=2):
+            yield row_no, {k: (v.strip() or None) if isinstance(v, str) else v for k, v in record.items() if k}, None
+        return
+
+    for row_no, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield row_no, json.loads(line), None
+        except json.JSONDecodeError as e:
+            yield row_no, None, f"Invalid JSON: {e}"
+
+
+@dataclass
+class _Group:
+    """한 포트폴리오에 해당하는 연속된 행"""
+    ref: str
+    rows: List[Tuple[int, PortfolioImportRow]] = field(default_factory=list)
+    invalid: bool = False
+    reported: bool = False  # 포트폴리오 단위 오류를 이미 보고함
+
+
+def _iter_groups(
+    stream: BinaryIO, fmt: str, result: ImportResult
+) -> Iterator[_Group]:
+    group: Optional[_Group] = None
+    for row_no, record, parse_error in _iter_records(stream, fmt):
+        result.rows_processed += 1
+        row: Optional[PortfolioImportRow] = None
+        ref: Optional[str] = None
+        
+        if isinstance(record, dict):
+            ref_value = record.get("portfolio_ref") or record.get("portfolio")
+            ref = str(ref_value) if ref_value is not None else None
+        elif parse_error is None:
+            parse_error = "Row must be an object"
+        
+        if parse_error is None:
+            # 빈 칸은 기본값 적용, portfolio_ref는 숫자(내보낸 id)도 허용
+            values = {k: v for k, v in record.items() if v is not None}
+            if "portfolio_ref" in values:
+                values["portfolio_ref"] = str(values["portfolio_ref"])
+            try:
+                row = PortfolioImportRow.model_validate(values)
+            except ValidationError as e:
+                parse_error = "; ".join(
+                    f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+                )
+        
+        # 새 포트폴리오 시작
+        if ref is not None and (group is None or group.ref != ref):
+            if group is not None:
+                yield group
+            group = _Group(ref=ref)
+        
+        if parse_error is not None:
+            result.errors.append(ImportRowError(
+                row=row_no,
+                portfolio=record.get("portfolio") if isinstance(record, dict) else None,
+                symbol=record.get("symbol") if isinstance(record, dict) else None,
+                error=parse_error
+            ))
+            # 잘못된 행이 포함된 포트폴리오는 통째로 건너뜀
+            if group is not None:
+                group.invalid = True
+            continue
+        
+        group.rows.append((row_no, row))
+
+    if group is not None:
+        yield group
+
+
+def _iter_chunks(groups: Iterator[_Group], size: int) -> Iterator[List[_Group]]:
+    chunk: List[_Group] = []
+    for group in groups:
+        chunk.append(group)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _group_error(result: ImportResult, group: _Group, error: str) -> None:
+    group.reported = True
+    row_no, row = group.rows[0] if group.rows else (0, None)
+    result.errors.append(ImportRowError(
+        row=row_no,
+        portfolio=row.portfolio if row else group.ref,
+        error=error
+    ))
+
+
+def _resolve_assets(db: Session, groups: List[_Group]) -> Dict[str, AssetModel]:
+    """청크의 모든 심볼을 한 번의 쿼리로 조회 (종목은 만들지 않음 → 카탈로그 / POST /assets로 등록된 종목만)"""
+    symbols = {row.symbol for group in groups for _, row in group.rows}
+    return {
+        asset.symbol: asset
+        for asset in db.query(AssetModel).filter(AssetModel.symbol.in_(list(symbols))).all()
+    }
+
+
+def _unknown_symbol_errors(result: ImportResult, groups: List[_Group], assets: Dict[str, AssetModel]) -> List[_Group]:
+    """등록되지 않은 심볼은 행 오류로 보고하고 해당 포트폴리오는 건너뜀 → 나머지 그룹 반환"""
+    valid = []
+    for group in groups:
+        unknown = [(row_no, row) for row_no, row in group.rows if row.symbol not in assets]
+        if not unknown:
+            valid.append(group)
+            continue
+        for row_no, row in unknown:
+            result.errors.append(ImportRowError(
+                row=row_no,
+                portfolio=row.portfolio,
+                symbol=row.symbol,
+                error="Asset not found in catalog"
+            ))
+        group.reported = True
+    return valid
+
+
+def _import_chunk(
+    db: Session,
+    user_id: int,
+    groups: List[_Group],
+    prices: Dict[str, Optional[float]],
+    fx_rates: Dict[Tuple[str, str], Optional[float]],
+    result: ImportResult
+) -> Tuple[int, int]:
+    """
+    청크 저장 (한 트랜잭션)
+    반환: commit된 (포트폴리오 수, 종목 수) - 예외로 롤백되면 호출자가 세지 않음
+    """
+    for group in groups:
+        if group.invalid and group.rows:
+            _group_error(result, group, "Portfolio skipped because it contains invalid rows")
+    groups = [group for group in groups if not group.invalid and group.rows]
+    if not groups:
+        return 0, 0
+
+    assets = _resolve_assets(db, groups)
+    groups = _unknown_symbol_errors(result, groups, assets)
+    if not groups:
+        return 0, 0
+
+    # entry_price가 없는 행의 심볼만, 이전 청크에서 조회하지 않은 것만 시세 조회
+    to_price = {
+        row.symbol
+        for group in groups for _, row in group.rows
+        if row.entry_price is None and row.symbol not in prices
+    }
+    if to_price:
+        prices.update(get_multiple_prices(sorted(to_price)))
+
+    created = items_created = 0
+    for group in groups:
+        first = group.rows[0][1]
+        if first.initial_invest_amount is None:
+            _group_error(result, group, "initial_invest_amount is required on the first row of a portfolio")
+            continue
+        base_currency = first.base_currency or "KRW"
+
+        # 통화쌍별 환율 (전체 가져오기에서 1회)
+        group_rates: Dict[str, Optional[float]] = {}
+        for _, row in group.rows:
+            currency = asset_currency(assets[row.symbol])
+            pair = (currency, base_currency)
+            if pair not in fx_rates:
+                fx_rates[pair] = get_fx_rate(currency, base_currency)
+            group_rates[currency] = fx_rates[pair]
+
+        savepoint = db.begin_nested()
+        try:
+            portfolio = add_portfolio(
+                db,
+                user_id=user_id,
+                name=first.portfolio,
+                initial_invest_amount=first.initial_invest_amount,
+                base_currency=base_currency,
+                description=first.description,
+                items=[
+                    ItemSpec(
+                        asset=assets[row.symbol],
+                        target_weight=row.target_weight,
+                        tolerance=row.tolerance,
+                        entry_price=row.entry_price,
+                        current_quantity=row.current_quantity
+                    )
+                    for _, row in group.rows
+                ],
+                prices=prices,
+                fx_rates=group_rates
+            )
+            db.flush()
+            savepoint.commit()
+        except PortfolioBuildError as e:
+            savepoint.rollback()
+            _group_error(result, group, e.detail)
+            continue
+
+        created += 1
+        items_created += len(portfolio.items)
+
+    db.commit()
+    return created, items_created
+
+
+def import_portfolios(
+    db: Session,
+    user_id: int,
+    stream: BinaryIO,
+    fmt: str,
+    chunk_size: Optional[int] = None
+) -> ImportResult:
+    """
+    포트폴리오 대량 가져오기
+    - 같은 portfolio_ref(없으면 portfolio 이름)의 연속된 행이 하나의 포트폴리오
+    - 포트폴리오 단위로 성공/실패 (실패한 포트폴리오는 건너뛰고 오류 보고)
+    """
+    result = ImportResult(rows_processed=0, portfolios_created=0, items_created=0, errors=[])
+    prices: Dict[str, Optional[float]] = {}
+    fx_rates: Dict[Tuple[str, str], Optional[float]] = {}
+
+    groups = _iter_groups(stream, fmt, result)
+    for chunk in _iter_chunks(groups, chunk_size or settings.IMPORT_CHUNK_SIZE):
+        try:
+            created, items_created = _import_chunk(db, user_id, chunk, prices, fx_rates, result)
+        except Exception as e:
+            db.rollback()
+            print(f"Portfolio import chunk error: {e}")
+            message = f"Market data busy, retry later: {e}" if isinstance(e, UpstreamBusy) else f"Database error: {e}"
+            # 이미 오류로 보고한 포트폴리오는 제외 (롤백된 나머지만 보고)
+            for group in chunk:
+                if not group.reported and not group.invalid:
+                    _group_error(result, group, message)
+            continue
+        result.portfolios_created += created
+        result.items_created += items_created
+
+    result.errors.sort(key=lambda error: error.row)
+    return result
+
+
+def iter_export_rows(db: Session, user_id: int) -> Iterator[dict]:
+    """사용자의 포트폴리오 종목을 배치 단위로 읽으며 행 생성 (전체를 메모리에 올리지 않음)"""
+    query = (
+        db.query(PortfolioModel, PortfolioItemModel, AssetModel)
+        .join(PortfolioItemModel, PortfolioItemModel.portfolio_id == PortfolioModel.id)
+        .join(AssetModel, AssetModel.id == PortfolioItemModel.asset_id)
+        .filter(PortfolioModel.user_id == user_id)
+        .order_by(PortfolioModel.id, PortfolioItemModel.id)
+        .yield_per(settings.EXPORT_BATCH_SIZE)
+    )
+    for portfolio, item, asset in query:
+        yield {
+            "portfolio_ref": portfolio.id,
+            "portfolio": portfolio.name,
+            "initial_invest_amount": portfolio.initial_invest_amount,
+            "base_currency": portfolio.base_currency,
+            "description": portfolio.description,
+            "symbol": asset.symbol,
+            "name": asset.name,
+            "exchange": asset.exchange,
+            "target_weight": item.target_weight,
+            "tolerance": item.tolerance,
+            "entry_price": item.entry_price,
+            "current_quantity": item.current_quantity,
+        }
+
+
+def export_portfolios(user_id: int, fmt: str, db: Optional[Session] = None) -> Iterator[str]:
+    """
+    내보내기 텍스트 스트림 (csv / jsonl)
+    StreamingResponse는 요청 의존성이 정리된 뒤에 소비되므로 db를 넘기지 않으면 자체 세션 사용
+    """
+    own_session = db is None
+    if own_session:
+        db = SessionLocal()
+    try:
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+            writer.writeheader()
+            for i, row in enumerate(iter_export_rows(db, user_id), start=1):
+                writer.writerow(row)
+                if i % settings.EXPORT_BATCH_SIZE == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+        else:
+            lines = []
+            for row in iter_export_rows(db, user_id):
+                lines.append(json.dumps(row, ensure_ascii=False))
+                if len(lines) >= settings.EXPORT_BATCH_SIZE:
+                    yield "\n".join(lines) + "\n"
+                    lines = []
+            if lines:
+                yield "\n".join(lines) + "\n"
+    finally:
+        if own_session:
+            db.close()
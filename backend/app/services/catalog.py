@@ -0,0 +1,296 @@
+"""
+종목 카탈로그 (assets 테이블)
+
+- sync_catalog: KRX(KOSPI/KOSDAQ) / NASDAQ / NYSE 전체 종목 리스트를 assets에 일괄 upsert
+  (python -m app.cli sync-catalog, 주기 실행 권장)
+- search_catalog: DB 인덱스로 종목 검색 → 워커마다 전체 종목 리스트를 메모리에 올리지 않음
+  - SQLite: FTS5 trigram 인덱스 (assets_fts, 마이그레이션 0004)
+  - Postgres: pg_trgm GIN 인덱스 (ILIKE 부분 일치, 유사도 % 연산자)
+  - DB에서 뽑은 후보만 SearchIndex로 다시 점수를 매겨 메모리 검색과 같은 순서로 반환
+- 카탈로그가 아직 비어 있으면(동기화 전) None → 호출 측에서 메모리 검색으로 대체
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import case, func, or_, text, update
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.portfolio import Asset as AssetModel
+from ..schemas.portfolio import AssetSearch, CatalogSyncResult
+from .market import _get_krx_stocks, _get_us_stocks, _has_korean, get_multiple_prices
+from .resilience import UpstreamBusy
+from .search_index import NGRAM_SIZE, SearchIndex, chosung, decompose, is_jamo
+
+# 시장별 (거래소, 통화)
+MARKETS = {
+    "KRX": ("KRX", "KRW"),
+    "US": ("US", "USD"),
+}
+
+# 카탈로그에 동기화된 종목이 있는지 (한 번 확인되면 프로세스 동안 유지)
+_catalog_ready = False
+# SQLite FTS5 인덱스(assets_fts) 존재 여부 (첫 검색 시 확인)
+_fts_available: Optional[bool] = None
+
+
+def _listing(market: str):
+    return _get_krx_stocks() if market == "KRX" else _get_us_stocks()
+
+
+def _catalog_rows(market: str, listing, synced_at: datetime) -> List[dict]:
+    """종목 리스트(ListingStore) → assets 행 (심볼 중복 제거)"""
+    exchange, currency = MARKETS[market]
+    rows: Dict[str, dict] = {}
+    for row, (code, name) in enumerate(zip(listing.codes, listing.names)):
+        if not code or code in rows:
+            continue
+        name = name or code
+        rows[code] = {
+            "symbol": code,
+            "name": name,
+            "exchange": exchange,
+            "market": listing.market(row),
+            "currency": currency,
+            "asset_type": "stock",
+            "name_chosung": chosung(name),
+            "name_jamo": decompose(name),
+            "is_listed": True,
+            "catalog_synced_at": synced_at,
+        }
+    return list(rows.values())
+
+
+def _upsert(db: Session, rows: List[dict]) -> None:
+    """symbol 기준 일괄 upsert (SQLite / Postgres는 ON CONFLICT, 그 외는 merge)"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        existing = {
+            asset.symbol: asset
+            for asset in db.query(AssetModel).filter(AssetModel.symbol.in_([row["symbol"] for row in rows]))
+        }
+        for row in rows:
+            asset = existing.get(row["symbol"])
+            if asset is None:
+                db.add(AssetModel(**row))
+            else:
+                for key, value in row.items():
+                    if key != "asset_type":
+                        setattr(asset, key, value)
+        return
+
+    statement = insert(AssetModel.__table__)
+    # asset_type은 사용자가 지정한 값(etf 등)을 유지
+    updated = ("name", "exchange", "market", "currency", "name_chosung", "name_jamo", "is_listed", "catalog_synced_at")
+    statement = statement.on_conflict_do_update(
+        index_elements=["symbol"],
+        set_={column: statement.excluded[column] for column in updated}
+    )
+    db.execute(statement, rows)
+
+
+def sync_catalog(db: Session, markets: Iterable[str] = ("KRX", "US"), batch_size: Optional[int] = None) -> CatalogSyncResult:
+    """
+    종목 리스트를 assets에 일괄 upsert (시장별 트랜잭션)
+    - 이번 리스트에 없는 기존 카탈로그 종목은 is_listed = False (포트폴리오가 참조할 수 있어 삭제하지 않음)
+    - 리스트를 가져오지 못한 시장은 건너뜀 (기존 카탈로그 유지)
+    """
+    global _catalog_ready
+    batch_size = batch_size or settings.CATALOG_SYNC_BATCH_SIZE
+    result = CatalogSyncResult()
+
+    for market in markets:
+        if market not in MARKETS:
+            result.errors.append(f"Unknown market: {market}")
+            continue
+        try:
+            listing = _listing(market)
+        except UpstreamBusy as e:
+            listing = None
+            print(f"Catalog listing busy for {market}: {e}")
+        if listing is None or len(listing) == 0:
+            result.errors.append(f"Could not download {market} listing")
+            continue
+
+        synced_at = datetime.utcnow()
+        rows = _catalog_rows(market, listing, synced_at)
+        try:
+            for start in range(0, len(rows), batch_size):
+                _upsert(db, rows[start:start + batch_size])
+            delisted = db.execute(
+                update(AssetModel)
+                .where(
+                    AssetModel.exchange == MARKETS[market][0],
+                    AssetModel.catalog_synced_at < synced_at,
+                    AssetModel.is_listed.is_(True)
+                )
+                .values(is_listed=False)
+            ).rowcount
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Catalog sync error for {market}: {e}")
+            result.errors.append(f"{market}: {e}")
+            continue
+
+        result.synced[market] = len(rows)
+        result.delisted += delisted or 0
+        _catalog_ready = True
+
+    return result
+
+
+def catalog_ready(db: Session) -> bool:
+    """동기화된 카탈로그가 있는지"""
+    global _catalog_ready
+    if not _catalog_ready:
+        _catalog_ready = db.query(AssetModel.id).filter(AssetModel.catalog_synced_at.isnot(None)).first() is not None
+    return _catalog_ready
+
+
+def _has_fts(db: Session) -> bool:
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = db.get_bind().dialect.name == "sqlite" and db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'assets_fts'")
+        ).first() is not None
+    return _fts_available
+
+
+def _fts_match(columns: List[str], terms: List[str]) -> str:
+    """FTS5 MATCH 식 ({컬럼 ...} : ("구문" OR ...))"""
+    phrases = " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+    return "{" + " ".join(columns) + "} : (" + phrases + ")"
+
+
+def _fts_rowids(match: str, exchange: str, limit: int):
+    """
+    FTS5 일치 종목 id (순위순 최대 limit개)
+    거래소 / 상장 조건을 LIMIT 전에 적용 → 다른 시장 종목이 후보 수를 채우지 않도록
+    """
+    if exchange == "KRX":
+        exchange_condition = "assets.exchange = 'KRX'"
+    else:
+        exchange_condition = "(assets.exchange IS NULL OR assets.exchange != 'KRX')"
+    return text(
+        "SELECT assets_fts.rowid FROM assets_fts JOIN assets ON assets.id = assets_fts.rowid "
+        f"WHERE assets_fts MATCH :match AND assets.is_listed AND {exchange_condition} "
+        "ORDER BY assets_fts.rank LIMIT :limit"
+    ).bindparams(match=match, limit=limit).columns(rowid=AssetModel.id.type)
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _market_query(db: Session, exchange: str):
+    """거래소 조건 (KRX / 그 외는 미국으로 취급)"""
+    query = db.query(AssetModel).filter(AssetModel.is_listed.is_(True))
+    if exchange == "KRX":
+        return query.filter(AssetModel.exchange == "KRX")
+    return query.filter(or_(AssetModel.exchange.is_(None), AssetModel.exchange != "KRX"))
+
+
+def _substring_candidates(db: Session, exchange: str, needle: str, jamo_query: bool, limit: int) -> List[AssetModel]:
+    """코드/이름(자모 쿼리는 초성 키) 접두·부분 일치 후보 (인덱스 사용)"""
+    if jamo_query:
+        needle = chosung(needle)
+        columns = [AssetModel.name_chosung]
+    else:
+        columns = [AssetModel.symbol, AssetModel.name]
+
+    prefix = _like_escape(needle) + "%"
+    if len(needle) < NGRAM_SIZE:
+        # trigram 인덱스는 3글자 이상부터 → 짧은 쿼리는 접두 일치만
+        condition = or_(*(column.ilike(prefix, escape="\\") for column in columns))
+    elif _has_fts(db):
+        match = _fts_match([column.key for column in columns], [needle])
+        condition = AssetModel.id.in_(_fts_rowids(match, exchange, settings.CATALOG_SEARCH_CANDIDATES * 10))
+    else:
+        contains = "%" + _like_escape(needle) + "%"
+        condition = or_(*(column.ilike(contains, escape="\\") for column in columns))
+
+    score = case(
+        *[(func.lower(column) == needle, 2) for column in columns],
+        *[(column.ilike(prefix, escape="\\"), 1) for column in columns],
+        else_=0
+    )
+    return (
+        _market_query(db, exchange)
+        .filter(condition)
+        .order_by(score.desc(), func.length(AssetModel.name), AssetModel.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def _fuzzy_candidates(db: Session, exchange: str, needle: str) -> List[AssetModel]:
+    """오타 허용 후보: 자모 분해 이름의 trigram이 겹치는 종목 (SQLite FTS5 / Postgres pg_trgm)"""
+    jamo = decompose(needle)
+    grams = sorted({jamo[i:i + NGRAM_SIZE] for i in range(len(jamo) - NGRAM_SIZE + 1)})
+    if len(grams) < 2:
+        return []
+
+    limit = settings.CATALOG_SEARCH_CANDIDATES
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return (
+            _market_query(db, exchange)
+            .filter(AssetModel.name_jamo.op("%")(jamo))
+            .order_by(func.similarity(AssetModel.name_jamo, jamo).desc())
+            .limit(limit)
+            .all()
+        )
+    if _has_fts(db):
+        match = _fts_match(["symbol", "name_jamo"], grams)
+        return _market_query(db, exchange).filter(AssetModel.id.in_(_fts_rowids(match, exchange, limit * 2))).limit(limit).all()
+    return []
+
+
+def _search_exchange(db: Session, exchange: str, query: str, limit: int) -> List[AssetModel]:
+    needle = " ".join(query.lower().split())
+    jamo_query = any(is_jamo(char) for char in needle)
+    candidates = _substring_candidates(db, exchange, needle, jamo_query, max(limit * 5, settings.CATALOG_SEARCH_CANDIDATES))
+    if len(candidates) < limit:
+        seen = {asset.id for asset in candidates}
+        candidates += [asset for asset in _fuzzy_candidates(db, exchange, needle) if asset.id not in seen]
+    if not candidates:
+        return []
+
+    # 후보만으로 만든 인덱스로 메모리 검색과 같은 점수 / 순서 적용
+    index = SearchIndex([asset.symbol for asset in candidates], [asset.name for asset in candidates])
+    return [candidates[row] for row in index.search(query, limit)]
+
+
+def search_catalog(db: Session, query: str, limit: int = 10) -> Optional[List[AssetSearch]]:
+    """
+    카탈로그 종목 검색 (카탈로그가 비어 있으면 None)
+    - 한글 쿼리(초성 포함): 한국 종목만, 영문 쿼리: 미국 종목 우선, 결과 없으면 한국 종목
+    - 현재가를 가져올 수 없는 종목은 제외 (메모리 검색과 동일)
+    """
+    if not catalog_ready(db):
+        return None
+
+    query = query.strip()
+    if _has_korean(query):
+        assets = _search_exchange(db, "KRX", query, limit)
+    else:
+        assets = _search_exchange(db, "US", query, limit) or _search_exchange(db, "KRX", query, limit)
+
+    prices = get_multiple_prices([asset.symbol for asset in assets])
+    return [
+        AssetSearch(
+            symbol=asset.symbol,
+            name=asset.name,
+            exchange=asset.exchange,
+            currency=asset.currency,
+            current_price=prices[asset.symbol]
+        )
+        for asset in assets
+        if prices.get(asset.symbol) is not None
+    ]
+
@@ -0,0 +1,102 @@
+"""
+환율 조회 및 통화 환산
+
+- 통화쌍별 환율을 FX_CACHE_TTL 동안 공유 캐시에 보관 (한 번의 분석에서 통화쌍당 1회 조회)
+- 종목별 평가금액은 numpy 배열로 한 번에 기준 통화로 환산
+"""
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from ..config import settings
+from .market import _fetch_latest_close
+from .resilience import source_for_symbol, UpstreamError, UpstreamBusy
+from .shared_cache import get_shared_cache
+from .singleflight import SingleFlight
+
+# 마지막으로 성공한 환율 (소스 장애 시 대체값)
+_last_known_rates: Dict[Tuple[str, str], Tuple[float, datetime]] = {}
+_last_known_lock = threading.Lock()
+
+_flight = SingleFlight()
+
+
+class FXRateUnavailable(Exception):
+    def __init__(self, currencies: Sequence[str], base_currency: str):
+        self.currencies = list(currencies)
+        self.base_currency = base_currency
+        pairs = ", ".join(f"{ccy}/{base_currency}" for ccy in self.currencies)
+        super().__init__(f"Could not fetch FX rate for {pairs}")
+
+
+def asset_currency(asset) -> str:
+    """종목의 거래 통화 (한국 종목코드는 저장된 값과 무관하게 KRW)"""
+    if asset.exchange == "KRX" or source_for_symbol(asset.symbol) == "KRX":
+        return "KRW"
+    return (asset.currency or "USD").upper()
+
+
+def _fetch_rate(from_ccy: str, to_ccy: str) -> Optional[float]:
+    cache = get_shared_cache()
+    rate = cache.get(f"fx:{from_ccy}/{to_ccy}")
+    if rate is not None:
+        return rate
+    # 역방향 환율이 캐시에 있으면 역수 사용
+    inverse = cache.get(f"fx:{to_ccy}/{from_ccy}")
+    if inverse:
+        return 1.0 / inverse
+
+    rate = _fetch_latest_close(f"{from_ccy}/{to_ccy}")
+    if rate is not None:
+        cache.set(f"fx:{from_ccy}/{to_ccy}", rate, settings.FX_CACHE_TTL)
+    return rate
+
+
+def get_fx_rate(from_ccy: str, to_ccy: str) -> Optional[float]:
+    """1 from_ccy = ? to_ccy (조회 실패 시 마지막으로 성공한 환율, 없으면 None)"""
+    from_ccy, to_ccy = from_ccy.upper(), to_ccy.upper()
+    if from_ccy == to_ccy:
+        return 1.0
+
+    pair = (from_ccy, to_ccy)
+    try:
+        rate = _flight.do(("fx", pair), _fetch_rate, from_ccy, to_ccy)
+    except UpstreamError as e:
+        with _last_known_lock:
+            fallback = _last_known_rates.get(pair)
+        # 과부하인데 대체값도 없으면 429로 전달
+        if isinstance(e, UpstreamBusy) and fallback is None:
+            raise
+        print(f"FX rate fetch error for {from_ccy}/{to_ccy}: {e}")
+        return fallback[0] if fallback else None
+
+    with _last_known_lock:
+        if rate is not None:
+            _last_known_rates[pair] = (rate, datetime.now())
+            return rate
+        fallback = _last_known_rates.get(pair)
+    return fallback[0] if fallback else None
+
+
+def get_fx_rates(currencies: Iterable[str], base_currency: str) -> Dict[str, Optional[float]]:
+    """통화별 기준 통화 환산율 (통화쌍당 1회 조회)"""
+    return {ccy: get_fx_rate(ccy, base_currency) for ccy in set(currencies)}
+
+
+def fx_factors(
+    currencies: Sequence[str],
+    base_currency: str,
+    rates: Optional[Dict[str, Optional[float]]] = None
+) -> Tuple["np.ndarray", Dict[str, Optional[float]]]:
+    """
+    종목별 통화 → 기준 통화 환산율 배열
+    rates를 넘기면 재사용 (여러 포트폴리오 일괄 분석 시)
+    """
+    import numpy as np
+    
+    if rates is None:
+        rates = get_fx_rates(currencies, base_currency)
+    missing = sorted({ccy for ccy in currencies if rates.get(ccy) is None})
+    if missing:
+        raise FXRateUnavailable(missing, base_currency)
+    return np.array([rates[ccy] for ccy in currencies], dtype=float), rates
@@ -0,0 +1,298 @@
+"""
+매매 원장 (append-only) 및 포지션 관리
+
+- 매매는 trades 테이블에 추가만 하고, 현재 포지션(수량/취득원가/실현손익)은
+  portfolio_items 행에 증분으로 유지 → 현재 포지션 조회는 종목당 O(1)
+- LEDGER_SNAPSHOT_INTERVAL건마다 position_snapshots에 스냅샷을 남겨
+  과거 시점 포지션은 "직전 스냅샷 + 최대 N건 재생"으로 계산
+- 체결 시각은 서버 시각이며 소급 입력은 허용하지 않음 (id 순서 = 시간 순서)
+- 취득원가는 이동평균법
+- 동시 갱신: 종목을 lock_items로 다시 읽고(Postgres SELECT ... FOR UPDATE) 반영
+  포지션 UPDATE는 읽은 trade_count가 그대로일 때만 적용 (SQLite처럼 행 잠금이 없으면
+  PositionConflict → retry_on_conflict가 롤백 후 다시 읽어 재시도)
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import bindparam, func, insert, inspect, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ..config import settings
+from ..models.portfolio import PortfolioItem as PortfolioItemModel
+from ..models.trade import Trade as TradeModel, PositionSnapshot as PositionSnapshotModel
+
+
+class LedgerError(Exception):
+    """원장에 기록할 수 없는 매매 (예: 보유 수량 초과 매도)"""
+
+
+class PositionConflict(Exception):
+    """읽은 뒤 다른 요청이 같은 종목의 포지션을 먼저 갱신함"""
+
+
+# 포지션 충돌 시 재시도 횟수
+CONFLICT_RETRIES = 3
+
+T = TypeVar("T")
+
+
+@dataclass
+class PositionState:
+    quantity: float = 0.0
+    cost_basis: float = 0.0
+    realized_pnl: float = 0.0
+
+    @property
+    def average_cost(self) -> Optional[float]:
+        return self.cost_basis / self.quantity if self.quantity > 0 else None
+
+
+# 부동소수점 오차로 인한 잔량 허용치
+_EPSILON = 1e-9
+
+
+def apply_to_state(state: PositionState, quantity: float, price: float) -> PositionState:
+    """매매 1건을 포지션에 반영 (이동평균법)"""
+    if quantity >= 0:
+        return PositionState(
+            quantity=state.quantity + quantity,
+            cost_basis=state.cost_basis + quantity * price,
+            realized_pnl=state.realized_pnl
+        )
+
+    sell_quantity = -quantity
+    if sell_quantity > state.quantity + _EPSILON:
+        raise LedgerError(f"Cannot sell {sell_quantity} with only {state.quantity} held")
+    sell_quantity = min(sell_quantity, state.quantity)
+    average_cost = state.cost_basis / state.quantity if state.quantity > 0 else 0.0
+    remaining = state.quantity - sell_quantity
+    return PositionState(
+        quantity=remaining,
+        cost_basis=state.cost_basis - sell_quantity * average_cost if remaining > _EPSILON else 0.0,
+        realized_pnl=state.realized_pnl + sell_quantity * (price - average_cost)
+    )
+
+
+def item_state(item: PortfolioItemModel) -> PositionState:
+    return PositionState(
+        quantity=item.current_quantity,
+        cost_basis=item.cost_basis or 0.0,
+        realized_pnl=item.realized_pnl or 0.0
+    )
+
+
+def record_trade(
+    db: Session,
+    item: PortfolioItemModel,
+    quantity: float,
+    price: float,
+    executed_at: Optional[datetime] = None
+) -> TradeModel:
+    """
+    매매를 원장에 추가하고 종목의 현재 포지션을 증분 갱신 (commit은 호출자가 담당)
+    보유 수량을 넘는 매도는 LedgerError, 읽은 뒤 다른 요청이 포지션을 바꿨으면 PositionConflict
+    """
+    new_state = apply_to_state(item_state(item), quantity, price)
+    executed_at = executed_at or datetime.utcnow()
+    trade_count = (item.trade_count or 0) + 1
+
+    trade = TradeModel(item=item, quantity=quantity, price=price, executed_at=executed_at)
+    db.add(trade)
+
+    values = {
+        "current_quantity": new_state.quantity,
+        "cost_basis": new_state.cost_basis,
+        "realized_pnl": new_state.realized_pnl,
+        "trade_count": trade_count,
+        "last_trade_at": executed_at
+    }
+    if inspect(item).persistent:
+        _write_position(db, item, values)
+    else:
+        # 아직 DB에 없는 종목 (포트폴리오 생성 중) → 다른 요청과 겹칠 수 없음
+        for key, value in values.items():
+            setattr(item, key, value)
+
+    if trade_count % settings.LEDGER_SNAPSHOT_INTERVAL == 0:
+        db.add(PositionSnapshotModel(
+            item=item,
+            trade=trade,
+            as_of=executed_at,
+            quantity=new_state.quantity,
+            cost_basis=new_state.cost_basis,
+            realized_pnl=new_state.realized_pnl
+        ))
+    return trade
+
+
+def _write_position(db: Session, item: PortfolioItemModel, values: dict) -> None:
+    """읽은 trade_count가 그대로일 때만 포지션 갱신 (아니면 PositionConflict)"""
+    result = db.execute(
+        update(PortfolioItemModel)
+        .where(
+            PortfolioItemModel.id == item.id,
+            PortfolioItemModel.trade_count == values["trade_count"] - 1
+        )
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        raise PositionConflict(f"Position of item {item.id} was changed by another request")
+    for key, value in values.items():
+        set_committed_value(item, key, value)
+
+
+def lock_items(db: Session, item_ids: Iterable[int]) -> Dict[int, PortfolioItemModel]:
+    """
+    포지션을 갱신할 종목을 기본키 순서로 잠그고 다시 읽기 (교착 방지)
+    - Postgres: SELECT ... FOR UPDATE, SQLite: 잠금 없이 최신 값만 읽음 (충돌은 갱신 시 감지)
+    """
+    items = (
+        db.query(PortfolioItemModel)
+        .filter(PortfolioItemModel.id.in_(list(item_ids)))
+        .order_by(PortfolioItemModel.id)
+        .with_for_update()
+        .populate_existing()
+        .all()
+    )
+    return {item.id: item for item in items}
+
+
+def retry_on_conflict(db: Session, operation: Callable[[], T]) -> T:
+    """
+    operation(종목을 lock_items로 읽고 반영 + commit)을 실행
+    PositionConflict면 롤백 후 CONFLICT_RETRIES회까지 재시도
+    """
+    for attempt in range(CONFLICT_RETRIES + 1):
+        try:
+            return operation()
+        except PositionConflict:
+            db.rollback()
+            if attempt == CONFLICT_RETRIES:
+                raise
+
+
+def set_quantity(
+    db: Session,
+    item: PortfolioItemModel,
+    quantity: float,
+    price: float
+) -> Optional[TradeModel]:
+    """목표 수량으로 맞추는 매매 기록 (변화가 없으면 None)"""
+    delta = quantity - item.current_quantity
+    if abs(delta) <= _EPSILON:
+        return None
+    return record_trade(db, item, delta, price)
+
+
+def position_as_of(db: Session, item: PortfolioItemModel, as_of: Optional[datetime]) -> PositionState:
+    """
+    특정 시점의 포지션
+    - as_of가 없거나 마지막 매매 이후면 현재 포지션 (O(1))
+    - 아니면 직전 스냅샷부터 최대 LEDGER_SNAPSHOT_INTERVAL건 재생
+    """
+    if as_of is None or item.last_trade_at is None or as_of >= item.last_trade_at:
+        return item_state(item)
+
+    snapshot = (
+        db.query(PositionSnapshotModel)
+        .filter(PositionSnapshotModel.item_id == item.id, PositionSnapshotModel.as_of <= as_of)
+        .order_by(PositionSnapshotModel.as_of.desc(), PositionSnapshotModel.id.desc())
+        .first()
+    )
+
+    state = PositionState()
+    trades = db.query(TradeModel).filter(
+        TradeModel.item_id == item.id,
+        TradeModel.executed_at <= as_of
+    )
+    if snapshot is not None:
+        state = PositionState(snapshot.quantity, snapshot.cost_basis, snapshot.realized_pnl)
+        trades = trades.filter(TradeModel.id > snapshot.trade_id)
+
+    for trade in trades.order_by(TradeModel.id):
+        state = apply_to_state(state, trade.quantity, trade.price)
+    return state
+
+
+def set_quantities(
+    db: Session,
+    targets: List[Tuple[PortfolioItemModel, float, float]]
+) -> int:
+    """
+    여러 종목의 목표 수량을 한 번에 반영 (commit은 호출자가 담당)
+    - targets: (종목, 목표 수량, 체결 가격)
+    - 매매는 bulk INSERT 1회, 포지션은 기본키 기준 bulk UPDATE 1회
+      (종목은 lock_items로 읽은 것, UPDATE는 읽은 trade_count가 그대로인 행만 → 아니면 PositionConflict)
+    - 하나라도 기록할 수 없으면 LedgerError (아무것도 반영하지 않음)
+    반환값: 기록된 매매 건수
+    """
+    executed_at = datetime.utcnow()
+    changes = []
+    for item, quantity, price in targets:
+        delta = quantity - item.current_quantity
+        if abs(delta) <= _EPSILON:
+            continue
+        changes.append((item, delta, price, apply_to_state(item_state(item), delta, price)))
+    if not changes:
+        return 0
+
+    db.execute(insert(TradeModel), [
+        {"item_id": item.id, "quantity": delta, "price": price, "executed_at": executed_at}
+        for item, delta, price, _ in changes
+    ])
+
+    item_rows = []
+    snapshot_rows = []
+    for item, _, _, state in changes:
+        trade_count = (item.trade_count or 0) + 1
+        item_rows.append({
+            "_id": item.id,
+            "_trade_count": trade_count - 1,
+            "current_quantity": state.quantity,
+            "cost_basis": state.cost_basis,
+            "realized_pnl": state.realized_pnl,
+            "trade_count": trade_count,
+            "last_trade_at": executed_at
+        })
+        if trade_count % settings.LEDGER_SNAPSHOT_INTERVAL == 0:
+            snapshot_rows.append({
+                "item_id": item.id,
+                "as_of": executed_at,
+                "quantity": state.quantity,
+                "cost_basis": state.cost_basis,
+                "realized_pnl": state.realized_pnl
+            })
+
+    # 스냅샷이 필요한 종목만 방금 추가한 매매 id 조회
+    if snapshot_rows:
+        last_trade_ids = dict(
+            db.query(TradeModel.item_id, func.max(TradeModel.id))
+            .filter(TradeModel.item_id.in_([row["item_id"] for row in snapshot_rows]))
+            .group_by(TradeModel.item_id)
+            .all()
+        )
+        for row in snapshot_rows:
+            row["trade_id"] = last_trade_ids[row["item_id"]]
+
+    table = PortfolioItemModel.__table__
+    result = db.execute(
+        update(table).where(
+            table.c.id == bindparam("_id"),
+            table.c.trade_count == bindparam("_trade_count")
+        ),
+        item_rows
+    )
+    # executemany 행 수를 신뢰할 수 없는 드라이버는 lock_items의 행 잠금에 의존
+    if db.get_bind().dialect.supports_sane_multi_rowcount and result.rowcount != len(item_rows):
+        raise PositionConflict("Positions were changed by another request")
+    for (item, _, _, _), row in zip(changes, item_rows):
+        for key, value in row.items():
+            if not key.startswith("_"):
+                set_committed_value(item, key, value)
+
+    if snapshot_rows:
+        db.execute(insert(PositionSnapshotModel), snapshot_rows)
+    return len(changes)
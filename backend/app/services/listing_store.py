@@ -0,0 +1,143 @@
+"""
+거래소 종목 리스트의 압축 저장소
+
+fdr.StockListing DataFrame은 검색에 쓰지 않는 컬럼(업종, 상장일, 지역 등)까지 모두 담고
+문자열마다 파이썬 객체를 따로 가지므로, 워커마다 들고 있으면 메모리를 많이 차지합니다.
+- 코드/이름만 남기고 UTF-8 바이트 하나 + 오프셋 배열로 저장 (문자열은 꺼낼 때 디코드)
+- 세부 시장(KOSPI, KOSDAQ, NASDAQ, NYSE ...)은 범주 목록 + 1바이트 코드 배열
+- 만들 때 원본 DataFrame 크기를 기록해 두고 memory_usage()로 비교 (검색 인덱스 크기 포함)
+- 공유 캐시에는 to_json() 결과(코드/이름/세부 시장 목록)로 저장
+"""
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+class StringColumn(Sequence):
+    """문자열 열 (UTF-8 연결 바이트 + 시작 오프셋)"""
+
+    def __init__(self, values: Iterable[str]):
+        encoded = [value.encode("utf-8") for value in values]
+        self._data = b"".join(encoded)
+        self._offsets = array("I", [0])
+        position = 0
+        for chunk in encoded:
+            position += len(chunk)
+            self._offsets.append(position)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._data[self._offsets[index]:self._offsets[index + 1]].decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        data, offsets = self._data, self._offsets
+        for i in range(len(offsets) - 1):
+            yield data[offsets[i]:offsets[i + 1]].decode("utf-8")
+
+    def rows_containing(self, needle: str) -> Iterator[int]:
+        """needle을 포함하는 행 번호 (연결 바이트에서 검색, 행 경계에 걸친 일치는 제외)"""
+        pattern = needle.encode("utf-8")
+        data, offsets = self._data, self._offsets
+        position = data.find(pattern)
+        while position >= 0:
+            row = bisect_right(offsets, position) - 1
+            end = offsets[row + 1]
+            if position + len(pattern) <= end:
+                yield row
+                position = data.find(pattern, end)
+            else:
+                position = data.find(pattern, position + 1)
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._data) + sys.getsizeof(self._offsets)
+
+
+class ListingStore:
+    """한 시장(KRX / US)의 종목 코드, 이름, 세부 시장"""
+
+    def __init__(self, codes: List[str], names: List[str], markets: List[str], source_bytes: int = 0):
+        labels: Dict[str, int] = {}
+        tags = array("B")
+        for market in markets:
+            if market not in labels:
+                if len(labels) == 255:
+                    raise ValueError("Too many distinct markets in listing")
+                labels[market] = len(labels)
+            tags.append(labels[market])
+
+        self.codes = StringColumn(codes)
+        self.names = StringColumn(names)
+        self.market_labels: List[str] = list(labels)
+        self._market_tags = tags
+        self.source_bytes = source_bytes  # 원본 DataFrame 메모리 (deep)
+
+    @classmethod
+    def from_frames(cls, frames: Sequence[Tuple[object, Optional[str]]], code_column: str) -> "ListingStore":
+        """
+        StockListing DataFrame들로 생성
+        frames: (DataFrame, 세부 시장) 목록, 세부 시장이 None이면 DataFrame의 Market 컬럼 사용
+        """
+        codes, names, markets = [], [], []
+        source_bytes = 0
+        for frame, market in frames:
+            source_bytes += int(frame.memory_usage(deep=True).sum())
+            codes += frame[code_column].fillna("").astype(str).str.strip().tolist()
+            names += frame["Name"].fillna("").astype(str).str.strip().tolist()
+            if market is None and "Market" in frame:
+                markets += frame["Market"].fillna("").astype(str).tolist()
+            else:
+                markets += [market or ""] * len(frame)
+        return cls(codes, names, markets, source_bytes)
+
+    def to_json(self) -> dict:
+        """공유 캐시 저장용 (JSON 호환)"""
+        return {
+            "codes": list(self.codes),
+            "names": list(self.names),
+            "markets": [self.market_labels[tag] for tag in self._market_tags],
+            "source_bytes": self.source_bytes,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "ListingStore":
+        return cls(data["codes"], data["names"], data["markets"], data.get("source_bytes", 0))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def market(self, row: int) -> Optional[str]:
+        """행의 세부 시장 (없으면 None)"""
+        return self.market_labels[self._market_tags[row]] or None
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.codes.nbytes
+            + self.names.nbytes
+            + sys.getsizeof(self._market_tags)
+            + sum(sys.getsizeof(label) for label in self.market_labels)
+        )
+
+    def memory_usage(self, index_bytes: int = 0) -> dict:
+        """
+        저장소 / 검색 인덱스 / 합계 바이트와 원본 DataFrame 대비 비율
+        index_bytes: 이 리스트로 만든 검색 인덱스 크기 (reduction은 합계 기준)
+        """
+        total = self.nbytes + index_bytes
+        return {
+            "rows": len(self),
+            "store_bytes": self.nbytes,
+            "index_bytes": index_bytes,
+            "bytes": total,
+            "source_bytes": self.source_bytes,
+            "reduction": round(self.source_bytes / total, 1) if total and self.source_bytes else None,
+            "markets": self.market_labels,
+        }
@@ -1,132 +1,220 @@
-import FinanceDataReader as fdr
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+import threading
+from typing import List, Dict, Optional, Tuple
+from datetime import date, datetime, timedelta
+from ..config import settings
 from ..schemas.portfolio import AssetSearch
+from .resilience import call_upstream, source_for_symbol, UpstreamError, UpstreamBusy, CircuitOpenError
+from .singleflight import SingleFlight
+from .shared_cache import get_shared_cache, get_or_load
+from .search_index import SearchIndex, is_jamo
+from .listing_store import ListingStore
 
 
-# 종목 리스트 캐시
+# FinanceDataReader는 pandas 등 무거운 모듈을 함께 로드하므로 첫 사용 시점까지 import 지연
+_fdr_module = None
+
+
+def _fdr():
+    """FinanceDataReader 모듈 (지연 로드)"""
+    global _fdr_module
+    if _fdr_module is None:
+        import FinanceDataReader
+        _fdr_module = FinanceDataReader
+    return _fdr_module
+
+
+# 종목 리스트 캐시 (ListingStore: 코드/이름/세부 시장만 압축 저장)
 _krx_stocks_cache = None
 _krx_cache_time = None
 _us_stocks_cache = None
 _us_cache_time = None
 CACHE_TTL = 3600  # 1시간
 
+# 마지막으로 성공한 시세 (서킷 오픈 / 호출 실패 시 대체값)
+_last_known_prices: Dict[str, Tuple[float, datetime]] = {}
+_last_known_lock = threading.Lock()
+
+# 동일한 리스트/시세 조회가 동시에 들어오면 하나의 다운로드로 병합
+_flight = SingleFlight()
+
+# 시장별 검색 인덱스 (만들 때 사용한 리스트 객체, 인덱스) - 리스트가 갱신되면 다시 생성
+_search_indexes: Dict[str, Tuple[object, SearchIndex]] = {}
+
 
-def _get_krx_stocks():
+def _is_fresh(cache_time: Optional[datetime]) -> bool:
+    return cache_time is not None and (datetime.now() - cache_time).total_seconds() < CACHE_TTL
+
+
+def _get_krx_stocks() -> Optional[ListingStore]:
     """한국 거래소 전체 종목 리스트 가져오기 (캐시 사용)"""
+    # 캐시 확인
+    if _krx_stocks_cache is not None and _is_fresh(_krx_cache_time):
+        return _krx_stocks_cache
+    
+    return _flight.do(("listing", "KRX"), _load_krx_stocks)
+
+
+def _load_krx_stocks():
     global _krx_stocks_cache, _krx_cache_time
     
-    # 캐시 확인
-    if _krx_stocks_cache is not None and _krx_cache_time is not None:
-        if (datetime.now() - _krx_cache_time).seconds < CACHE_TTL:
-            return _krx_stocks_cache
+    # 대기 중에 다른 호출이 이미 갱신했으면 재사용
+    if _krx_stocks_cache is not None and _is_fresh(_krx_cache_time):
+        return _krx_stocks_cache
     
     try:
-        # KOSPI + KOSDAQ 전체 종목 가져오기
-        krx_stocks = fdr.StockListing('KRX')
-        _krx_stocks_cache = krx_stocks
-        _krx_cache_time = datetime.now()
-        return krx_stocks
+        # 노드 공유 캐시 → 없으면 한 워커만 다운로드
+        entry = get_or_load(
+            "listing:v3:KRX", _download_krx_stocks, ttl=CACHE_TTL,
+            encode=ListingStore.to_json, decode=ListingStore.from_json,
+            lease_timeout=settings.MARKET_LISTING_TIMEOUT_SECONDS
+        )
+        if entry is None:
+            return _krx_stocks_cache
+        _krx_stocks_cache = entry.value
+        _krx_cache_time = datetime.fromtimestamp(entry.stored_at)
+        return _krx_stocks_cache
     except Exception as e:
         print(f"KRX stock listing error: {e}")
-        return None
+        # 만료된 캐시라도 있으면 사용 (없는데 과부하면 429로 전달)
+        if isinstance(e, UpstreamBusy) and _krx_stocks_cache is None:
+            raise
+        return _krx_stocks_cache
+
 
+def _download_krx_stocks() -> ListingStore:
+    # KOSPI + KOSDAQ 전체 종목 가져오기 (세부 시장은 Market 컬럼)
+    listing = call_upstream(
+        'KRX', _fdr().StockListing, 'KRX',
+        timeout=settings.MARKET_LISTING_TIMEOUT_SECONDS
+    )
+    return ListingStore.from_frames([(listing, None)], 'Code')
 
-def _get_us_stocks():
+
+def _get_us_stocks() -> Optional[ListingStore]:
     """미국 전체 종목 리스트 가져오기 (캐시 사용)"""
+    # 캐시 확인
+    if _us_stocks_cache is not None and _is_fresh(_us_cache_time):
+        return _us_stocks_cache
+    
+    return _flight.do(("listing", "US"), _load_us_stocks)
+
+
+def _load_us_stocks():
     global _us_stocks_cache, _us_cache_time
     
-    # 캐시 확인
-    if _us_stocks_cache is not None and _us_cache_time is not None:
-        if (datetime.now() - _us_cache_time).seconds < CACHE_TTL:
-            return _us_stocks_cache
+    # 대기 중에 다른 호출이 이미 갱신했으면 재사용
+    if _us_stocks_cache is not None and _is_fresh(_us_cache_time):
+        return _us_stocks_cache
     
     try:
-        # NASDAQ + NYSE 전체 종목 가져오기
-        import pandas as pd
-        
-        nasdaq = fdr.StockListing('NASDAQ')
-        nyse = fdr.StockListing('NYSE')
-        
-        # 두 리스트 합치기
-        us_stocks = pd.concat([nasdaq, nyse], ignore_index=True)
-        
-        _us_stocks_cache = us_stocks
-        _us_cache_time = datetime.now()
-        return us_stocks
+        # 노드 공유 캐시 → 없으면 한 워커만 다운로드
+        entry = get_or_load(
+            "listing:v3:US", _download_us_stocks, ttl=CACHE_TTL,
+            encode=ListingStore.to_json, decode=ListingStore.from_json,
+            lease_timeout=settings.MARKET_LISTING_TIMEOUT_SECONDS * 2
+        )
+        if entry is None:
+            return _us_stocks_cache
+        _us_stocks_cache = entry.value
+        _us_cache_time = datetime.fromtimestamp(entry.stored_at)
+        return _us_stocks_cache
     except Exception as e:
         print(f"US stock listing error: {e}")
-        return None
+        # 만료된 캐시라도 있으면 사용 (없는데 과부하면 429로 전달)
+        if isinstance(e, UpstreamBusy) and _us_stocks_cache is None:
+            raise
+        return _us_stocks_cache
+
+
+def _download_us_stocks() -> ListingStore:
+    # NASDAQ + NYSE 전체 종목 가져오기
+    nasdaq = call_upstream(
+        'US', _fdr().StockListing, 'NASDAQ',
+        timeout=settings.MARKET_LISTING_TIMEOUT_SECONDS
+    )
+    nyse = call_upstream(
+        'US', _fdr().StockListing, 'NYSE',
+        timeout=settings.MARKET_LISTING_TIMEOUT_SECONDS
+    )
+    
+    # DataFrame을 합치지 않고 바로 압축 저장소로 (거래소는 세부 시장으로 표시)
+    return ListingStore.from_frames([(nasdaq, 'NASDAQ'), (nyse, 'NYSE')], 'Symbol')
+
+
+def listing_memory() -> dict:
+    """워커가 들고 있는 시장별 종목 리스트 메모리 (로드되지 않은 시장은 None)"""
+    report = {}
+    for market, listing in (("KRX", _krx_stocks_cache), ("US", _us_stocks_cache)):
+        if listing is None:
+            report[market] = None
+            continue
+        cached = _search_indexes.get(market)
+        index = cached[1] if cached is not None and cached[0] is listing else None
+        report[market] = {
+            **listing.memory_usage(index.nbytes if index is not None else 0),
+            "search_index_built": index is not None
+        }
+    return report
 
 
 def _has_korean(text: str) -> bool:
-    """한글이 포함되어 있는지 확인"""
-    return any('\uac00' <= char <= '\ud7a3' for char in text)
+    """한글(완성형 음절 또는 초성 등 자모)이 포함되어 있는지 확인"""
+    return any('\uac00' <= char <= '\ud7a3' or is_jamo(char) for char in text)
+
+
+def _get_search_index(market: str) -> Optional[SearchIndex]:
+    """시장별 검색 인덱스 (종목 리스트가 바뀐 경우에만 다시 생성)"""
+    listing = _get_krx_stocks() if market == "KRX" else _get_us_stocks()
+    if listing is None:
+        return None
+    
+    cached = _search_indexes.get(market)
+    if cached is not None and cached[0] is listing:
+        return cached[1]
+    
+    index = SearchIndex(listing.codes, listing.names)
+    _search_indexes[market] = (listing, index)
+    return index
+
+
+def _search_market(market: str, query: str, limit: int) -> List[AssetSearch]:
+    index = _get_search_index(market)
+    if index is None:
+        return []
+    
+    results = []
+    for row in index.search(query, limit):
+        if market == "KRX":
+            asset = _get_kr_stock_info(index.codes[row], index.names[row])
+        else:
+            asset = _get_us_stock_info(index.codes[row], index.names[row])
+        if asset:
+            results.append(asset)
+    return results
 
 
 def search_assets(query: str, limit: int = 10) -> List[AssetSearch]:
     """
-    종목 검색 (FinanceDataReader 사용)
-    - 한글 쿼리: 한국 주식만 검색
+    종목 검색 (FinanceDataReader 종목 리스트 + 검색 인덱스)
+    - 한글 쿼리(초성 포함): 한국 주식만 검색
     - 영문 쿼리: 미국 주식 우선, 결과 없으면 한국 검색
+    - 코드/이름 일치, 초성, 오타 허용 매칭 후 점수순
     """
     try:
         query = query.strip()
-        query_upper = query.upper()
-        results = []
-        is_korean_query = _has_korean(query)
         
         # 한글 쿼리 → 한국 주식만 검색
-        if is_korean_query:
-            krx_stocks = _get_krx_stocks()
-            if krx_stocks is not None:
-                matched = krx_stocks[
-                    krx_stocks['Name'].str.contains(query, case=False, na=False) |
-                    krx_stocks['Code'].str.contains(query, case=False, na=False)
-                ]
-                
-                for _, row in matched.head(limit).iterrows():
-                    asset = _get_kr_stock_info(row['Code'], row['Name'])
-                    if asset:
-                        results.append(asset)
-            
-            return results
+        if _has_korean(query):
+            return _search_market("KRX", query, limit)
         
-        # 영문 쿼리 → 미국 주식 우선 검색
-        else:
-            # 1. 미국 주식 검색
-            us_stocks = _get_us_stocks()
-            if us_stocks is not None:
-                matched = us_stocks[
-                    us_stocks['Symbol'].str.contains(query_upper, case=False, na=False) |
-                    us_stocks['Name'].str.contains(query, case=False, na=False)
-                ]
-                
-                for _, row in matched.head(limit).iterrows():
-                    symbol = row['Symbol']
-                    name = row['Name']
-                    asset = _get_us_stock_info(symbol, name)
-                    if asset:
-                        results.append(asset)
-                        if len(results) >= limit:
-                            return results
-            
-            # 2. 미국 주식에서 결과 없으면 한국 주식도 검색
-            if len(results) == 0:
-                krx_stocks = _get_krx_stocks()
-                if krx_stocks is not None:
-                    matched = krx_stocks[
-                        krx_stocks['Name'].str.contains(query, case=False, na=False) |
-                        krx_stocks['Code'].str.contains(query, case=False, na=False)
-                    ]
-                    
-                    for _, row in matched.head(limit).iterrows():
-                        asset = _get_kr_stock_info(row['Code'], row['Name'])
-                        if asset:
-                            results.append(asset)
-            
-            return results
+        # 영문 쿼리 → 미국 주식 우선 검색, 결과 없으면 한국 주식도 검색
+        results = _search_market("US", query, limit)
+        if len(results) == 0:
+            results = _search_market("KRX", query, limit)
+        return results
         
+    except UpstreamBusy:
+        raise
     except Exception as e:
         print(f"Asset search error: {e}")
         import traceback
@@ -136,87 +224,146 @@ def search_assets(query: str, limit: int = 10) -> List[AssetSearch]:
 
 def _get_us_stock_info(symbol: str, name: str = None) -> Optional[AssetSearch]:
     """미국 주식 정보 가져오기 (FinanceDataReader)"""
-    try:
-        # 최근 5일 데이터 가져오기 (휴장일 대비)
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=7)
-        
-        df = fdr.DataReader(symbol, start_date, end_date)
-        
-        if df is None or df.empty:
-            return None
-        
-        # 가장 최근 종가
-        latest_price = float(df['Close'].iloc[-1])
-        
-        if latest_price <= 0:
-            return None
-        
-        # 이름이 없으면 심볼 사용
-        if not name:
-            name = symbol
-        
-        return AssetSearch(
-            symbol=symbol,
-            name=name,
-            exchange='US',
-            current_price=latest_price
-        )
-    except Exception as e:
-        print(f"US stock info error for {symbol}: {e}")
+    latest_price = get_current_price(symbol)
+    if latest_price is None:
         return None
+    
+    # 이름이 없으면 심볼 사용
+    if not name:
+        name = symbol
+    
+    return AssetSearch(
+        symbol=symbol,
+        name=name,
+        exchange='US',
+        currency='USD',
+        current_price=latest_price
+    )
 
 
 def _get_kr_stock_info(code: str, name: str) -> Optional[AssetSearch]:
     """한국 주식 정보 가져오기 (FinanceDataReader)"""
+    latest_price = get_current_price(code)
+    if latest_price is None:
+        return None
+    
+    # 심볼 형식: 코드 (한국 주식은 코드만 사용)
+    return AssetSearch(
+        symbol=code,
+        name=name,
+        exchange='KRX',
+        currency='KRW',
+        current_price=latest_price
+    )
+
+
+def _fetch_latest_close(symbol: str) -> Optional[float]:
+    """최근 7일 데이터에서 가장 최근 종가 조회 (휴장일 대비)"""
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=7)
+    
+    df = call_upstream(source_for_symbol(symbol), _fdr().DataReader, symbol, start_date, end_date)
+    
+    if df is None or df.empty or 'Close' not in df:
+        return None
+    
+    latest_price = float(df['Close'].iloc[-1])
+    return latest_price if latest_price > 0 else None
+
+
+def _fetch_close_history(symbol: str, start_date: date, end_date: date):
+    df = call_upstream(source_for_symbol(symbol), _fdr().DataReader, symbol, start_date, end_date)
+    if df is None or df.empty or 'Close' not in df:
+        return None
+    closes = df['Close'].astype(float)
+    closes = closes[closes > 0]
+    return closes if not closes.empty else None
+
+
+def _encode_history(closes) -> dict:
+    """종가 Series → 공유 캐시 저장용 (JSON 호환)"""
+    return {"dates": [index.isoformat() for index in closes.index], "closes": closes.tolist()}
+
+
+def _decode_history(data: dict):
+    import pandas as pd
+    index = pd.to_datetime(data["dates"]).astype("datetime64[ns]")
+    return pd.Series(data["closes"], index=index, name="Close", dtype=float)
+
+
+def get_price_history(symbol: str, start_date: date, end_date: date):
+    """
+    일별 종가 시계열 (pandas Series, 날짜 인덱스)
+    - 같은 (심볼, 기간)은 HISTORY_CACHE_TTL 동안 공유 캐시 사용
+    - 조회 실패 시 None (과부하인데 캐시도 없으면 UpstreamBusy)
+    """
+    key = f"history:{symbol}:{start_date.isoformat()}:{end_date.isoformat()}"
+    cached = get_shared_cache().get(key)
+    if cached is not None:
+        try:
+            return _decode_history(cached)
+        except Exception as e:
+            print(f"Price history cache decode error for {symbol}: {e}")
+    
     try:
-        # 최근 5일 데이터 가져오기
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=7)
-        
-        df = fdr.DataReader(code, start_date, end_date)
-        
-        if df is None or df.empty:
-            return None
-        
-        # 가장 최근 종가
-        latest_price = float(df['Close'].iloc[-1])
-        
-        if latest_price <= 0:
-            return None
-        
-        # 심볼 형식: 코드 (한국 주식은 코드만 사용)
-        symbol = code
-        
-        return AssetSearch(
-            symbol=symbol,
-            name=name,
-            exchange='KRX',
-            current_price=latest_price
-        )
-    except Exception as e:
-        print(f"KR stock info error for {code}: {e}")
+        closes = _flight.do(("history", symbol, start_date, end_date), _fetch_close_history, symbol, start_date, end_date)
+    except UpstreamBusy:
+        raise
+    except UpstreamError as e:
+        print(f"Price history fetch error for {symbol}: {e}")
         return None
+    
+    if closes is not None:
+        get_shared_cache().set(key, _encode_history(closes), settings.HISTORY_CACHE_TTL)
+    return closes
+
+
+def get_last_known_price(symbol: str) -> Optional[Tuple[float, datetime]]:
+    """마지막으로 성공한 시세와 조회 시각"""
+    with _last_known_lock:
+        return _last_known_prices.get(symbol)
 
 
 def get_current_price(symbol: str) -> Optional[float]:
     """
     특정 종목의 현재가 조회 (최근 종가)
+    - 공유 캐시에 QUOTE_CACHE_TTL 이내 시세가 있으면 사용 (다른 워커가 조회한 시세 포함)
+    - 소스 장애(서킷 오픈, 타임아웃) 시 마지막으로 성공한 시세로 대체
+    - 동시 호출 한도 초과인데 대체값도 없으면 UpstreamBusy
+    """
+    quote = get_quote(symbol)
+    return quote[0] if quote else None
+
+
+def get_quote(symbol: str) -> Optional[Tuple[float, float, bool]]:
+    """
+    현재가와 그 값의 시세 시각 (가격, epoch 초, 대체값 여부)
+    - 공유 캐시 시세는 저장 시각, 새로 조회한 시세는 조회 시각 (대체값 아님)
+    - 소스 장애로 마지막으로 성공한 시세를 쓴 경우 그 시세의 조회 시각 (대체값 = stale)
+    - 가격이 없으면 None, 동시 호출 한도 초과인데 대체값도 없으면 UpstreamBusy
     """
+    entry = get_shared_cache().get_entry(f"quote:{symbol}")
+    if entry is not None:
+        return entry.value, entry.stored_at, False
+    
     try:
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=7)
-        
-        df = fdr.DataReader(symbol, start_date, end_date)
-        
-        if df is None or df.empty:
-            return None
-        
-        latest_price = float(df['Close'].iloc[-1])
-        return latest_price if latest_price > 0 else None
-    except Exception as e:
-        print(f"Price fetch error for {symbol}: {e}")
+        price = _flight.do(("price", symbol), _fetch_latest_close, symbol)
+    except UpstreamError as e:
+        fallback = get_last_known_price(symbol)
+        # 과부하인데 대체값도 없으면 429로 전달
+        if isinstance(e, UpstreamBusy) and fallback is None:
+            raise
+        if not isinstance(e, CircuitOpenError) or fallback is None:
+            print(f"Price fetch error for {symbol}: {e}")
+        return (fallback[0], fallback[1].timestamp(), True) if fallback else None
+    
+    if price is None:
         return None
+    fetched_at = datetime.now()
+    get_shared_cache().set(f"quote:{symbol}", price, settings.QUOTE_CACHE_TTL)
+    with _last_known_lock:
+        _last_known_prices[symbol] = (price, fetched_at)
+    return price, fetched_at.timestamp(), False
 
 
 def get_multiple_prices(symbols: List[str]) -> Dict[str, Optional[float]]:
@@ -0,0 +1,98 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..models.portfolio import Portfolio as PortfolioModel, PortfolioItem as PortfolioItemModel, Asset as AssetModel
+from .fx import asset_currency
+from .ledger import record_trade
+
+
+class PortfolioBuildError(Exception):
+    """포트폴리오 생성 실패 (라우트에서 HTTP 오류로 변환)"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class ItemSpec:
+    """생성할 포트폴리오 종목"""
+    asset: AssetModel
+    target_weight: float
+    tolerance: float = 5.0
+    entry_price: Optional[float] = None  # None이면 현재가 사용
+    current_quantity: Optional[float] = None  # None이면 초기 수량과 동일
+
+
+def check_total_weight(weights: Iterable[float]) -> None:
+    """목표 비중 합계 검증"""
+    total_weight = sum(weights)
+    if abs(total_weight - 100.0) > 0.01:  # 부동소수점 오차 허용
+        raise PortfolioBuildError(400, f"Total target weight must be 100%, got {total_weight}%")
+
+
+def add_portfolio(
+    db: Session,
+    user_id: int,
+    name: str,
+    initial_invest_amount: float,
+    base_currency: str,
+    description: Optional[str],
+    items: List[ItemSpec],
+    prices: Dict[str, Optional[float]],
+    fx_rates: Dict[str, Optional[float]]
+) -> PortfolioModel:
+    """
+    포트폴리오와 종목을 세션에 추가 (commit은 호출자가 담당)
+    - prices: 심볼별 현재가 (entry_price 미지정 종목용)
+    - fx_rates: 종목 통화 → 기준 통화 환율
+    """
+    check_total_weight(item.target_weight for item in items)
+
+    new_portfolio = PortfolioModel(
+        user_id=user_id,
+        name=name,
+        initial_invest_amount=initial_invest_amount,
+        base_currency=base_currency,
+        description=description
+    )
+    db.add(new_portfolio)
+
+    for item in items:
+        asset = item.asset
+
+        # 생성 시점 가격 (entry_price)
+        entry_price = item.entry_price or prices.get(asset.symbol)
+        if entry_price is None:
+            raise PortfolioBuildError(503, f"Could not fetch price for {asset.symbol}")
+
+        fx_rate = fx_rates.get(asset_currency(asset))
+        if fx_rate is None:
+            raise PortfolioBuildError(503, f"Could not fetch FX rate for {asset_currency(asset)}/{base_currency}")
+
+        # 초기 수량 계산
+        # 종목별 투자액 = 총 투자금 × (목표 비중 / 100)  (기준 통화)
+        item_invest_amount = initial_invest_amount * (item.target_weight / 100.0)
+        # 초기 수량 = 종목별 투자액 / (entry_price × 환율)
+        initial_quantity = item_invest_amount / (entry_price * fx_rate)
+
+        new_item = PortfolioItemModel(
+            asset=asset,
+            target_weight=item.target_weight,
+            tolerance=item.tolerance,
+            entry_price=entry_price,
+            initial_quantity=initial_quantity,
+            current_quantity=0.0
+        )
+        new_portfolio.items.append(new_item)
+
+        # 원장 시작: 초기 수량을 entry_price로 매수
+        # (가져오기에서 현재 수량을 따로 지정하면 차이만큼 같은 가격으로 조정 매매)
+        record_trade(db, new_item, initial_quantity, entry_price)
+        if item.current_quantity is not None and item.current_quantity != initial_quantity:
+            record_trade(db, new_item, item.current_quantity - initial_quantity, entry_price)
+
+    return new_portfolio
@@ -0,0 +1,268 @@
+"""
+비동기 포트폴리오 생성 작업
+
+POST /portfolios?async=true
+- 요청 검증(비중 합계, 종목 존재)만 하고 작업을 DB에 기록한 뒤 202 + 작업 id 반환
+- 프로세스당 PORTFOLIO_JOB_WORKERS개 스레드가 시세/환율을 조회해 포트폴리오를 생성
+  - 조회에 실패한 심볼/통화만 PORTFOLIO_JOB_RETRIES회까지 백오프 후 재시도
+  - 대기 + 실행 중 작업이 PORTFOLIO_JOB_QUEUE_SIZE를 넘으면 JobQueueFull (503)
+- 상태는 DB에 있으므로 어느 워커로 조회해도 같음 (GET /portfolios/jobs/{id}, /events는 SSE)
+- 작업을 맡은 프로세스가 재시작되면 진행이 멈춘 작업은 PORTFOLIO_JOB_STALE_SECONDS 후 실패로 처리
+- 상태 전이는 조건부 UPDATE (queued → running → succeeded / failed)
+  이미 실패로 처리된 작업은 워커가 결과를 저장하지 않음 (생성한 포트폴리오도 롤백 → 재시도해도 중복 없음)
+"""
+import asyncio
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.job import PortfolioJob as PortfolioJobModel
+from ..models.portfolio import Asset as AssetModel
+from ..schemas.portfolio import PortfolioCreate, PortfolioJob
+from .fx import asset_currency, get_fx_rate
+from .market import get_current_price
+from .portfolio_builder import add_portfolio, ItemSpec, PortfolioBuildError
+from .resilience import UpstreamBusy
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+TERMINAL_STATUSES = {JOB_SUCCEEDED, JOB_FAILED}
+
+PROGRESS_EVERY = 10  # 심볼 N개 조회마다 진행 상황 저장
+KEEPALIVE_SECONDS = 15  # 상태 변화가 없을 때 이벤트 스트림 keep-alive 간격
+
+
+class JobQueueFull(Exception):
+    """대기 중인 생성 작업이 너무 많음"""
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PORTFOLIO_JOB_WORKERS,
+    thread_name_prefix="portfolio-job"
+)
+# 대기 + 실행 중 작업 수 제한 (프로세스당)
+_pending = threading.BoundedSemaphore(settings.PORTFOLIO_JOB_QUEUE_SIZE)
+
+
+def _release_pending(_future=None) -> None:
+    _pending.release()
+
+
+def submit_portfolio_job(db: Session, user_id: int, portfolio_data: PortfolioCreate) -> PortfolioJobModel:
+    """작업 기록 후 워커 풀에 등록 (검증은 호출자가 먼저 수행)"""
+    if not _pending.acquire(blocking=False):
+        raise JobQueueFull(f"Too many pending portfolio jobs (limit {settings.PORTFOLIO_JOB_QUEUE_SIZE})")
+
+    try:
+        job = PortfolioJobModel(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            status=JOB_QUEUED,
+            payload=portfolio_data.model_dump_json()
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        future = _executor.submit(run_portfolio_job, job.id)
+    except Exception:
+        _release_pending()
+        raise
+    future.add_done_callback(_release_pending)
+    return job
+
+
+def _backoff(attempt: int) -> float:
+    """full jitter 지수 백오프"""
+    return random.uniform(0, settings.PORTFOLIO_JOB_RETRY_BACKOFF * (2 ** attempt))
+
+
+def _fetch_missing(db: Session, job: PortfolioJobModel, symbols: List[str], prices: Dict[str, Optional[float]]) -> None:
+    """아직 시세가 없는 심볼만 조회 (PROGRESS_EVERY개마다 진행 상황 저장)"""
+    for i, symbol in enumerate(symbols, 1):
+        if prices.get(symbol) is not None:
+            continue
+        try:
+            prices[symbol] = get_current_price(symbol)
+        except UpstreamBusy:
+            prices[symbol] = None
+        if i % PROGRESS_EVERY == 0:
+            job.symbols_priced = sum(price is not None for price in prices.values())
+            db.commit()
+
+
+def _fetch_rates(currencies: List[str], base_currency: str, rates: Dict[str, Optional[float]]) -> None:
+    for currency in currencies:
+        if rates.get(currency) is not None:
+            continue
+        try:
+            rates[currency] = get_fx_rate(currency, base_currency)
+        except UpstreamBusy:
+            rates[currency] = None
+
+
+def _transition(db: Session, job_id: str, from_statuses, *conditions, **values) -> bool:
+    """현재 상태가 from_statuses 중 하나(+ 추가 조건)일 때만 갱신 (갱신했으면 True, commit은 호출자가 담당)"""
+    result = db.execute(
+        update(PortfolioJobModel)
+        .where(PortfolioJobModel.id == job_id, PortfolioJobModel.status.in_(list(from_statuses)), *conditions)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def run_portfolio_job(job_id: str) -> None:
+    """작업 실행 (워커 스레드, 전용 세션 사용)"""
+    db = SessionLocal()
+    try:
+        if not _transition(db, job_id, [JOB_QUEUED], status=JOB_RUNNING, started_at=datetime.utcnow()):
+            db.rollback()
+            return
+        db.commit()
+        job = db.get(PortfolioJobModel, job_id)
+
+        portfolio_data = PortfolioCreate.model_validate_json(job.payload)
+        asset_ids = [item.asset_id for item in portfolio_data.items]
+        assets = {
+            asset.id: asset
+            for asset in db.query(AssetModel).filter(AssetModel.id.in_(asset_ids)).all()
+        }
+        for asset_id in asset_ids:
+            if asset_id not in assets:
+                raise PortfolioBuildError(404, f"Asset with id {asset_id} not found")
+
+        symbols = sorted({asset.symbol for asset in assets.values()})
+        currencies = sorted({asset_currency(asset) for asset in assets.values()})
+        job.symbols_total = len(symbols)
+        db.commit()
+
+        # 시세 / 환율 조회 (실패한 것만 재시도)
+        prices: Dict[str, Optional[float]] = {}
+        fx_rates: Dict[str, Optional[float]] = {}
+        for attempt in range(settings.PORTFOLIO_JOB_RETRIES + 1):
+            job.attempts = attempt + 1
+            _fetch_missing(db, job, symbols, prices)
+            _fetch_rates(currencies, portfolio_data.base_currency, fx_rates)
+            job.symbols_priced = sum(price is not None for price in prices.values())
+            db.commit()
+            # commit 후 다시 읽은 상태: 조회 중 실패로 처리되었으면 중단
+            if job.status != JOB_RUNNING:
+                return
+            if all(prices.get(symbol) is not None for symbol in symbols) and \
+                    all(fx_rates.get(currency) is not None for currency in currencies):
+                break
+            if attempt < settings.PORTFOLIO_JOB_RETRIES:
+                time.sleep(_backoff(attempt))
+
+        # 재시도 후에도 없는 시세/환율은 add_portfolio가 PortfolioBuildError로 알려줌
+        portfolio = add_portfolio(
+            db,
+            user_id=job.user_id,
+            name=portfolio_data.name,
+            initial_invest_amount=portfolio_data.initial_invest_amount,
+            base_currency=portfolio_data.base_currency,
+            description=portfolio_data.description,
+            items=[
+                ItemSpec(
+                    asset=assets[item.asset_id],
+                    target_weight=item.target_weight,
+                    tolerance=item.tolerance
+                )
+                for item in portfolio_data.items
+            ],
+            prices=prices,
+            fx_rates=fx_rates
+        )
+        db.flush()
+        # 조회 중에 실패로 처리된 작업이면 포트폴리오까지 롤백
+        if not _transition(
+            db, job_id, [JOB_RUNNING],
+            status=JOB_SUCCEEDED, portfolio_id=portfolio.id, finished_at=datetime.utcnow()
+        ):
+            db.rollback()
+            print(f"Portfolio job {job_id} was marked failed while running, discarding result")
+            return
+        db.commit()
+    except PortfolioBuildError as e:
+        db.rollback()
+        _fail_job(db, job_id, e.detail)
+    except Exception as e:
+        db.rollback()
+        print(f"Portfolio job {job_id} error: {e}")
+        _fail_job(db, job_id, f"Internal error: {e}")
+    finally:
+        db.close()
+
+
+def _fail_job(db: Session, job_id: str, error: str) -> None:
+    _transition(db, job_id, [JOB_QUEUED, JOB_RUNNING], status=JOB_FAILED, error=error, finished_at=datetime.utcnow())
+    db.commit()
+
+
+def get_job(db: Session, job_id: str, user_id: int) -> Optional[PortfolioJobModel]:
+    """사용자의 작업 조회 (진행이 멈춘 작업은 실패로 처리)"""
+    job = db.query(PortfolioJobModel).filter(
+        PortfolioJobModel.id == job_id,
+        PortfolioJobModel.user_id == user_id
+    ).first()
+    if job is None or job.status in TERMINAL_STATUSES:
+        return job
+
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.PORTFOLIO_JOB_STALE_SECONDS)
+    if job.updated_at < stale_before:
+        # 그사이 워커가 진행했거나 끝냈으면 그대로 둠
+        _transition(
+            db, job_id, [job.status], PortfolioJobModel.updated_at < stale_before,
+            status=JOB_FAILED,
+            error="Job was interrupted before completion, please retry",
+            finished_at=datetime.utcnow()
+        )
+        db.commit()
+        db.refresh(job)
+    return job
+
+
+def _job_snapshot(job_id: str, user_id: int) -> Optional[PortfolioJob]:
+    db = SessionLocal()
+    try:
+        job = get_job(db, job_id, user_id)
+        return PortfolioJob.model_validate(job) if job is not None else None
+    finally:
+        db.close()
+
+
+async def job_events(job_id: str, user_id: int) -> AsyncIterator[str]:
+    """
+    작업 상태 SSE 스트림 (event: status)
+    - 상태가 바뀔 때마다 전송, 완료/실패 시 종료
+    - PORTFOLIO_JOB_EVENTS_TIMEOUT이 지나면 종료 (클라이언트가 재연결)
+    """
+    deadline = time.monotonic() + settings.PORTFOLIO_JOB_EVENTS_TIMEOUT
+    last, last_sent = None, time.monotonic()
+    while time.monotonic() < deadline:
+        job = await run_in_threadpool(_job_snapshot, job_id, user_id)
+        if job is None:
+            return
+        data = job.model_dump_json()
+        if data != last:
+            yield f"event: status\ndata: {data}\n\n"
+            last, last_sent = data, time.monotonic()
+        elif time.monotonic() - last_sent >= KEEPALIVE_SECONDS:
+            # 프록시 유휴 타임아웃 방지용 주석
+            yield ": keep-alive\n\n"
+            last_sent = time.monotonic()
+        if job.status in TERMINAL_STATUSES:
+            return
+        await asyncio.sleep(settings.PORTFOLIO_JOB_POLL_SECONDS)
@@ -0,0 +1,190 @@
+"""
+요청 프로파일러 (옵트인)
+
+- 관리자 헤더(X-Profile: 1 + X-Admin-Token) 또는 PROFILE_SAMPLE_RATE 비율로 요청을 샘플링
+- 동기 라우트는 스레드풀에서 실행되므로 cProfile(현재 스레드만 추적) 대신
+  sys._current_frames() 기반 샘플링 프로파일러로 모든 스레드의 스택을 수집
+- 결과는 folded stack 형식(flamegraph.pl / speedscope 호환)으로 링 버퍼에 보관
+"""
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Deque, List, Optional
+
+from ..config import settings
+
+
+# 대기 중인 스레드(유휴 워커, 이벤트 루프 select)는 프로파일에서 제외
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+}
+
+
+@dataclass
+class ProfileRecord:
+    id: str
+    method: str
+    path: str
+    started_at: datetime
+    interval_ms: float
+    status_code: Optional[int] = None
+    duration_ms: float = 0.0
+    samples: int = 0
+    stacks: Counter = field(default_factory=Counter)
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at.isoformat(),
+            "status_code": self.status_code,
+            "duration_ms": round(self.duration_ms, 2),
+            "samples": self.samples,
+            "interval_ms": self.interval_ms,
+        }
+
+    def folded(self) -> str:
+        """folded stack 텍스트 ("a;b;c 12" 형식)"""
+        lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        return "\n".join(lines) + "\n"
+
+    def top_functions(self, limit: int = 20) -> List[dict]:
+        """leaf 기준 self-time 상위 함수"""
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        total = max(self.samples, 1)
+        return [
+            {"frame": frame, "samples": count, "pct": round(count / total * 100, 2)}
+            for frame, count in leaves.most_common(limit)
+        ]
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+class _Sampler(threading.Thread):
+    """모든 스레드의 스택을 주기적으로 수집하는 백그라운드 스레드"""
+
+    def __init__(self, record: ProfileRecord):
+        super().__init__(name="request-profiler", daemon=True)
+        self.record = record
+        self._stop_event = threading.Event()
+        self.started = time.perf_counter()
+
+    def run(self):
+        interval = self.record.interval_ms / 1000.0
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                self.record.stacks[";".join(reversed(stack))] += 1
+                self.record.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+# 완료된 프로파일 링 버퍼 (오래된 것부터 밀려남)
+_profiles: Deque[ProfileRecord] = deque(maxlen=max(settings.PROFILE_BUFFER_SIZE, 1))
+_profiles_lock = threading.Lock()
+# 샘플러는 프로세스 전체 스택을 보므로 동시에 하나만 실행
+_active_lock = threading.Lock()
+
+
+def should_profile(profile_header: Optional[str], is_admin: bool) -> bool:
+    """이 요청을 프로파일링할지 결정"""
+    if profile_header == "1" and is_admin:
+        return True
+    rate = settings.PROFILE_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+
+def start_profile(method: str, path: str) -> Optional[_Sampler]:
+    """프로파일링 시작 (이미 다른 요청을 프로파일링 중이면 None)"""
+    if not _active_lock.acquire(blocking=False):
+        return None
+    record = ProfileRecord(
+        id=uuid.uuid4().hex[:12],
+        method=method,
+        path=path,
+        started_at=datetime.utcnow(),
+        interval_ms=settings.PROFILE_INTERVAL_MS,
+    )
+    sampler = _Sampler(record)
+    sampler.start()
+    return sampler
+
+
+def finish_profile(sampler: _Sampler, status_code: Optional[int]) -> ProfileRecord:
+    """프로파일링 종료 및 링 버퍼에 저장"""
+    try:
+        sampler.stop()
+    finally:
+        _active_lock.release()
+    record = sampler.record
+    record.duration_ms = (time.perf_counter() - sampler.started) * 1000
+    record.status_code = status_code
+    with _profiles_lock:
+        _profiles.append(record)
+    return record
+
+
+def list_profiles() -> List[dict]:
+    with _profiles_lock:
+        return [record.summary() for record in reversed(_profiles)]
+
+
+def get_profile(profile_id: str) -> Optional[ProfileRecord]:
+    with _profiles_lock:
+        for record in _profiles:
+            if record.id == profile_id:
+                return record
+    return None
+
+
+def clear_profiles() -> None:
+    with _profiles_lock:
+        _profiles.clear()
+
+
+def process_memory() -> dict:
+    """현재 프로세스 메모리 (RSS: /proc 기준, 최대 RSS: getrusage)"""
+    rss = None
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    peak = None
+    try:
+        import resource
+        # Linux는 KiB, macOS는 바이트 단위
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak = peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+    return {"pid": os.getpid(), "rss_bytes": rss, "peak_rss_bytes": peak}
@@ -0,0 +1,182 @@
+"""
+일괄 시세 조회 (POST /assets/prices)
+
+- 종목 id / 심볼을 한 번의 쿼리로 assets에서 찾고 심볼 기준으로 중복 제거
+  (DB에 없는 심볼도 시세는 조회)
+- 공유 캐시에 있는 시세는 바로 사용, 나머지만 QUOTE_BATCH_WORKERS개 스레드로 동시에 조회
+  (일괄 시세 전용 quotes 버킷에서 요청 1회에 max(캐시에 없는 심볼 수, 1)개 토큰을 한 번에 차감,
+   모자라면 QuoteRateLimited → 버킷 크기는 최대 배치 1회분)
+- QUOTE_BATCH_DEADLINE_SECONDS 안에 끝나지 않은 심볼은 기다리지 않고
+  마지막으로 성공한 시세(stale) 또는 timeout으로 응답 (조회는 백그라운드에서 마저 끝나 캐시에 남음)
+- 심볼마다 시세 시각 / 경과 시간 / 상태를 함께 반환
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.portfolio import Asset as AssetModel
+from ..schemas.portfolio import Quote, QuoteBatch, QuoteRequest
+from .market import get_last_known_price, get_quote
+from .rate_limit import check_rate_limit
+from .resilience import UpstreamBusy
+from .shared_cache import get_shared_cache
+
+QUOTE_OK = "ok"
+QUOTE_STALE = "stale"
+QUOTE_NOT_FOUND = "not_found"
+QUOTE_UNAVAILABLE = "unavailable"
+QUOTE_TIMEOUT = "timeout"
+
+
+class QuoteRateLimited(Exception):
+    """일괄 시세 토큰 부족"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limit exceeded for quote requests, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.QUOTE_BATCH_WORKERS,
+    thread_name_prefix="quote-batch"
+)
+
+
+def _resolve_assets(db: Session, request: QuoteRequest) -> Tuple[Dict[int, AssetModel], Dict[str, AssetModel]]:
+    """요청한 종목 id / 심볼을 쿼리 한 번으로 조회 → (id별, 심볼별)"""
+    conditions = []
+    if request.asset_ids:
+        conditions.append(AssetModel.id.in_(set(request.asset_ids)))
+    if request.symbols:
+        conditions.append(AssetModel.symbol.in_({symbol.strip() for symbol in request.symbols}))
+    if not conditions:
+        return {}, {}
+    assets = db.query(AssetModel).filter(or_(*conditions)).all()
+    return {asset.id: asset for asset in assets}, {asset.symbol: asset for asset in assets}
+
+
+def _fallback(symbol: str, status: str, error: str) -> Tuple[Optional[float], Optional[float], str, Optional[str]]:
+    """조회 실패 시 마지막으로 성공한 시세 (없으면 실패 상태 그대로)"""
+    last = get_last_known_price(symbol)
+    if last is None:
+        return None, None, status, error
+    return last[0], last[1].timestamp(), QUOTE_STALE, error
+
+
+def _charge(rate_key: str, misses: int) -> None:
+    """quotes 버킷에서 max(캐시에 없는 심볼 수, 1)개 토큰을 한 번에 차감 (모자라면 QuoteRateLimited)"""
+    retry_after = check_rate_limit("quotes", rate_key, max(misses, 1))
+    if retry_after > 0:
+        raise QuoteRateLimited(retry_after)
+
+
+def _fetch_quotes(symbols: List[str], deadline: float, rate_key: Optional[str]) -> Tuple[Dict[str, tuple], int, bool]:
+    """
+    심볼별 (가격, 시세 시각 epoch, 상태, 오류)
+    rate_key: 토큰을 차감할 키 (None이면 차감 안 함)
+    반환: (결과, 캐시 적중 수, 마감 시간 초과 여부)
+    """
+    cache = get_shared_cache()
+    results: Dict[str, tuple] = {}
+    misses = []
+    for symbol in symbols:
+        entry = cache.get_entry(f"quote:{symbol}")
+        if entry is not None:
+            results[symbol] = (entry.value, entry.stored_at, QUOTE_OK, None)
+        else:
+            misses.append(symbol)
+    hits = len(results)
+
+    if rate_key is not None:
+        _charge(rate_key, len(misses))
+
+    futures = {_executor.submit(get_quote, symbol): symbol for symbol in misses}
+    done, not_done = wait(futures, timeout=max(deadline - time.monotonic(), 0.0))
+    for future in not_done:
+        # 대기열에 남은 조회는 취소, 진행 중인 조회는 끝나면 캐시에 저장됨
+        future.cancel()
+        symbol = futures[future]
+        results[symbol] = _fallback(symbol, QUOTE_TIMEOUT, "Price fetch did not finish before the deadline")
+
+    for future in done:
+        symbol = futures[future]
+        try:
+            quote = future.result()
+        except UpstreamBusy as e:
+            results[symbol] = _fallback(symbol, QUOTE_UNAVAILABLE, str(e))
+            continue
+        except Exception as e:
+            print(f"Batch quote error for {symbol}: {e}")
+            results[symbol] = _fallback(symbol, QUOTE_UNAVAILABLE, "Could not fetch price")
+            continue
+        if quote is None:
+            results[symbol] = (None, None, QUOTE_UNAVAILABLE, "Could not fetch price")
+        else:
+            price, as_of, stale = quote
+            results[symbol] = (price, as_of, QUOTE_STALE if stale else QUOTE_OK, None)
+
+    return results, hits, bool(not_done)
+
+
+def get_quote_batch(db: Session, request: QuoteRequest, rate_key: Optional[str] = None) -> QuoteBatch:
+    """
+    일괄 시세 조회 (응답은 요청 순서: asset_ids 다음 symbols)
+    - 종목 수가 QUOTE_BATCH_MAX_SYMBOLS를 넘으면 ValueError
+    - rate_key가 있으면 quotes 버킷에서 캐시에 없는 심볼 수만큼 토큰 차감 (부족하면 QuoteRateLimited)
+    - 없는 종목 id는 not_found
+    """
+    requested = len(request.asset_ids) + len(request.symbols)
+    if requested == 0:
+        raise ValueError("asset_ids or symbols is required")
+    if requested > settings.QUOTE_BATCH_MAX_SYMBOLS:
+        raise ValueError(f"At most {settings.QUOTE_BATCH_MAX_SYMBOLS} asset ids and symbols per request")
+
+    started = time.monotonic()
+    by_id, by_symbol = _resolve_assets(db, request)
+
+    # 요청 순서대로 (종목 id, 심볼, 종목) 목록 → 심볼 중복 제거
+    entries: List[Tuple[Optional[int], Optional[str], Optional[AssetModel]]] = []
+    for asset_id in request.asset_ids:
+        asset = by_id.get(asset_id)
+        entries.append((asset_id, asset.symbol if asset else None, asset))
+    for symbol in request.symbols:
+        symbol = symbol.strip()
+        asset = by_symbol.get(symbol)
+        entries.append((asset.id if asset else None, symbol or None, asset))
+    symbols = list(dict.fromkeys(symbol for _, symbol, _ in entries if symbol))
+
+    results, hits, deadline_exceeded = _fetch_quotes(
+        symbols, started + settings.QUOTE_BATCH_DEADLINE_SECONDS, rate_key
+    )
+
+    now = time.time()
+    quotes = []
+    for asset_id, symbol, asset in entries:
+        if symbol is None:
+            quotes.append(Quote(asset_id=asset_id, status=QUOTE_NOT_FOUND, error="Asset not found"))
+            continue
+        price, as_of, status, error = results[symbol]
+        quotes.append(Quote(
+            asset_id=asset_id,
+            symbol=symbol,
+            name=asset.name if asset else None,
+            currency=asset.currency if asset else None,
+            price=price,
+            as_of=datetime.fromtimestamp(as_of, timezone.utc) if as_of is not None else None,
+            age_seconds=round(max(now - as_of, 0.0), 3) if as_of is not None else None,
+            status=status,
+            error=error
+        ))
+
+    return QuoteBatch(
+        quotes=quotes,
+        symbols_requested=len(symbols),
+        cache_hits=hits,
+        deadline_exceeded=deadline_exceeded,
+        elapsed_ms=(time.monotonic() - started) * 1000
+    )
@@ -0,0 +1,222 @@
+"""
+사용자별 요청 속도 제한 (토큰 버킷)
+
+엔드포인트 종류별로 버킷을 따로 둡니다.
+- search : 종목 검색 (limit이 클수록 시세 조회가 많으므로 limit 10개당 토큰 1개)
+- pricing: 현재가 / 분석 등 시세 조회
+- quotes : 일괄 시세 (POST /assets/prices, 캐시에 없는 심볼 1개당 토큰 1개 → 버킷 크기는 최대 배치 1회분)
+- write  : 생성 / 수정 / 삭제 / 가져오기
+
+버킷 상태 저장소 (RATE_LIMIT_URL)
+- "" / "memory://"       : 프로세스 내부 (워커마다 따로 계산)
+- "sqlite:///path/to.db" : SQLite 파일 (같은 노드의 워커가 공유)
+- "redis://host:6379/0"  : Redis 호환 서버 (redis 패키지 필요, 노드 간 공유)
+저장소 장애 시에는 요청을 막지 않음 (fail-open)
+"""
+import math
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+
+from ..config import settings
+from ..models.user import User
+from .auth import get_current_user
+
+
+@dataclass
+class Bucket:
+    name: str
+    per_minute: float  # 분당 충전량 (0이면 제한 없음)
+    burst: float  # 버킷 크기 (연속 허용 요청 수)
+
+    @property
+    def rate(self) -> float:
+        return self.per_minute / 60.0
+
+
+def _buckets() -> Dict[str, Bucket]:
+    return {
+        "search": Bucket("search", settings.RATE_LIMIT_SEARCH_PER_MINUTE, settings.RATE_LIMIT_SEARCH_BURST),
+        "pricing": Bucket("pricing", settings.RATE_LIMIT_PRICING_PER_MINUTE, settings.RATE_LIMIT_PRICING_BURST),
+        "quotes": Bucket("quotes", settings.RATE_LIMIT_QUOTES_PER_MINUTE, settings.RATE_LIMIT_QUOTES_BURST),
+        "write": Bucket("write", settings.RATE_LIMIT_WRITE_PER_MINUTE, settings.RATE_LIMIT_WRITE_BURST),
+    }
+
+
+def refill(tokens: float, updated_at: float, now: float, bucket: Bucket) -> float:
+    return min(bucket.burst, tokens + (now - updated_at) * bucket.rate)
+
+
+class RateLimitBackend(ABC):
+    """토큰 버킷 저장소"""
+
+    @abstractmethod
+    def acquire(self, key: str, bucket: Bucket, cost: float) -> float:
+        """토큰 차감 시도 (허용되면 0, 아니면 다시 시도할 수 있을 때까지의 초)"""
+        ...
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """프로세스 내부 버킷"""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, bucket: Bucket, cost: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (bucket.burst, now))
+            tokens = refill(tokens, updated_at, now, bucket)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                return 0.0
+            self._buckets[key] = (tokens, now)
+        return (cost - tokens) / bucket.rate
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """SQLite 파일 버킷 (BEGIN IMMEDIATE로 워커 간 원자적 갱신)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            " key TEXT PRIMARY KEY,"
+            " tokens REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def acquire(self, key: str, bucket: Bucket, cost: float) -> float:
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated_at FROM rate_limits WHERE key = ?", (key,)).fetchone()
+            tokens = refill(row[0], row[1], now, bucket) if row else bucket.burst
+            allowed = tokens >= cost
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits (key, tokens, updated_at) VALUES (?, ?, ?)",
+                (key, tokens - cost if allowed else tokens, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return 0.0 if allowed else (cost - tokens) / bucket.rate
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Redis 버킷 (Lua 스크립트로 원자적 갱신, 선택: pip install redis)"""
+
+    _SCRIPT = """
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+    local rate, burst, cost, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+    local tokens = burst
+    if state[1] then
+        tokens = math.min(burst, tonumber(state[1]) + (now - tonumber(state[2])) * rate)
+    end
+    local allowed = tokens >= cost
+    if allowed then tokens = tokens - cost end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+    redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+    if allowed then return '0' end
+    return tostring((cost - tokens) / rate)
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_URL uses redis:// but the 'redis' package is not installed") from e
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self._SCRIPT)
+
+    def acquire(self, key: str, bucket: Bucket, cost: float) -> float:
+        return float(self._script(keys=[f"ratelimit:{key}"], args=[bucket.rate, bucket.burst, cost, time.time()]))
+
+
+_backend: Optional[RateLimitBackend] = None
+_backend_lock = threading.Lock()
+
+
+def _create_backend(url: str) -> RateLimitBackend:
+    if not url or url.startswith("memory://"):
+        return MemoryRateLimitBackend()
+    if url.startswith("redis://") or url.startswith("rediss://"):
+        return RedisRateLimitBackend(url)
+    if url.startswith("sqlite:///"):
+        return SQLiteRateLimitBackend(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported RATE_LIMIT_URL: {url}")
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    """설정에 따른 버킷 저장소 (프로세스당 1개, 지연 생성)"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                try:
+                    _backend = _create_backend(settings.RATE_LIMIT_URL)
+                except Exception as e:
+                    print(f"Rate limit backend unavailable, using in-process buckets: {e}")
+                    _backend = MemoryRateLimitBackend()
+    return _backend
+
+
+def check_rate_limit(bucket_name: str, key: str, cost: float = 1.0) -> float:
+    """토큰 차감 (허용되면 0, 아니면 재시도까지 남은 초)"""
+    bucket = _buckets()[bucket_name]
+    if bucket.per_minute <= 0:
+        return 0.0
+    # 버킷보다 큰 요청은 가득 찬 버킷으로 허용 (영원히 거절되지 않도록)
+    cost = min(cost, bucket.burst)
+    try:
+        return get_rate_limit_backend().acquire(f"{bucket_name}:{key}", bucket, cost)
+    except Exception as e:
+        print(f"Rate limit check error for {bucket_name}:{key}: {e}")
+        return 0.0
+
+
+def rate_limit(bucket_name: str, cost: Optional[Callable[[Request], float]] = None):
+    """
+    사용자별 속도 제한 의존성 (초과 시 429 + Retry-After)
+    사용: dependencies=[Depends(rate_limit("search", cost=...))]
+    """
+    def dependency(request: Request, current_user: User = Depends(get_current_user)) -> None:
+        retry_after = check_rate_limit(
+            bucket_name,
+            f"user:{current_user.id}",
+            cost(request) if cost else 1.0
+        )
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded for {bucket_name} requests, retry in {retry_after:.1f}s",
+                headers={"Retry-After": str(max(math.ceil(retry_after), 1))}
+            )
+
+    return dependency
+
+
+def search_cost(request: Request) -> float:
+    """종목 검색 비용: limit 10개당 토큰 1개"""
+    try:
+        limit = int(request.query_params.get("limit", 10))
+    except ValueError:
+        limit = 10
+    return max(math.ceil(limit / 10), 1)
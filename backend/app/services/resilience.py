@@ -0,0 +1,255 @@
+"""
+시세 데이터 소스 호출 보호 계층
+
+- 호출별 타임아웃 (전용 스레드풀에서 실행 후 future.result(timeout))
+- 지터가 포함된 지수 백오프 재시도
+- 소스별(KRX / US / FX) 서킷 브레이커: 연속 실패 시 일정 시간 즉시 실패
+- 전체 동시 호출 수 제한: 슬롯을 UPSTREAM_QUEUE_TIMEOUT_SECONDS 안에 얻지 못하면 UpstreamBusy
+  (스레드풀 대기열에서 기다리다 타임아웃 → 서킷 오픈으로 번지는 것을 막음)
+- 재시도 / 서킷 실패 집계는 전송 계층 장애(타임아웃, 연결 오류, HTTP 5xx)만 대상
+  없는 심볼 / 데이터 없음 같은 오류는 바로 UpstreamDataError (한 사용자의 잘못된 심볼이 서킷을 열지 않도록)
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Optional, TypeVar
+
+from ..config import settings
+
+T = TypeVar("T")
+
+
+class UpstreamError(Exception):
+    """시세 소스 호출 실패 (재시도 후에도 실패)"""
+
+
+class UpstreamTimeout(UpstreamError):
+    """시세 소스 호출 타임아웃"""
+
+
+class CircuitOpenError(UpstreamError):
+    """서킷이 열려 있어 호출하지 않음"""
+
+
+class UpstreamBusy(UpstreamError):
+    """동시 호출 한도 초과 (대기 시간 안에 슬롯을 얻지 못함) - API에서는 429"""
+
+
+class UpstreamDataError(UpstreamError):
+    """소스는 응답했지만 데이터가 없음 (없는 / 상장폐지 심볼 등) - 재시도하지 않고 서킷 실패로 세지 않음"""
+
+
+def is_transient(error: Exception) -> bool:
+    """전송 계층 장애인지 (타임아웃, 연결 오류, HTTP 5xx / 429)"""
+    status = getattr(getattr(error, "response", None), "status_code", None)  # requests.HTTPError
+    if status is None:
+        status = getattr(error, "code", None)  # urllib.error.HTTPError
+    if isinstance(status, int) and 100 <= status < 600:
+        return status >= 500 or status == 429
+    # 연결 / 소켓 / 타임아웃 오류 (requests 예외도 OSError 계열)
+    return isinstance(error, (UpstreamTimeout, TimeoutError, OSError))
+
+
+class CircuitBreaker:
+    """연속 실패 횟수 기반 서킷 브레이커 (closed → open → half_open → closed)"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """호출 허용 여부 (half_open 상태에서는 시험 호출 1건만 허용)"""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def cancel_trial(self) -> None:
+        """허용받은 호출을 보내지 못함 (half_open 시험 호출 기회를 돌려줌)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self, error: Exception) -> None:
+        with self._lock:
+            self._failures += 1
+            self._last_error = f"{type(error).__name__}: {error}"
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            state = self._current_state()
+            retry_in = None
+            if state == self.OPEN:
+                retry_in = round(max(self.reset_timeout - (time.monotonic() - self._opened_at), 0), 1)
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "retry_in_seconds": retry_in,
+                "last_error": self._last_error,
+            }
+
+
+# 소스별 서킷 브레이커
+SOURCES = ("KRX", "US", "FX")
+_breakers: Dict[str, CircuitBreaker] = {
+    source: CircuitBreaker(
+        source,
+        failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout=settings.CIRCUIT_RESET_SECONDS,
+    )
+    for source in SOURCES
+}
+
+# 타임아웃 적용을 위한 전용 스레드풀
+# (타임아웃된 호출의 스레드는 끝날 때까지 슬롯을 점유하므로 크기를 제한)
+_executor = ThreadPoolExecutor(
+    max_workers=settings.MARKET_MAX_WORKERS,
+    thread_name_prefix="market-call"
+)
+
+# 진행 중인 시세 호출 수 제한 (모든 소스 합산)
+_slots = threading.BoundedSemaphore(settings.UPSTREAM_MAX_CONCURRENCY)
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+
+def source_for_symbol(symbol: str) -> str:
+    """심볼로 데이터 소스 구분 (한국 종목코드는 6자리, 예: 005930 / 환율은 USD/KRW)"""
+    if "/" in symbol:
+        return "FX"
+    if len(symbol) == 6 and symbol[:5].isdigit():
+        return "KRX"
+    return "US"
+
+
+def get_breaker(source: str) -> CircuitBreaker:
+    return _breakers[source]
+
+
+def breaker_states() -> Dict[str, dict]:
+    return {source: breaker.snapshot() for source, breaker in _breakers.items()}
+
+
+def upstream_load() -> dict:
+    return {"in_flight": _in_flight, "max_concurrency": settings.UPSTREAM_MAX_CONCURRENCY}
+
+
+def _acquire_slot() -> None:
+    global _in_flight
+    if not _slots.acquire(timeout=settings.UPSTREAM_QUEUE_TIMEOUT_SECONDS):
+        raise UpstreamBusy(
+            f"Too many market data calls in flight (limit {settings.UPSTREAM_MAX_CONCURRENCY})"
+        )
+    with _in_flight_lock:
+        _in_flight += 1
+
+
+def _release_slot(_future=None) -> None:
+    global _in_flight
+    with _in_flight_lock:
+        _in_flight -= 1
+    _slots.release()
+
+
+def _backoff(attempt: int) -> float:
+    """full jitter 지수 백오프"""
+    return random.uniform(0, settings.MARKET_RETRY_BACKOFF * (2 ** attempt))
+
+
+def call_upstream(
+    source: str,
+    fn: Callable[..., T],
+    *args,
+    timeout: Optional[float] = None,
+    retries: Optional[int] = None,
+    **kwargs
+) -> T:
+    """
+    시세 소스 호출 (타임아웃 + 재시도 + 서킷 브레이커)
+    - 동시 호출 슬롯을 얻지 못하면 UpstreamBusy (서킷 실패로 세지 않음)
+    - 서킷이 열려 있으면 슬롯을 기다리지 않고 CircuitOpenError
+    - 없는 심볼 등 전송 장애가 아닌 오류는 재시도 없이 UpstreamDataError
+    - 재시도 후에도 실패하면 UpstreamTimeout / UpstreamError
+    """
+    breaker = _breakers[source]
+    timeout = settings.MARKET_TIMEOUT_SECONDS if timeout is None else timeout
+    retries = settings.MARKET_RETRIES if retries is None else retries
+
+    last_error: Optional[Exception] = None
+    for attempt in range(retries + 1):
+        # 서킷이 열려 있으면 슬롯을 기다리지 않고 바로 실패
+        if not breaker.allow():
+            raise CircuitOpenError(f"{source} circuit is open")
+        # 슬롯은 호출이 실제로 끝날 때 반환 (타임아웃된 호출도 스레드를 점유하므로)
+        try:
+            _acquire_slot()
+        except UpstreamBusy:
+            breaker.cancel_trial()
+            raise
+
+        try:
+            future = _executor.submit(fn, *args, **kwargs)
+        except Exception:
+            _release_slot()
+            breaker.cancel_trial()
+            raise
+        future.add_done_callback(_release_slot)
+        try:
+            result = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            last_error = UpstreamTimeout(f"{source} call timed out after {timeout}s")
+        except Exception as e:
+            if not is_transient(e):
+                # 소스는 응답함 → 재시도 / 실패 집계 없이 바로 전달
+                breaker.record_success()
+                raise UpstreamDataError(f"{source} call failed: {e}") from e
+            last_error = e
+        else:
+            breaker.record_success()
+            return result
+
+        breaker.record_failure(last_error)
+        if attempt < retries:
+            time.sleep(_backoff(attempt))
+
+    if isinstance(last_error, UpstreamError):
+        raise last_error
+    raise UpstreamError(f"{source} call failed: {last_error}") from last_error
@@ -0,0 +1,170 @@
+"""
+포트폴리오 리스크 지표 (변동성, 최대 낙폭, 상관관계, 변동성 기여도)
+
+- 보유 종목의 일별 종가로 수익률 행렬(거래일 × 종목)을 만들어 numpy로 한 번에 계산
+- 수익률 행렬 / 공분산 / 상관관계는 (종목 집합, 구간, 기준일)별로 메모 →
+  같은 포트폴리오를 다시 보거나 보유 종목이 같은 다른 포트폴리오는 재사용하고 비중 관련 계산만 새로 수행
+- 수익률은 종목 통화 기준 (환율 변동은 반영하지 않음), 비중은 기준 통화 평가금액 기준
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..config import settings
+from ..schemas.portfolio import PortfolioRisk
+from .fx import asset_currency, fx_factors
+from .market import get_price_history
+
+TRADING_DAYS = 252
+
+
+class InsufficientHistory(Exception):
+    """수익률을 계산할 시세 이력이 부족함"""
+
+
+@dataclass
+class ReturnStats:
+    """종목 집합의 구간 수익률 통계 (비중과 무관, 포트폴리오 간 공유)"""
+    symbols: List[str]  # 열 순서
+    missing: List[str]  # 이력이 없어 제외한 종목
+    as_of: date  # 마지막 종가 날짜
+    returns: "np.ndarray"  # (관측일 × 종목) 일별 수익률
+    last_closes: "np.ndarray"  # 종목별 마지막 종가
+    covariance: "np.ndarray"  # 연율화 공분산
+    correlation: "np.ndarray"
+    volatilities: "np.ndarray"  # 연율화 변동성
+    max_drawdowns: "np.ndarray"  # 종목별 최대 낙폭
+
+
+# (종목 집합, 구간, 기준일) → ReturnStats (LRU)
+_stats_cache: "OrderedDict[Tuple[Tuple[str, ...], int, date], ReturnStats]" = OrderedDict()
+_stats_lock = threading.Lock()
+
+
+def max_drawdown(values: "np.ndarray") -> "np.ndarray":
+    """누적 가치 경로(관측일 × 열)의 열별 최대 낙폭 (음수 비율)"""
+    import numpy as np
+
+    peaks = np.maximum.accumulate(values, axis=0)
+    return (values / peaks - 1.0).min(axis=0)
+
+
+def _build_stats(symbols: Tuple[str, ...], window: int, as_of: date) -> ReturnStats:
+    import numpy as np
+    import pandas as pd
+
+    # 휴장일을 감안해 달력 기준으로 넉넉히 조회
+    start_date = as_of - timedelta(days=int(window * 1.5) + 10)
+    closes = {}
+    for symbol in symbols:
+        series = get_price_history(symbol, start_date, as_of)
+        if series is not None and len(series) > 1:
+            closes[symbol] = series
+
+    missing = [symbol for symbol in symbols if symbol not in closes]
+    if not closes:
+        raise InsufficientHistory("No price history available for any holding")
+
+    # 시장별 휴장일이 다르므로 직전 종가로 채운 뒤 공통 구간만 사용
+    frame = pd.DataFrame(closes).sort_index().ffill().dropna()
+    frame = frame.iloc[-(window + 1):]
+    if len(frame) < 3:
+        raise InsufficientHistory("Not enough overlapping price history to compute risk")
+
+    prices = frame.to_numpy(dtype=float)
+    returns = prices[1:] / prices[:-1] - 1.0
+    covariance = np.atleast_2d(np.cov(returns, rowvar=False)) * TRADING_DAYS
+    volatilities = np.sqrt(np.diag(covariance))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        correlation = covariance / np.outer(volatilities, volatilities)
+    correlation = np.nan_to_num(correlation)
+    np.fill_diagonal(correlation, 1.0)
+
+    return ReturnStats(
+        symbols=list(frame.columns),
+        missing=missing,
+        as_of=frame.index[-1].date(),
+        returns=returns,
+        last_closes=prices[-1],
+        covariance=covariance,
+        correlation=correlation,
+        volatilities=volatilities,
+        max_drawdowns=max_drawdown(prices)
+    )
+
+
+def get_return_stats(symbols: Sequence[str], window: int, as_of: Optional[date] = None) -> ReturnStats:
+    """종목 집합의 수익률 통계 (메모 사용)"""
+    key = (tuple(sorted(set(symbols))), window, as_of or date.today())
+    with _stats_lock:
+        stats = _stats_cache.get(key)
+        if stats is not None:
+            _stats_cache.move_to_end(key)
+            return stats
+
+    stats = _build_stats(*key)
+    with _stats_lock:
+        _stats_cache[key] = stats
+        while len(_stats_cache) > settings.RISK_CACHE_SIZE:
+            _stats_cache.popitem(last=False)
+    return stats
+
+
+def build_portfolio_risk(portfolio, window: int, fx_rates: Optional[Dict[str, Optional[float]]] = None) -> PortfolioRisk:
+    """
+    포트폴리오 리스크
+    - 비중: 현재 수량 × 마지막 종가 × 환율 (기준 통화)
+    - 변동성 기여도: w_i (Σw)_i / σ_p  (합계 = 포트폴리오 변동성)
+    - 최대 낙폭: 현재 비중을 구간 내내 유지했다고 가정한 누적 수익률 경로
+    - 환율을 가져올 수 없으면 FXRateUnavailable, 이력이 부족하면 InsufficientHistory
+    """
+    import numpy as np
+
+    items = list(portfolio.items)
+    stats = get_return_stats([item.asset.symbol for item in items], window)
+    column = {symbol: i for i, symbol in enumerate(stats.symbols)}
+    held = [item for item in items if item.asset.symbol in column]
+
+    # 종목별 평가금액 → 심볼별 비중 (같은 심볼이 여러 번 있으면 합산)
+    rates, _ = fx_factors([asset_currency(item.asset) for item in held], portfolio.base_currency, fx_rates)
+    columns = np.array([column[item.asset.symbol] for item in held], dtype=int)
+    values = np.array([item.current_quantity for item in held], dtype=float) * stats.last_closes[columns] * rates
+    total_value = values.sum()
+    item_weights = values / total_value if total_value > 0 else np.zeros(len(held))
+    weights = np.bincount(columns, weights=item_weights, minlength=len(stats.symbols))
+
+    marginal = stats.covariance @ weights
+    volatility = float(np.sqrt(max(weights @ marginal, 0.0)))
+    path = np.cumprod(1.0 + stats.returns @ weights)
+    portfolio_drawdown = float(max_drawdown(np.concatenate(([1.0], path))[:, None])[0])
+
+    items_risk = []
+    for i, item in enumerate(held):
+        col = columns[i]
+        contribution = item_weights[i] * marginal[col] / volatility if volatility > 0 else 0.0
+        items_risk.append({
+            "item_id": item.id,
+            "asset_id": item.asset_id,
+            "symbol": item.asset.symbol,
+            "weight": float(item_weights[i] * 100),
+            "volatility": float(stats.volatilities[col] * 100),
+            "max_drawdown": float(stats.max_drawdowns[col] * 100),
+            "risk_contribution": float(contribution * 100),
+            "risk_contribution_pct": float(contribution / volatility * 100) if volatility > 0 else 0.0
+        })
+
+    return PortfolioRisk.model_validate({
+        "portfolio_id": portfolio.id,
+        "base_currency": portfolio.base_currency,
+        "window": window,
+        "observations": len(stats.returns),
+        "as_of": stats.as_of,
+        "volatility": volatility * 100,
+        "max_drawdown": portfolio_drawdown * 100,
+        "symbols": stats.symbols,
+        "correlation": np.round(stats.correlation, 6).tolist(),
+        "items": items_risk,
+        "missing_symbols": stats.missing
+    })
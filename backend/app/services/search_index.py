@@ -0,0 +1,314 @@
+"""
+종목 검색 인덱스
+
+종목 리스트가 갱신될 때 한 번 만들어 두고 검색마다 재사용합니다.
+- 코드/이름 완전 일치 · 접두 · 부분 일치
+  (코드 / 초성 키 / 자모 분해 이름의 n-gram 역색인으로 후보를 좁힌 뒤 확인,
+   n-gram보다 짧은 쿼리는 키 열의 연결 바이트에서 검색)
+- 초성 검색: "ㅅㅅㅈㅈ" → 삼성전자 (이름별 초성 키를 미리 계산)
+- 오타 허용
+  - 이름을 자모 단위로 분해한 문자열의 3-gram 역색인으로 후보를 뽑고 유사도로 순위 ("삼송전자" → 삼성전자)
+  - 영문은 이름 단어/심볼과 편집 거리 1~2 이내 일치 ("aple" → Apple)
+  - 숫자로만 된 쿼리(종목 코드)는 오타 허용 없이 일치만
+결과는 점수 → 이름 길이 → 리스트 순서로 정렬
+키 열은 StringColumn, 역색인은 정렬된 키 + 행 번호 배열(Postings)로 들고 있어
+워커마다 리스트 / dict로 복사하지 않음
+"""
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, List, Sequence
+
+from .listing_store import StringColumn
+
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_LAST = 0xD7A3
+_CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSUNG = [
+    "", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+    "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"
+]
+
+NGRAM_SIZE = 3
+MIN_NGRAM_COVERAGE = 0.5  # 쿼리 n-gram 중 이 비율 이상이 겹쳐야 오타 후보
+
+# 매칭 종류별 점수 (높을수록 먼저)
+SCORE_CODE_EXACT = 100
+SCORE_NAME_EXACT = 95
+SCORE_CODE_PREFIX = 85
+SCORE_NAME_PREFIX = 80
+SCORE_NAME_CONTAINS = 70
+SCORE_CODE_CONTAINS = 65
+SCORE_CHOSUNG_PREFIX = 60
+SCORE_CHOSUNG_CONTAINS = 55
+SCORE_EDIT_DISTANCE = 50  # 편집 거리 1당 -10
+SCORE_NGRAM = 30  # + 20 × Dice 유사도
+
+
+def is_syllable(char: str) -> bool:
+    return _SYLLABLE_BASE <= ord(char) <= _SYLLABLE_LAST
+
+
+def is_jamo(char: str) -> bool:
+    """호환용 자모 (키보드로 입력한 ㄱ, ㅏ 등)"""
+    return "ㄱ" <= char <= "ㆎ"
+
+
+def chosung(text: str) -> str:
+    """초성 키 (한글 음절은 초성으로, 나머지는 소문자 그대로, 공백 제거)"""
+    chars = []
+    for char in text.lower():
+        if is_syllable(char):
+            chars.append(_CHOSUNG[(ord(char) - _SYLLABLE_BASE) // 588])
+        elif not char.isspace():
+            chars.append(char)
+    return "".join(chars)
+
+
+def decompose(text: str) -> str:
+    """자모 분해 문자열 (삼성 → ㅅㅏㅁㅅㅓㅇ, 나머지는 소문자, 공백 제거)"""
+    chars = []
+    for char in text.lower():
+        if is_syllable(char):
+            index = ord(char) - _SYLLABLE_BASE
+            chars.append(_CHOSUNG[index // 588])
+            chars.append(_JUNGSUNG[(index % 588) // 28])
+            chars.append(_JONGSUNG[index % 28])
+        elif not char.isspace():
+            chars.append(char)
+    return "".join(chars)
+
+
+def ngrams(key: str, size: int = NGRAM_SIZE) -> List[str]:
+    padded = f"^{key}$"
+    return [padded[i:i + size] for i in range(max(len(padded) - size + 1, 1))]
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> int:
+    """레벤슈타인 거리 (max_distance를 넘으면 max_distance + 1)"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            )
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return min(previous[-1], max_distance + 1)
+
+
+class Postings:
+    """키 → 번호 목록 (정렬된 키 StringColumn + 시작 오프셋 / 번호 배열)"""
+
+    def __init__(self, lists: Dict[str, List[int]]):
+        keys = sorted(lists)
+        self.keys = StringColumn(keys)
+        largest = max((max(values) for values in lists.values() if values), default=0)
+        self._starts = array("I", [0])
+        self._values = array("H" if largest <= 0xFFFF else "I")
+        for key in keys:
+            self._values.extend(lists[key])
+            self._starts.append(len(self._values))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def at(self, position: int) -> array:
+        """position번째 키의 번호 목록"""
+        return self._values[self._starts[position]:self._starts[position + 1]]
+
+    def get(self, key: str) -> array:
+        """키의 번호 목록 (없으면 빈 배열)"""
+        position = bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            return self.at(position)
+        return self._values[:0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.keys.nbytes + sys.getsizeof(self._starts) + sys.getsizeof(self._values)
+
+
+def _key_column(values: Sequence[str], transform: Callable[[str], str]) -> Sequence[str]:
+    """검색 키 열 (변환해도 모든 값이 그대로면 원래 열을 같이 사용)"""
+    keys = [transform(value) for value in values]
+    if all(key == value for key, value in zip(keys, values)):
+        return values
+    return StringColumn(keys)
+
+
+def _search_key(name: str) -> str:
+    return "".join(name.lower().split())
+
+
+def _gram_postings(keys: Iterable[str], include: Callable[[str], bool] = bool) -> "Postings":
+    """키 열의 n-gram 역색인 (include가 참인 키만)"""
+    postings: Dict[str, List[int]] = defaultdict(list)
+    for row, key in enumerate(keys):
+        if include(key):
+            for gram in set(ngrams(key)):
+                postings[gram].append(row)
+    return Postings(postings)
+
+
+def _scan_rows(keys: Sequence[str], needle: str) -> Iterable[int]:
+    """needle을 포함하는 행 (StringColumn은 바이트 검색, 그 외 목록은 순회)"""
+    if isinstance(keys, StringColumn):
+        return keys.rows_containing(needle)
+    return [row for row, key in enumerate(keys) if needle in key]
+
+
+class SearchIndex:
+    """종목 코드/이름 목록에 대한 검색 인덱스"""
+
+    def __init__(self, codes: Sequence[str], names: Sequence[str]):
+        # 원본 열은 복사하지 않고 참조만 (ListingStore의 StringColumn 그대로)
+        self.codes = codes
+        self.names = names
+        # 이미 소문자인 코드(KRX), 한글이 없는 이름의 초성 키(US)처럼 원본과 같으면 복사하지 않음
+        self._codes = _key_column(codes, str.lower)
+        self._names = _key_column(names, _search_key)
+        self._chosung = _key_column(self._names, chosung)
+
+        # 영문 편집 거리 비교용 단어 사전 (이름 단어 + 코드 → 행) 과 단어 n-gram 역색인 (→ 단어 번호)
+        # 숫자로만 된 단어(KRX 코드 등)는 오타 비교 대상이 아니므로 제외
+        words: Dict[str, List[int]] = defaultdict(list)
+        for row, (code, name) in enumerate(zip(self._codes, names)):
+            for word in set(name.lower().split()) | {code}:
+                if word.isascii() and not word.isdigit():
+                    words[word].append(row)
+        self._words = Postings(words)
+        word_grams: Dict[str, List[int]] = defaultdict(list)
+        for word_id, word in enumerate(self._words.keys):
+            for gram in set(ngrams(word)):
+                word_grams[gram].append(word_id)
+        self._word_postings = Postings(word_grams)
+
+        # 코드 / 초성 키의 n-gram 역색인 (초성 키는 자모가 있는 행만 = 한글 이름)
+        self._code_grams = _gram_postings(self._codes)
+        self._chosung_grams = _gram_postings(self._chosung, lambda key: any(is_jamo(char) for char in key))
+
+        # 자모 분해 이름의 n-gram 역색인 (이름 부분 일치 후보 + 오타 허용)
+        postings: Dict[str, List[int]] = defaultdict(list)
+        self._gram_counts = array("H")
+        for row, name in enumerate(names):
+            grams = set(ngrams(decompose(name)))
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                postings[gram].append(row)
+        self._postings = Postings(postings)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        """인덱스가 따로 들고 있는 메모리 (참조만 하는 codes / names 제외)"""
+        owned = {
+            id(column): column
+            for column in (self._codes, self._names, self._chosung)
+            if column is not self.codes and column is not self.names
+        }
+        return (
+            sum(column.nbytes for column in owned.values())
+            + self._words.nbytes
+            + self._word_postings.nbytes
+            + self._code_grams.nbytes
+            + self._chosung_grams.nbytes
+            + self._postings.nbytes
+            + sys.getsizeof(self._gram_counts)
+        )
+
+    def search(self, query: str, limit: int = 10) -> List[int]:
+        """점수순 행 번호 목록"""
+        text = "".join(query.lower().split())
+        if not text:
+            return []
+
+        scores: Dict[int, float] = {}
+
+        def hit(row: int, score: float):
+            if score > scores.get(row, 0):
+                scores[row] = score
+
+        for row in self._rows_containing(self._codes, self._code_grams, text, text):
+            code = self._codes[row]
+            hit(row, SCORE_CODE_EXACT if code == text else SCORE_CODE_PREFIX if code.startswith(text) else SCORE_CODE_CONTAINS)
+
+        # 이름 부분 일치면 자모 분해 이름에도 포함되므로 자모 n-gram 역색인으로 후보 선택
+        for row in self._rows_containing(self._names, self._postings, text, decompose(text)):
+            name = self._names[row]
+            hit(row, SCORE_NAME_EXACT if name == text else SCORE_NAME_PREFIX if name.startswith(text) else SCORE_NAME_CONTAINS)
+
+        # 자모가 섞인 쿼리만 초성으로 비교 ("삼성"이 초성 ㅅㅅ인 다른 종목과 매칭되지 않도록)
+        if any(is_jamo(char) for char in text):
+            key = chosung(text)
+            for row in self._rows_containing(self._chosung, self._chosung_grams, key, key):
+                name_key = self._chosung[row]
+                hit(row, SCORE_CHOSUNG_PREFIX if name_key.startswith(key) else SCORE_CHOSUNG_CONTAINS)
+
+        # 숫자로만 된 쿼리는 종목 코드 → "000"처럼 흔한 n-gram으로 전체를 비교하지 않도록 오타 허용 생략
+        if len(scores) < limit and not text.isdigit():
+            self._fuzzy(text, hit)
+
+        ranked = sorted(scores, key=lambda row: (-scores[row], len(self.names[row]), row))
+        return ranked[:limit]
+
+    def _rows_containing(self, keys: Sequence[str], postings: Postings, needle: str, gram_text: str) -> Iterable[int]:
+        """
+        keys 중 needle을 포함하는 행
+        - gram_text: needle을 postings의 키와 같은 방식으로 변환한 문자열
+          → gram_text의 n-gram이 모두 있는 행만 확인 (가장 짧은 목록부터 교집합)
+        - n-gram이 없을 만큼 짧으면 키 열 바이트 검색
+        """
+        if len(gram_text) < NGRAM_SIZE:
+            return _scan_rows(keys, needle)
+        grams = {gram_text[i:i + NGRAM_SIZE] for i in range(len(gram_text) - NGRAM_SIZE + 1)}
+        lists = sorted((postings.get(gram) for gram in grams), key=len)
+        rows = set(lists[0])
+        for values in lists[1:]:
+            if not rows:
+                break
+            rows.intersection_update(values)
+        return [row for row in rows if needle in keys[row]]
+
+    def _fuzzy(self, text: str, hit) -> None:
+        """n-gram 후보 → 유사도 점수, 영문은 단어 사전에서 편집 거리도 확인"""
+        query_grams = set(ngrams(decompose(text)))
+        if len(query_grams) < 3:
+            return
+
+        overlaps = Counter()
+        for gram in query_grams:
+            overlaps.update(self._postings.get(gram))
+        for row, overlap in overlaps.items():
+            if overlap / len(query_grams) >= MIN_NGRAM_COVERAGE:
+                dice = 2 * overlap / (len(query_grams) + self._gram_counts[row])
+                hit(row, SCORE_NGRAM + 20 * dice)
+
+        if text.isascii() and len(text) >= 3:
+            self._edit_distance(text, query_grams, hit)
+
+    def _edit_distance(self, text: str, query_grams: set, hit) -> None:
+        # 편집 거리 d 이내면 n-gram은 최대 d × NGRAM_SIZE개까지만 달라지므로 그만큼 겹치는 단어만 비교
+        max_distance = 1 if len(text) <= 5 else 2
+        min_overlap = max(len(query_grams) - max_distance * NGRAM_SIZE, 1)
+
+        overlaps = Counter()
+        for gram in query_grams:
+            overlaps.update(self._word_postings.get(gram))
+        for word_id, overlap in overlaps.items():
+            if overlap < min_overlap:
+                continue
+            distance = bounded_edit_distance(text, self._words.keys[word_id], max_distance)
+            if distance <= max_distance:
+                for row in self._words.at(word_id):
+                    hit(row, SCORE_EDIT_DISTANCE - 10 * distance)
@@ -0,0 +1,38 @@
+"""
+응답 스키마 조립
+
+- 스키마 검증은 한 번만 (ORM 객체 → 스키마), 라우트는 ModelResponse로 반환해 FastAPI의 재검증을 건너뜀
+- compact 응답은 items에 asset_id만 남기고 종목 정보는 assets 목록에 한 번씩만 포함
+"""
+from typing import Dict, Iterable, List
+
+from ..schemas.portfolio import Portfolio, PortfolioDetail, PortfolioDetailCompact
+
+
+def unique_assets(assets: Iterable) -> List:
+    """중복 제거한 종목 목록 (처음 나온 순서 유지)"""
+    table: Dict[int, object] = {}
+    for asset in assets:
+        table.setdefault(asset.id, asset)
+    return list(table.values())
+
+
+def portfolio_fields(portfolio) -> dict:
+    """Portfolio 스키마 필드 (ORM 객체 → dict)"""
+    return {name: getattr(portfolio, name) for name in Portfolio.model_fields}
+
+
+def portfolio_detail(portfolio, compact: bool = False):
+    """PortfolioDetail (compact=True면 PortfolioDetailCompact)"""
+    if not compact:
+        return PortfolioDetail.model_validate(portfolio)
+
+    items = list(portfolio.items)
+    return PortfolioDetailCompact.model_validate(
+        {
+            **portfolio_fields(portfolio),
+            "items": items,
+            "assets": unique_assets(item.asset for item in items)
+        },
+        from_attributes=True
+    )
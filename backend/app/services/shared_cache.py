@@ -0,0 +1,323 @@
+"""
+워커 간 공유 캐시
+
+uvicorn 워커(프로세스)마다 종목 리스트/시세를 따로 받아오지 않도록
+같은 노드의 모든 워커가 읽을 수 있는 캐시 계층을 제공합니다.
+
+값은 JSON으로 직렬화 (캐시 파일/서버 내용을 조작해도 코드가 실행되지 않도록 pickle 미사용)
+JSON이 아닌 값(ListingStore, Series 등)은 get_or_load의 encode/decode로 변환해서 저장
+
+SHARED_CACHE_URL
+- "" (기본값)            : 사용자 캐시 디렉터리(~/.cache/portfolio, 권한 0700)의 SQLite 파일 (노드 단위 공유)
+- "sqlite:///path/to.db" : 지정한 SQLite 파일
+- "redis://host:6379/0"  : Redis 호환 서버 (redis 패키지 필요, 노드 간 공유)
+- "memory://"            : 프로세스 내부 dict (공유 없음, 테스트/단일 워커용)
+"""
+import json
+import os
+import random
+import sqlite3
+import stat
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..config import settings
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    stored_at: float  # time.time()
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+
+class SharedCache(ABC):
+    """공유 캐시 인터페이스 (값은 JSON으로 직렬화)"""
+
+    @abstractmethod
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        """키가 없을 때만 저장 (저장했으면 True) - 워커 간 lease로 사용"""
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        return entry.value if entry else None
+
+
+class MemoryCache(SharedCache):
+    """프로세스 내부 캐시 (워커 간 공유되지 않음)"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Any, float, float]] = {}
+        self._lock = threading.Lock()
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, stored_at, expires_at = item
+            if expires_at <= time.time():
+                del self._data[key]
+                return None
+            return CacheEntry(value, stored_at)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._data[key] = (value, now, now + ttl)
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[2] > time.time():
+                return False
+            now = time.time()
+            self._data[key] = (value, now, now + ttl)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class SQLiteCache(SharedCache):
+    """SQLite 파일 기반 캐시 (같은 노드의 모든 워커가 공유)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드 간 공유하지 않음
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        row = self._connect().execute(
+            "SELECT value, stored_at FROM cache WHERE key = ? AND expires_at > ?",
+            (key, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        return CacheEntry(json.loads(row[0]), row[1])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), now, now + ttl)
+        )
+        # 가끔 만료된 항목 정리
+        if random.random() < 0.01:
+            conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        now = time.time()
+        conn = self._connect()
+        conn.execute("DELETE FROM cache WHERE key = ? AND expires_at <= ?", (key, now))
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO cache (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), now, now + ttl)
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+
+class RedisCache(SharedCache):
+    """Redis 호환 서버 캐시 (선택: pip install redis)"""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("SHARED_CACHE_URL uses redis:// but the 'redis' package is not installed") from e
+        self._client = redis.Redis.from_url(url)
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        raw = self._client.get(key)
+        if raw is None:
+            return None
+        value, stored_at = json.loads(raw)
+        return CacheEntry(value, stored_at)
+
+    def _dump(self, value: Any) -> str:
+        return json.dumps([value, time.time()])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._client.set(key, self._dump(value), px=max(int(ttl * 1000), 1))
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        return bool(self._client.set(key, self._dump(value), px=max(int(ttl * 1000), 1), nx=True))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(key)
+
+
+class _SafeCache(SharedCache):
+    """캐시 장애가 요청 실패로 이어지지 않도록 예외를 삼키는 래퍼"""
+
+    def __init__(self, backend: SharedCache):
+        self.backend = backend
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        try:
+            return self.backend.get_entry(key)
+        except Exception as e:
+            print(f"Shared cache get error for {key}: {e}")
+            return None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            self.backend.set(key, value, ttl)
+        except Exception as e:
+            print(f"Shared cache set error for {key}: {e}")
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        try:
+            return self.backend.add(key, value, ttl)
+        except Exception as e:
+            print(f"Shared cache add error for {key}: {e}")
+            # lease를 잡을 수 없으면 직접 로드하도록 True 반환
+            return True
+
+    def delete(self, key: str) -> None:
+        try:
+            self.backend.delete(key)
+        except Exception as e:
+            print(f"Shared cache delete error for {key}: {e}")
+
+
+_cache: Optional[SharedCache] = None
+_cache_lock = threading.Lock()
+
+
+def _private_cache_dir() -> str:
+    """
+    기본 SQLite 캐시 디렉터리 ($XDG_CACHE_HOME 또는 ~/.cache 아래 portfolio)
+    - 권한 0700으로 생성, 다른 사용자 소유이거나 그룹/기타 사용자가 접근할 수 있으면 사용하지 않음
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = os.path.join(base, "portfolio")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.stat(path)
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"Shared cache directory {path} is not owned by the current user")
+    if stat.S_IMODE(info.st_mode) & 0o077:
+        raise PermissionError(f"Shared cache directory {path} must not be accessible by other users (chmod 700)")
+    return path
+
+
+def _create_cache(url: str) -> SharedCache:
+    if url.startswith("memory://"):
+        return MemoryCache()
+    if url.startswith("redis://") or url.startswith("rediss://"):
+        return RedisCache(url)
+    if url.startswith("sqlite:///"):
+        return SQLiteCache(url[len("sqlite:///"):])
+    if not url:
+        return SQLiteCache(os.path.join(_private_cache_dir(), "shared-cache.sqlite3"))
+    raise ValueError(f"Unsupported SHARED_CACHE_URL: {url}")
+
+
+def get_shared_cache() -> SharedCache:
+    """설정에 따른 공유 캐시 (프로세스당 1개, 지연 생성)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    backend = _create_cache(settings.SHARED_CACHE_URL)
+                except Exception as e:
+                    print(f"Shared cache unavailable, using in-process cache: {e}")
+                    backend = MemoryCache()
+                _cache = _SafeCache(backend)
+    return _cache
+
+
+def get_or_load(
+    key: str,
+    loader: Callable[[], Any],
+    ttl: float,
+    lease_timeout: float = 60.0,
+    poll_interval: float = 0.1,
+    encode: Optional[Callable[[Any], Any]] = None,
+    decode: Optional[Callable[[Any], Any]] = None
+) -> Optional[CacheEntry]:
+    """
+    공유 캐시에서 읽고, 없으면 노드 내 한 워커만 loader를 실행
+    (다른 워커는 lease가 풀리거나 값이 채워질 때까지 대기)
+    loader가 None을 반환하면 캐시에 저장하지 않고 None 반환
+    encode / decode: 값 ↔ JSON 호환 값 변환 (반환하는 entry.value는 decode된 값)
+    """
+    cache = get_shared_cache()
+
+    def cached() -> Optional[CacheEntry]:
+        entry = cache.get_entry(key)
+        if entry is None or decode is None:
+            return entry
+        try:
+            return CacheEntry(decode(entry.value), entry.stored_at)
+        except Exception as e:
+            print(f"Shared cache decode error for {key}: {e}")
+            return None
+
+    entry = cached()
+    if entry is not None:
+        return entry
+
+    lease_key = f"lease:{key}"
+    acquired = cache.add(lease_key, os.getpid(), lease_timeout)
+    if not acquired:
+        deadline = time.monotonic() + lease_timeout
+        while time.monotonic() < deadline:
+            time.sleep(poll_interval)
+            entry = cached()
+            if entry is not None:
+                return entry
+            if cache.get_entry(lease_key) is None:
+                break  # 다른 워커의 로드가 실패함 → 직접 로드
+
+    try:
+        value = loader()
+        if value is None:
+            return None
+        cache.set(key, encode(value) if encode else value, ttl)
+        return CacheEntry(value, time.time())
+    finally:
+        if acquired:
+            cache.delete(lease_key)
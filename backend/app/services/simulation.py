@@ -0,0 +1,243 @@
+"""
+포트폴리오 몬테카를로 시뮬레이션 (기간 말 평가금액 분포)
+
+- 시작 금액: 분석(build_portfolio_analysis)의 종목별 현재 평가금액 (기준 통화)
+- 수익률 모델: 보유 종목 일별 로그수익률의 과거 평균 / 공분산 (risk.get_return_stats 재사용)
+  으로 다변량 정규 난수 생성, 종목별 누적 → 매수 후 보유(리밸런싱 없음) 평가금액 경로
+- 경로 생성은 (경로 × 일 × 종목) 배열 연산으로 벡터화, 메모리 상한(SIMULATION_CHUNK_ELEMENTS) 단위로 나눠 계산
+- 경로가 많으면 SIMULATION_PATHS_PER_TASK 단위 작업으로 나눠 프로세스 풀에서 병렬 계산
+  요청당 동시에 실행하는 작업은 풀 크기까지, SIMULATION_TIME_BUDGET_SECONDS가 지나면 새 작업을 보내지 않고
+  실행 중인 작업도 배치 사이에서 멈춤 (끝난 경로만 사용, truncated=True) → 응답 후 코어를 계속 점유하지 않음
+- 이력이 없는 종목은 현재 금액 그대로(현금처럼) 유지
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import List, Optional, Tuple
+
+from ..config import settings
+from ..schemas.portfolio import PortfolioSimulation, SimulationRequest
+from .analysis import build_portfolio_analysis
+from .risk import get_return_stats
+
+
+class SimulationTimeout(Exception):
+    """시간 예산 안에 완료한 경로가 없음"""
+
+
+class SimulationFailed(Exception):
+    """시뮬레이션 작업 실패 (작업 안의 예외, 프로세스 풀 중단)"""
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _pool_size() -> int:
+    return settings.SIMULATION_WORKERS or os.cpu_count() or 1
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    """시뮬레이션 프로세스 풀 (첫 사용 시 생성, 1개 이하면 None → 요청 스레드에서 계산)"""
+    global _pool
+    if _pool_size() <= 1:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # 스레드가 많은 서버 프로세스를 fork하지 않도록 spawn 사용
+                _pool = ProcessPoolExecutor(
+                    max_workers=_pool_size(),
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _pool
+
+
+def _reset_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _factor(covariance: "np.ndarray") -> "np.ndarray":
+    """공분산의 하삼각 인수 L (L Lᵀ = Σ, 특이 행렬이면 고유값 분해로 대체)"""
+    import numpy as np
+
+    try:
+        return np.linalg.cholesky(covariance)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        return eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+
+
+def _simulate_chunk(
+    mu: "np.ndarray",
+    factor: "np.ndarray",
+    values: "np.ndarray",
+    cash: float,
+    horizon: int,
+    steps: "np.ndarray",
+    target: Optional[float],
+    chunk_elements: int,
+    deadline: float,
+    n_paths: int,
+    seed
+) -> Tuple["np.ndarray", int]:
+    """
+    경로 n_paths개 계산 (프로세스 풀 작업 단위)
+    deadline(time.time() 기준)이 지나면 남은 배치는 건너뜀 (최소 1배치는 계산)
+    반환: (계산한 경로 × steps 시점 평가금액, 기간 중 목표 도달 경로 수)
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    n_assets = len(values)
+    batch = max(chunk_elements // (horizon * n_assets), 1)
+    out = np.empty((n_paths, len(steps)))
+    touched = 0
+    for start in range(0, n_paths, batch):
+        if start > 0 and time.time() >= deadline:
+            return out[:start], touched
+        size = min(batch, n_paths - start)
+        # (경로, 일, 종목) 로그수익률 → 종목별 누적 → 평가금액 경로 (경로, 일)
+        shocks = rng.standard_normal((size, horizon, n_assets)) @ factor.T
+        shocks += mu
+        np.cumsum(shocks, axis=1, out=shocks)
+        np.exp(shocks, out=shocks)
+        path_values = shocks @ values + cash
+        out[start:start + size] = path_values[:, steps]
+        if target is not None:
+            touched += int(np.count_nonzero(path_values.max(axis=1) >= target))
+    return out, touched
+
+
+def _run_tasks(task: partial, task_paths: List[int], seeds: list, deadline: float) -> Tuple[list, bool]:
+    """
+    작업 실행 (풀이 있으면 병렬, 없으면 순차) → (완료된 결과, 시간 초과로 남은 작업이 있는지)
+    병렬 실행 시 동시에 보내는 작업은 풀 크기까지 (하나가 끝나면 다음 작업 제출)
+    작업이 예외로 끝나거나 프로세스 풀이 중단되면 SimulationFailed
+    """
+    pool = _get_pool() if len(task_paths) > 1 else None
+    tasks = list(zip(task_paths, seeds))
+    if pool is None:
+        results = []
+        try:
+            for n_paths, seed in tasks:
+                if results and time.monotonic() >= deadline:
+                    return results, True
+                results.append(task(n_paths, seed))
+        except Exception as e:
+            print(f"Simulation task error: {e!r}")
+            raise SimulationFailed("Simulation failed") from e
+        return results, False
+
+    futures = []  # 제출 순서 (시드 재현성)
+    running = set()
+    try:
+        while tasks or running:
+            while tasks and len(running) < _pool_size() and time.monotonic() < deadline:
+                future = pool.submit(task, *tasks.pop(0))
+                futures.append(future)
+                running.add(future)
+            if not running:
+                break
+            done, running = wait(running, timeout=max(deadline - time.monotonic(), 0.0), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+        # 시간 초과 시 실행 중인 작업은 배치 사이에서 스스로 멈춤 (결과는 버림)
+        results = [future.result() for future in futures if future.done() and future not in running]
+    except BrokenProcessPool as e:
+        print("Simulation process pool broke, recreating on next request")
+        _reset_pool()
+        raise SimulationFailed("Simulation workers stopped unexpectedly") from e
+    except Exception as e:
+        print(f"Simulation task error: {e!r}")
+        raise SimulationFailed("Simulation failed") from e
+    return results, bool(tasks or running)
+
+
+def build_portfolio_simulation(portfolio, request: SimulationRequest, window: int) -> PortfolioSimulation:
+    """
+    몬테카를로 시뮬레이션
+    - 환율을 가져올 수 없으면 FXRateUnavailable, 이력이 부족하면 InsufficientHistory
+    - 시간 예산 안에 경로를 하나도 계산하지 못하면 SimulationTimeout, 작업이 실패하면 SimulationFailed
+    """
+    import numpy as np
+
+    if any(not 0 <= percentile <= 100 for percentile in request.percentiles):
+        raise ValueError("percentiles must be between 0 and 100")
+
+    started = time.monotonic()
+    deadline = started + settings.SIMULATION_TIME_BUDGET_SECONDS
+
+    analysis = build_portfolio_analysis(portfolio)
+    value_by_symbol = {}
+    for item in analysis.items:
+        value_by_symbol[item.asset.symbol] = value_by_symbol.get(item.asset.symbol, 0.0) + item.current_value
+    if analysis.total_value <= 0:
+        raise ValueError("Portfolio has no holdings to simulate")
+
+    stats = get_return_stats(list(value_by_symbol), window)
+    log_returns = np.log1p(stats.returns)
+    mu = log_returns.mean(axis=0)
+    factor = _factor(np.atleast_2d(np.cov(log_returns, rowvar=False)))
+    values = np.array([value_by_symbol[symbol] for symbol in stats.symbols], dtype=float)
+    cash = float(sum(value_by_symbol[symbol] for symbol in stats.missing))
+
+    horizon = request.horizon_days
+    days = np.unique(np.linspace(1, horizon, min(horizon, settings.SIMULATION_BAND_POINTS)).round().astype(int))
+    target = request.target_value
+
+    # 작업 분할 (작업마다 독립 난수 스트림)
+    per_task = settings.SIMULATION_PATHS_PER_TASK
+    task_paths = [min(per_task, request.paths - start) for start in range(0, request.paths, per_task)]
+    seeds = np.random.SeedSequence(request.seed).spawn(len(task_paths))
+    # 작업 프로세스에서 비교할 수 있도록 벽시계 기준 마감 시각 전달
+    wall_deadline = time.time() + (deadline - time.monotonic())
+    task = partial(
+        _simulate_chunk, mu, factor, values, cash, horizon, days - 1, target,
+        settings.SIMULATION_CHUNK_ELEMENTS, wall_deadline
+    )
+    results, truncated = _run_tasks(task, task_paths, seeds, deadline)
+    if not results:
+        raise SimulationTimeout(
+            f"Simulation exceeded the {settings.SIMULATION_TIME_BUDGET_SECONDS}s time budget, try fewer paths"
+        )
+
+    paths = np.concatenate([result[0] for result in results])
+    n_paths = len(paths)
+    truncated = truncated or n_paths < request.paths
+    start_value = float(analysis.total_value)
+    bands = np.percentile(paths, request.percentiles, axis=0)
+    final = paths[:, -1]
+
+    return PortfolioSimulation.model_validate({
+        "portfolio_id": portfolio.id,
+        "base_currency": portfolio.base_currency,
+        "horizon_days": horizon,
+        "window": window,
+        "observations": len(stats.returns),
+        "paths_requested": request.paths,
+        "paths": n_paths,
+        "truncated": truncated,
+        "elapsed_ms": (time.monotonic() - started) * 1000,
+        "start_value": start_value,
+        "expected_value": float(final.mean()),
+        "days": [0] + days.tolist(),
+        "bands": [
+            {"percentile": percentile, "values": [start_value] + band.tolist()}
+            for percentile, band in zip(request.percentiles, bands)
+        ],
+        "target_value": target,
+        "target_probability": float(np.count_nonzero(final >= target) / n_paths * 100) if target is not None else None,
+        "target_touch_probability": (
+            float(sum(result[1] for result in results) / n_paths * 100) if target is not None else None
+        ),
+        "missing_symbols": stats.missing
+    })
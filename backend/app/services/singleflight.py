@@ -0,0 +1,47 @@
+"""
+Single-flight 요청 병합
+
+같은 키로 동시에 들어온 호출 중 첫 번째(leader)만 실제로 실행하고,
+나머지는 진행 중인 결과를 함께 기다립니다. (캐시 만료 직후 thundering herd 방지)
+"""
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """진행 중인 호출의 Future와 leader 여부"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _run(self, key: Hashable, future: Future, fn: Callable[..., T], args, kwargs) -> None:
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def do(self, key: Hashable, fn: Callable[..., T], *args, **kwargs) -> T:
+        """동기 호출 (leader는 현재 스레드에서 실행)"""
+        future, leader = self._join(key)
+        if leader:
+            self._run(key, future, fn, args, kwargs)
+        return future.result()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
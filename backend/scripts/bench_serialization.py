@@ -0,0 +1,112 @@
+"""
+포트폴리오 응답 직렬화 벤치마크
+
+DB/시세 없이 메모리에서 만든 N개 종목 포트폴리오로 상세/분석 응답을 비교합니다.
+- default: response_model 검증 + 표준 JSONResponse (기존 경로)
+- orjson:  response_model 검증 + ORJSONResponse
+- fast:    스키마 검증 1회 + ModelResponse (FastAPI 재검증 생략)
+- compact: fast + 종목 정보를 assets 목록으로 한 번씩만
+
+사용법: cd backend && python scripts/bench_serialization.py [--items 500] [--assets 500] [--runs 50]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.models.portfolio import Portfolio as PortfolioModel, PortfolioItem as PortfolioItemModel, Asset as AssetModel
+from app.responses import ORJSONResponse, ModelResponse
+from app.schemas.portfolio import PortfolioDetail, PortfolioAnalysis
+from app.services.analysis import build_portfolio_analysis
+from app.services.serialization import portfolio_detail
+
+
+def make_portfolio(n_items: int, n_assets: int) -> PortfolioModel:
+    now = datetime.utcnow()
+    assets = [
+        AssetModel(
+            id=i + 1, symbol=f"SYM{i:04d}", name=f"Asset {i}", exchange="NASDAQ",
+            currency="USD", asset_type="stock", created_at=now
+        )
+        for i in range(n_assets)
+    ]
+    portfolio = PortfolioModel(
+        id=1, user_id=1, name="bench", initial_invest_amount=1_000_000.0,
+        base_currency="USD", description=None, created_at=now
+    )
+    for i in range(n_items):
+        asset = assets[i % n_assets]
+        portfolio.items.append(PortfolioItemModel(
+            id=i + 1, portfolio_id=1, asset_id=asset.id, asset=asset,
+            target_weight=100.0 / n_items, tolerance=5.0, entry_price=100.0,
+            initial_quantity=10.0, current_quantity=10.0 + i % 7,
+            cost_basis=1000.0, realized_pnl=0.0, created_at=now
+        ))
+    return portfolio
+
+
+def build_app(portfolio: PortfolioModel) -> FastAPI:
+    prices = {item.asset.symbol: 100.0 + item.id % 13 for item in portfolio.items}
+    fx_rates = {"USD": 1.0}
+
+    def analysis(compact: bool = False):
+        return build_portfolio_analysis(portfolio, prices=prices, fx_rates=fx_rates, compact=compact)
+
+    app = FastAPI()
+    app.get("/detail/default", response_model=PortfolioDetail, response_class=JSONResponse)(lambda: portfolio)
+    app.get("/detail/orjson", response_model=PortfolioDetail, response_class=ORJSONResponse)(lambda: portfolio)
+    app.get("/detail/fast")(lambda: ModelResponse(portfolio_detail(portfolio)))
+    app.get("/detail/compact")(lambda: ModelResponse(portfolio_detail(portfolio, compact=True)))
+    app.get("/analysis/default", response_model=PortfolioAnalysis, response_class=JSONResponse)(lambda: analysis())
+    app.get("/analysis/orjson", response_model=PortfolioAnalysis, response_class=ORJSONResponse)(lambda: analysis())
+    app.get("/analysis/fast")(lambda: ModelResponse(analysis()))
+    app.get("/analysis/compact")(lambda: ModelResponse(analysis(compact=True)))
+    return app
+
+
+def measure(client: TestClient, paths: list, runs: int) -> dict:
+    """경로별 (최솟값, 중앙값, 응답 크기) — 변형들을 번갈아 호출해 부하 변동 영향을 줄임"""
+    sizes = {path: len(client.get(path).content) for path in paths}  # warm-up
+    samples = {path: [] for path in paths}
+    for _ in range(runs):
+        for path in paths:
+            started = time.perf_counter()
+            response = client.get(path)
+            samples[path].append(time.perf_counter() - started)
+            assert response.status_code == 200, response.text
+    return {path: (min(samples[path]), statistics.median(samples[path]), sizes[path]) for path in paths}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--assets", type=int, default=None, help="서로 다른 종목 수 (기본: items와 동일)")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    portfolio = make_portfolio(args.items, args.assets or args.items)
+    client = TestClient(build_app(portfolio))
+
+    print(f"{args.items} items / {args.assets or args.items} distinct assets, {args.runs} runs (min / median)")
+    for endpoint in ("detail", "analysis"):
+        variants = ("default", "orjson", "fast", "compact")
+        results = measure(client, [f"/{endpoint}/{variant}" for variant in variants], args.runs)
+        baseline = results[f"/{endpoint}/default"][0]
+        for variant in variants:
+            best, median, size = results[f"/{endpoint}/{variant}"]
+            print(
+                f"  {endpoint:8} {variant:8} {best * 1000:7.2f} / {median * 1000:7.2f} ms"
+                f"  {size / 1024:7.1f} KiB  x{baseline / best:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
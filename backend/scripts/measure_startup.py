@@ -0,0 +1,49 @@
+"""
+앱 기동 시간 측정
+
+새 인터프리터에서 `import app.main`에 걸리는 시간을 여러 번 측정합니다.
+(uvicorn은 이 import가 끝나야 포트를 바인딩하므로 배포 타임아웃과 직결됨)
+
+사용법: cd backend && python scripts/measure_startup.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPET = (
+    "import time; t = time.perf_counter(); import app.main; "
+    "import sys; heavy = [m for m in ('pandas', 'FinanceDataReader') if m in sys.modules]; "
+    "print(time.perf_counter() - t, ','.join(heavy))"
+)
+
+
+def measure_once() -> tuple:
+    output = subprocess.check_output([sys.executable, "-c", SNIPPET], cwd=BACKEND_DIR, text=True)
+    seconds, _, heavy = output.strip().splitlines()[-1].partition(" ")
+    return float(seconds), heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = []
+    heavy = ""
+    for _ in range(args.runs):
+        seconds, heavy = measure_once()
+        samples.append(seconds)
+
+    print(f"import app.main ({args.runs} runs)")
+    print(f"  median: {statistics.median(samples) * 1000:.1f} ms")
+    print(f"  min:    {min(samples) * 1000:.1f} ms")
+    print(f"  max:    {max(samples) * 1000:.1f} ms")
+    print(f"  heavy modules loaded at import: {heavy or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
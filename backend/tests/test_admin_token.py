@@ -0,0 +1,37 @@
+"""관리자 토큰 확인 (X-Admin-Token)"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.services.auth import is_admin_token
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    return "secret"
+
+
+def test_matching_token(admin_token):
+    assert is_admin_token(admin_token)
+    assert not is_admin_token("wrong")
+    assert not is_admin_token(None)
+
+
+def test_unset_admin_token_rejects_everything(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+    assert not is_admin_token("")
+    assert not is_admin_token("anything")
+
+
+def test_non_ascii_token_is_rejected(admin_token):
+    # str끼리 compare_digest는 비ASCII 문자에서 TypeError
+    assert not is_admin_token("adé")
+
+
+def test_non_ascii_header_does_not_break_requests(admin_token):
+    # 프로파일링 미들웨어가 모든 요청에서 헤더를 확인 → 500이 아니라 라우트 응답 그대로
+    client = TestClient(app)
+    response = client.get("/no-such-route", headers={"X-Admin-Token": "adé".encode("latin-1")})
+    assert response.status_code == 404
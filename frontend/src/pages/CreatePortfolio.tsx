@@ -58,7 +58,7 @@ export default function CreatePortfolio() {
         symbol: asset.symbol,
         name: asset.name,
         exchange: asset.exchange,
-        currency: 'USD',
+        currency: asset.exchange === 'KRX' ? 'KRW' : 'USD',
         asset_type: 'stock'
       })
 
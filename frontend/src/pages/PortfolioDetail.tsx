@@ -19,6 +19,8 @@ interface ItemAnalysis {
   is_out_of_range: boolean
   current_quantity: number
   current_price: number
+  currency: string
+  fx_rate: number
   current_value: number
   entry_price: number
   initial_quantity: number
@@ -30,8 +32,10 @@ interface PortfolioAnalysis {
     name: string
     description: string | null
     initial_invest_amount: number
+    base_currency: string
     created_at: string
   }
+  base_currency: string
   total_value: number
   initial_invest_amount: number
   total_return: number
@@ -39,6 +43,10 @@ interface PortfolioAnalysis {
   items: ItemAnalysis[]
 }
 
+const CURRENCY_SYMBOLS: Record<string, string> = { KRW: '₩', USD: '$' }
+
+const currencySymbol = (currency: string) => CURRENCY_SYMBOLS[currency] ?? `${currency} `
+
 export default function PortfolioDetail() {
   const { id } = useParams<{ id: string }>()
   const [analysis, setAnalysis] = useState<PortfolioAnalysis | null>(null)
@@ -119,7 +127,8 @@ export default function PortfolioDetail() {
     )
   }
 
-  const { portfolio, total_value, total_return, total_return_pct, items } = analysis
+  const { portfolio, base_currency, total_value, total_return, total_return_pct, items } = analysis
+  const base = currencySymbol(base_currency)
 
   return (
     <div className="portfolio-detail">
@@ -150,18 +159,18 @@ export default function PortfolioDetail() {
       <div className="summary-cards">
         <div className="summary-card card">
           <div className="summary-label">초기 투자금</div>
-          <div className="summary-value">₩{portfolio.initial_invest_amount.toLocaleString()}</div>
+          <div className="summary-value">{base}{portfolio.initial_invest_amount.toLocaleString()}</div>
         </div>
         
         <div className="summary-card card">
           <div className="summary-label">현재 평가금액</div>
-          <div className="summary-value">₩{total_value.toLocaleString(undefined, { maximumFractionDigits: 0 })}</div>
+          <div className="summary-value">{base}{total_value.toLocaleString(undefined, { maximumFractionDigits: 0 })}</div>
         </div>
         
         <div className="summary-card card">
           <div className="summary-label">수익금</div>
           <div className={`summary-value ${total_return >= 0 ? 'positive' : 'negative'}`}>
-            {total_return >= 0 ? '+' : ''}₩{total_return.toLocaleString(undefined, { maximumFractionDigits: 0 })}
+            {total_return >= 0 ? '+' : ''}{base}{total_return.toLocaleString(undefined, { maximumFractionDigits: 0 })}
           </div>
         </div>
         
@@ -214,9 +223,9 @@ export default function PortfolioDetail() {
                     </td>
                     <td>±{item.tolerance.toFixed(1)}%</td>
                     <td>
-                      ${item.current_price.toFixed(2)}
+                      {currencySymbol(item.currency)}{item.current_price.toFixed(2)}
                       <br />
-                      <small className="entry-price">진입: ${item.entry_price.toFixed(2)}</small>
+                      <small className="entry-price">진입: {currencySymbol(item.currency)}{item.entry_price.toFixed(2)}</small>
                     </td>
                     <td>
                       {isEditing ? (
@@ -237,7 +246,7 @@ export default function PortfolioDetail() {
                         </>
                       )}
                     </td>
-                    <td>₩{item.current_value.toLocaleString(undefined, { maximumFractionDigits: 0 })}</td>
+                    <td>{base}{item.current_value.toLocaleString(undefined, { maximumFractionDigits: 0 })}</td>
                     <td className={itemReturn >= 0 ? 'positive' : 'negative'}>
                       {itemReturn >= 0 ? '+' : ''}{itemReturn.toFixed(2)}%
                     </td>
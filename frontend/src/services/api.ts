@@ -52,6 +52,8 @@ export const assetAPI = {
     api.post('/assets', asset),
   getPrice: (assetId: number) =>
     api.get(`/assets/${assetId}/price`),
+  getPrices: (params: { asset_ids?: number[]; symbols?: string[] }) =>
+    api.post('/assets/prices', params),
 }
 
 // Portfolio APIs
@@ -60,12 +62,22 @@ export const portfolioAPI = {
     api.get('/portfolios'),
   create: (portfolio: any) =>
     api.post('/portfolios', portfolio),
+  createAsync: (portfolio: any) =>
+    api.post('/portfolios', portfolio, { params: { async: true } }),
+  job: (jobId: string) =>
+    api.get(`/portfolios/jobs/${jobId}`),
   get: (id: number) =>
     api.get(`/portfolios/${id}`),
   analyze: (id: number) =>
     api.get(`/portfolios/${id}/analysis`),
+  risk: (id: number, window?: number) =>
+    api.get(`/portfolios/${id}/risk`, { params: window ? { window } : {} }),
+  simulate: (id: number, params: { horizon_days?: number; paths?: number; target_value?: number; percentiles?: number[] } = {}) =>
+    api.post(`/portfolios/${id}/simulate`, params),
   updateItemQuantity: (portfolioId: number, itemId: number, quantity: number) =>
     api.patch(`/portfolios/${portfolioId}/items/${itemId}`, { current_quantity: quantity }),
+  updateItemQuantities: (portfolioId: number, updates: { item_id: number; current_quantity: number }[]) =>
+    api.patch(`/portfolios/${portfolioId}/items`, updates),
   delete: (id: number) =>
     api.delete(`/portfolios/${id}`),
 }